@@ -4,7 +4,7 @@ from sqlalchemy import pool
 from alembic import context
 
 # Importe a Base do seu projeto para que o Alembic saiba das suas tabelas
-from app.core.database import Base
+from app.core.database import Base, SQLALCHEMY_DATABASE_URL
 from app.models import Customer, Pet, Employee, Booking, Inventory, Sale, Vaccine
 # --- Configuração ---
 target_metadata = Base.metadata
@@ -15,6 +15,15 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# A URL vem da mesma configuração da aplicação (variável DATABASE_URL)
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Ignora a tabela FTS5 de clientes e suas tabelas-sombra, criadas por SQL puro."""
+    if type_ == "table" and name.startswith("customers_fts"):
+        return False
+    return True
 
 
 def run_migrations_offline() -> None:
@@ -26,6 +35,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -43,6 +53,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             render_as_batch=True,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,36 @@
+"""perf: Formato único de sales.created_at no SQLite
+
+Revision ID: 3f9a6c2e8b15
+Revises: 8e3d5b7a1f62
+Create Date: 2026-10-17 16:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c2e8b15'
+down_revision: Union[str, Sequence[str], None] = '8e3d5b7a1f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        # Vendas gravadas pelo server_default (CURRENT_TIMESTAMP) ficaram sem a
+        # fração de segundo; completa para o formato 'YYYY-MM-DD HH:MM:SS.ffffff'
+        # usado pelo SQLAlchemy, que é o que os filtros por período comparam.
+        op.execute(
+            "UPDATE sales SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # O formato com fração de segundo é lido normalmente pelas versões anteriores.
+    pass
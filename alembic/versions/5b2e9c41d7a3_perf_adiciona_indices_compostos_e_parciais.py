@@ -0,0 +1,98 @@
+"""perf: Adiciona índices compostos e parciais para os filtros de is_active
+
+Revision ID: 5b2e9c41d7a3
+Revises: 4c840a301b7c
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e9c41d7a3'
+down_revision: Union[str, Sequence[str], None] = '4c840a301b7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ACTIVE = sa.column('is_active', sa.Boolean()) == sa.true()
+
+
+def _add_missing_is_active(table_name: str) -> None:
+    """Os models de pets e inventory já têm is_active, mas nenhuma revisão
+    anterior criou a coluna. Ela é adicionada aqui apenas se ainda não existir."""
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table_name)}
+    if 'is_active' in columns:
+        return
+    with op.batch_alter_table(table_name, schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_active', sa.Boolean(), nullable=False,
+                                      server_default=sa.true()))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _add_missing_is_active('pets')
+    _add_missing_is_active('inventory')
+
+    with op.batch_alter_table('customers', schema=None) as batch_op:
+        batch_op.create_index('ix_customers_active_name', ['name'], unique=False,
+                              sqlite_where=ACTIVE, postgresql_where=ACTIVE)
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.create_index('ix_pets_customer_id_is_active',
+                              ['customer_id', 'is_active'], unique=False)
+
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.create_index('ix_employees_active_name', ['name'], unique=False,
+                              sqlite_where=ACTIVE, postgresql_where=ACTIVE)
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_employee_id_scheduled_time_is_active',
+                              ['employee_id', 'scheduled_time', 'is_active'], unique=False)
+        batch_op.create_index('ix_bookings_active_scheduled_time', ['scheduled_time'],
+                              unique=False, sqlite_where=ACTIVE, postgresql_where=ACTIVE)
+        batch_op.create_index(batch_op.f('ix_bookings_pet_id'), ['pet_id'], unique=False)
+
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.create_index('ix_inventory_product_name_is_active',
+                              ['product_name', 'is_active'], unique=False)
+
+    with op.batch_alter_table('sales', schema=None) as batch_op:
+        batch_op.create_index('ix_sales_active_created_at', ['created_at'], unique=False,
+                              sqlite_where=ACTIVE, postgresql_where=ACTIVE)
+        batch_op.create_index(batch_op.f('ix_sales_customer_id'), ['customer_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_sales_product_id'), ['product_id'], unique=False)
+
+    with op.batch_alter_table('vaccines', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_vaccines_pet_id'), ['pet_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('vaccines', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_vaccines_pet_id'))
+
+    with op.batch_alter_table('sales', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sales_product_id'))
+        batch_op.drop_index(batch_op.f('ix_sales_customer_id'))
+        batch_op.drop_index('ix_sales_active_created_at')
+
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.drop_index('ix_inventory_product_name_is_active')
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bookings_pet_id'))
+        batch_op.drop_index('ix_bookings_active_scheduled_time')
+        batch_op.drop_index('ix_bookings_employee_id_scheduled_time_is_active')
+
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.drop_index('ix_employees_active_name')
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_index('ix_pets_customer_id_is_active')
+
+    with op.batch_alter_table('customers', schema=None) as batch_op:
+        batch_op.drop_index('ix_customers_active_name')
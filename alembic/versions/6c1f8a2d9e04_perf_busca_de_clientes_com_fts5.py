@@ -0,0 +1,56 @@
+"""perf: Busca de clientes com FTS5
+
+Revision ID: 6c1f8a2d9e04
+Revises: 5b2e9c41d7a3
+Create Date: 2026-10-17 11:02:47.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1f8a2d9e04'
+down_revision: Union[str, Sequence[str], None] = '5b2e9c41d7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS = ('customers_fts_ai', 'customers_fts_ad', 'customers_fts_au')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5("
+        "name, content='customers', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN "
+        "INSERT INTO customers_fts(rowid, name) VALUES (new.id, new.name); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name) VALUES ('delete', old.id, old.name); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_au AFTER UPDATE OF name ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+        "INSERT INTO customers_fts(rowid, name) VALUES (new.id, new.name); END"
+    )
+    op.execute("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS customers_fts")
@@ -0,0 +1,65 @@
+"""perf: Duração dos agendamentos e horário de término
+
+Revision ID: 8e3d5b7a1f62
+Revises: 6c1f8a2d9e04
+Create Date: 2026-10-17 14:21:09.552817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3d5b7a1f62'
+down_revision: Union[str, Sequence[str], None] = '6c1f8a2d9e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mesma ordem de app.utils.scheduling.SERVICE_DURATIONS (congelada aqui para
+# que a migração não mude se a tabela da aplicação mudar).
+SERVICE_DURATIONS = (
+    ('tosa', 120),
+    ('banho', 60),
+    ('cirurgia', 180),
+    ('consulta', 30),
+    ('vacina', 15),
+    ('unha', 15),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('duration_minutes', sa.Integer(), server_default=sa.text('30'), nullable=False))
+        batch_op.add_column(sa.Column('ends_at', sa.DateTime(timezone=True), nullable=True))
+
+    cases = ' '.join(
+        f"WHEN lower(service_name) LIKE '%{keyword}%' THEN {minutes}"
+        for keyword, minutes in SERVICE_DURATIONS
+    )
+    op.execute(f"UPDATE bookings SET duration_minutes = CASE {cases} ELSE 30 END")
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # DateTime no SQLite é texto 'YYYY-MM-DD HH:MM:SS.ffffff': soma os minutos
+        # e preserva a fração de segundo.
+        op.execute(
+            "UPDATE bookings SET ends_at = strftime('%Y-%m-%d %H:%M:%S', scheduled_time, "
+            "'+' || duration_minutes || ' minutes') || substr(scheduled_time, 20)"
+        )
+    else:
+        op.execute(
+            "UPDATE bookings SET ends_at = scheduled_time + duration_minutes * INTERVAL '1 minute'"
+        )
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.alter_column('ends_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_column('ends_at')
+        batch_op.drop_column('duration_minutes')
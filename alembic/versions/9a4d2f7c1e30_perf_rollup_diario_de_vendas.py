@@ -0,0 +1,60 @@
+"""perf: Rollup diário de vendas (sales_daily)
+
+Revision ID: 9a4d2f7c1e30
+Revises: 3f9a6c2e8b15
+Create Date: 2026-10-17 18:40:12.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d2f7c1e30'
+down_revision: Union[str, Sequence[str], None] = '3f9a6c2e8b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    daily = op.create_table('sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['inventory.id'], ),
+    sa.PrimaryKeyConstraint('day', 'product_id', 'customer_id')
+    )
+    with op.batch_alter_table('sales_daily', schema=None) as batch_op:
+        batch_op.create_index('ix_sales_daily_product_id_day', ['product_id', 'day'], unique=False)
+        batch_op.create_index('ix_sales_daily_customer_id_day', ['customer_id', 'day'], unique=False)
+
+    # Backfill com as vendas ativas já existentes (o mesmo que
+    # `python -m app.services.sales_daily` faz depois).
+    sales = sa.table('sales', sa.column('created_at'), sa.column('product_id'),
+                     sa.column('customer_id'), sa.column('quantity'),
+                     sa.column('total_value'), sa.column('is_active', sa.Boolean()))
+    day = sa.func.date(sales.c.created_at)
+    op.execute(daily.insert().from_select(
+        ['day', 'product_id', 'customer_id', 'quantity', 'revenue', 'sales_count'],
+        sa.select(day, sales.c.product_id, sales.c.customer_id,
+                  sa.func.sum(sales.c.quantity), sa.func.sum(sales.c.total_value),
+                  sa.func.count())
+        .where(sales.c.is_active == sa.true())
+        .group_by(day, sales.c.product_id, sales.c.customer_id)
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('sales_daily', schema=None) as batch_op:
+        batch_op.drop_index('ix_sales_daily_customer_id_day')
+        batch_op.drop_index('ix_sales_daily_product_id_day')
+
+    op.drop_table('sales_daily')
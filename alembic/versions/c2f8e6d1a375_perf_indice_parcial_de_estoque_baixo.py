@@ -0,0 +1,45 @@
+"""perf: Índice parcial dos itens em estoque baixo
+
+Revision ID: c2f8e6d1a375
+Revises: b7e1c5a9d204
+Create Date: 2026-10-17 21:18:09.664120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8e6d1a375'
+down_revision: Union[str, Sequence[str], None] = 'b7e1c5a9d204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mesmo WHERE de `stock_rules.low_stock_condition()`, para que o banco use o
+# índice nas consultas de estoque baixo.
+LOW_STOCK = sa.and_(sa.column('is_active', sa.Boolean()) == sa.true(),
+                    sa.column('quantity') <= sa.column('low_stock_threshold'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.create_index('ix_inventory_low_stock',
+                              ['product_name', 'id', 'quantity', 'low_stock_threshold', 'is_active'],
+                              unique=False,
+                              sqlite_where=LOW_STOCK, postgresql_where=LOW_STOCK)
+
+    # Bancos populados pelo seed já têm estatísticas (sqlite_stat1) sem o
+    # índice novo; com elas desatualizadas o SQLite continua varrendo o
+    # índice único de product_name em vez do parcial.
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        op.execute('ANALYZE inventory')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.drop_index('ix_inventory_low_stock')
@@ -0,0 +1,94 @@
+"""Cache em memória com expiração (TTL) e limite de entradas (LRU).
+
+Cada processo tem o seu: com vários workers, uma escrita invalida apenas o
+cache do worker que a atendeu e os demais ficam, no máximo, `ttl` segundos
+desatualizados.
+
+`generation` aumenta a cada invalidação. Quem vai ao banco depois de um
+miss guarda a geração antes da consulta e a passa para `set`; se alguma
+invalidação aconteceu no meio, o resultado (possivelmente antigo) é
+descartado em vez de voltar para o cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.core import metrics
+
+
+cache_requests_total = metrics.Counter(
+    metrics.registry, "cache_requests_total", "Consultas ao cache em memória, por resultado.",
+    ("cache", "result"))
+cache_evictions_total = metrics.Counter(
+    metrics.registry, "cache_evictions_total", "Entradas removidas do cache em memória, por motivo.",
+    ("cache", "reason"))
+cache_entries = metrics.Gauge(
+    metrics.registry, "cache_entries", "Entradas no cache em memória.", ("cache",))
+
+
+class TTLCache:
+    '''Mapa chave -> valor com expiração e remoção da entrada menos usada.'''
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                cache_evictions_total.inc(cache=self.name, reason="expired")
+                entry = None
+            if entry is None:
+                self.misses += 1
+                cache_requests_total.inc(cache=self.name, result="miss")
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        cache_requests_total.inc(cache=self.name, result="hit")
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                cache_evictions_total.inc(cache=self.name, reason="lru")
+            cache_entries.set(len(self._data), cache=self.name)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        '''Remove as entradas cuja chave satisfaz `predicate`; retorna quantas.'''
+        with self._lock:
+            self.generation += 1
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+            cache_entries.set(len(self._data), cache=self.name)
+        if stale:
+            cache_evictions_total.inc(len(stale), cache=self.name, reason="invalidated")
+        return len(stale)
+
+    def clear(self) -> None:
+        self.invalidate(lambda key: True)
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,96 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    '''Lê uma variável de ambiente inteira, usando o valor padrão se ausente.'''
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    '''Lê uma variável de ambiente booleana ("1", "true", "yes", "on").'''
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# --- Banco de dados ---
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./petshop.db")
+
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+DB_ECHO = _env_bool("DB_ECHO", False)
+
+# "sync" usa Session + rotas def (threadpool); "async" usa AsyncSession + rotas
+# async def. Permite comparar as duas pilhas com a mesma carga.
+DB_STACK = os.getenv("DB_STACK", "sync").strip().lower()
+if DB_STACK not in ("sync", "async"):
+    raise ValueError(f"DB_STACK inválido: '{DB_STACK}' (use 'sync' ou 'async')")
+# URL opcional para o driver assíncrono; por padrão é derivada de DATABASE_URL.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+
+# --- Perfil SQLite ---
+SQLITE_BUSY_TIMEOUT_MS = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_MMAP_SIZE = _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+# Valores negativos são interpretados pelo SQLite como KiB (-65536 = 64 MiB).
+SQLITE_CACHE_SIZE = _env_int("SQLITE_CACHE_SIZE", -65536)
+
+# --- Instrumentação de SQL ---
+# Cabeçalhos X-DB-Queries / Server-Timing em toda resposta.
+SQL_INSTRUMENTATION = _env_bool("SQL_INSTRUMENTATION", True)
+# Modo debug: registra o SQL mais lento e avisa sobre possíveis N+1.
+SQL_DEBUG = _env_bool("SQL_DEBUG", False)
+SQL_N_PLUS_ONE_THRESHOLD = _env_int("SQL_N_PLUS_ONE_THRESHOLD", 5)
+
+# --- Métricas (/metrics) ---
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+# Diretório compartilhado entre os workers do uvicorn. Sem ele, o /metrics
+# mostra apenas o processo que atendeu a requisição.
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = _env_int("METRICS_FLUSH_INTERVAL", 5)
+# Número de workers (lido também pelo uvicorn/gunicorn como padrão de
+# --workers); acima de 1 sem METRICS_DIR, a inicialização emite um aviso.
+WEB_CONCURRENCY = _env_int("WEB_CONCURRENCY", 1)
+
+# --- Agendamentos ---
+# Duração usada quando o serviço não é reconhecido e o cliente não informa.
+BOOKING_DEFAULT_DURATION_MINUTES = _env_int("BOOKING_DEFAULT_DURATION_MINUTES", 30)
+# Limite de duração de um agendamento. Também delimita a busca de conflitos:
+# só agendamentos que começam até este tempo antes podem se sobrepor.
+BOOKING_MAX_DURATION_MINUTES = _env_int("BOOKING_MAX_DURATION_MINUTES", 480)
+# Máximo de ocorrências (somando as recorrências) num POST /api/bookings/bulk.
+BOOKING_BULK_MAX_OCCURRENCES = _env_int("BOOKING_BULK_MAX_OCCURRENCES", 500)
+# Horário de atendimento (horas cheias) usado na busca de horários livres.
+SCHEDULE_OPENING_HOUR = _env_int("SCHEDULE_OPENING_HOUR", 8)
+SCHEDULE_CLOSING_HOUR = _env_int("SCHEDULE_CLOSING_HOUR", 18)
+# Maior período aceito por /api/schedule e /api/schedule/availability.
+SCHEDULE_MAX_RANGE_DAYS = _env_int("SCHEDULE_MAX_RANGE_DAYS", 31)
+# Cache em memória das respostas de /api/schedule (0 desliga).
+SCHEDULE_CACHE_TTL_SECONDS = _env_int("SCHEDULE_CACHE_TTL_SECONDS", 30)
+SCHEDULE_CACHE_MAX_ENTRIES = _env_int("SCHEDULE_CACHE_MAX_ENTRIES", 256)
+
+# --- Vendas ---
+# Máximo de itens num POST /api/sales/checkout.
+SALES_CHECKOUT_MAX_ITEMS = _env_int("SALES_CHECKOUT_MAX_ITEMS", 100)
+# Vendas lidas do banco por vez em GET /api/sales/?stream=true.
+SALES_STREAM_BATCH_SIZE = _env_int("SALES_STREAM_BATCH_SIZE", 1000)
+
+# --- Idempotência (cabeçalho Idempotency-Key) ---
+# Por quanto tempo a resposta de um POST com Idempotency-Key é reaproveitada.
+IDEMPOTENCY_TTL_SECONDS = _env_int("IDEMPOTENCY_TTL_SECONDS", 86400)
+
+# --- Exportação (/export) ---
+# Linhas lidas do banco e codificadas por vez; a memória não cresce com o total.
+EXPORT_BATCH_SIZE = _env_int("EXPORT_BATCH_SIZE", 1000)
+
+# --- Stream de eventos (/api/stream) ---
+# Eventos pendentes por cliente; ao encher, o cliente é desconectado.
+STREAM_QUEUE_SIZE = _env_int("STREAM_QUEUE_SIZE", 100)
+# Intervalo dos comentários de keep-alive enviados quando não há eventos.
+STREAM_HEARTBEAT_SECONDS = _env_int("STREAM_HEARTBEAT_SECONDS", 15)
+STREAM_MAX_CLIENTS = _env_int("STREAM_MAX_CLIENTS", 500)
@@ -1,13 +1,93 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///C:/Users/andre/Pet Control HUB/petshop-control-hub/petshop.db"
+from app.core import config, metrics
+
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def _async_url(url: str) -> str:
+    '''Converte a URL síncrona para o driver assíncrono equivalente.'''
+    sync_url = make_url(url)
+    driver = _ASYNC_DRIVERS.get(sync_url.get_backend_name())
+    if driver is None:
+        raise ValueError(
+            f"Sem driver assíncrono conhecido para '{sync_url.drivername}'. "
+            "Defina ASYNC_DATABASE_URL."
+        )
+    return sync_url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _engine_options(url: str) -> dict:
+    '''Monta os argumentos do engine de acordo com o banco configurado.
+
+    Para SQLite em memória o SQLAlchemy usa um pool próprio (SingletonThreadPool
+    ou StaticPool), que não aceita as opções de tamanho do QueuePool.
+    '''
+    options = {"echo": config.DB_ECHO}
+
+    if _is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+        if _is_sqlite_memory(url):
+            return options
+
+    options.update(
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=not _is_sqlite(url),
+    )
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    '''Aplica o perfil de desempenho do SQLite em cada nova conexão.
+
+    - WAL permite leituras concorrentes com uma escrita em andamento;
+    - synchronous=NORMAL é seguro em WAL e evita um fsync por commit;
+    - busy_timeout faz o SQLite esperar pelo lock em vez de falhar com
+      "database is locked" quando vários workers escrevem ao mesmo tempo.
+    '''
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(config.SQLITE_CACHE_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL, **_engine_options(SQLALCHEMY_DATABASE_URL)
 )
 
+if _is_sqlite(SQLALCHEMY_DATABASE_URL):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+metrics.watch_pool(engine, "sync")
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -17,4 +97,66 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = (
+    config.ASYNC_DATABASE_URL or _async_url(SQLALCHEMY_DATABASE_URL)
+)
+
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    '''Cria (uma única vez) o engine assíncrono.
+
+    A criação é adiada até o primeiro uso para que a pilha síncrona não
+    dependa do driver assíncrono (aiosqlite) estar instalado.
+    '''
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_SQLALCHEMY_DATABASE_URL,
+            **_engine_options(SQLALCHEMY_DATABASE_URL)
+        )
+        if _is_sqlite(SQLALCHEMY_DATABASE_URL):
+            event.listen(_async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+        metrics.watch_pool(_async_engine.sync_engine, "async")
+        _async_session_factory = async_sessionmaker(
+            _async_engine, class_=AsyncSession,
+            autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    '''Fecha as conexões do engine assíncrono.
+
+    As threads de conexão do aiosqlite não são daemon: sem isso o processo
+    não termina enquanto houver conexões abertas no pool.
+    '''
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+def active_engines() -> dict:
+    '''Engines já criados, por pilha ("sync"/"async"), para métricas do pool.'''
+    engines = {"sync": engine}
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    return engines
+
+
+def async_session() -> AsyncSession:
+    '''Nova AsyncSession fora da injeção de dependência (ex.: respostas em streaming).'''
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def get_async_db():
+    async with async_session() as db:
+        yield db
@@ -0,0 +1,114 @@
+"""Pub/sub em memória que alimenta o stream de eventos (/api/stream).
+
+As rotas publicam depois do commit (`publish("booking.created", {...})`); o
+evento é serializado uma única vez no formato do Server-Sent Events e
+entregue na fila de cada cliente conectado. As rotas síncronas rodam no
+threadpool, então a entrega é agendada no event loop do cliente com
+`call_soon_threadsafe`.
+
+Cada fila é limitada (`STREAM_QUEUE_SIZE`). Um cliente lento demais para
+acompanhar não segura os demais nem faz a memória crescer: quando a fila
+enche, os eventos pendentes são descartados, o cliente recebe `overflow` e
+a conexão é encerrada. O EventSource do navegador reconecta sozinho e a
+tela recarrega o estado pela API.
+
+Como o cache da agenda, o bus é por processo: com vários workers, cada
+cliente só recebe os eventos das escritas atendidas pelo seu worker.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core import config, metrics
+
+
+OVERFLOW = object()
+
+stream_clients = metrics.Gauge(
+    metrics.registry, "stream_clients", "Clientes conectados a /api/stream.")
+stream_events_total = metrics.Counter(
+    metrics.registry, "stream_events_total", "Eventos publicados no stream, por tipo.", ("type",))
+stream_overflows_total = metrics.Counter(
+    metrics.registry, "stream_overflows_total",
+    "Clientes desconectados por não acompanharem o ritmo dos eventos.")
+
+
+def format_event(event_id: int, event_type: str, data: dict) -> str:
+    payload = json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    '''Fila de um cliente do stream, filtrada pelos grupos de evento pedidos.'''
+
+    def __init__(self, groups: Optional[frozenset], maxsize: int):
+        self.groups = groups
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.overflowed = False
+
+    def wants(self, event_type: str) -> bool:
+        return self.groups is None or event_type.split(".", 1)[0] in self.groups
+
+    def deliver(self, message: str) -> None:
+        '''Roda no event loop do cliente.'''
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+            stream_overflows_total.inc()
+
+
+class EventBus:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, groups: Optional[frozenset] = None) -> Subscription:
+        subscription = Subscription(groups, self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            stream_clients.set(len(self._subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            stream_clients.set(len(self._subscribers))
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: dict) -> None:
+        stream_events_total.inc(type=event_type)
+        with self._lock:
+            subscribers = [s for s in self._subscribers if s.wants(event_type)]
+            if not subscribers:
+                return
+            event_id = next(self._ids)
+
+        message = format_event(event_id, event_type, data)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # Loop encerrado: o cliente já foi embora.
+                self.unsubscribe(subscription)
+
+
+bus = EventBus(config.STREAM_QUEUE_SIZE)
+
+
+def publish(event_type: str, data: dict) -> None:
+    bus.publish(event_type, data)
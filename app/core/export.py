@@ -0,0 +1,130 @@
+"""Exportação em streaming (CSV ou NDJSON) para os endpoints `/export`.
+
+A consulta é lida em lotes (`yield_per`, que nos drivers com suporte usa
+um cursor do lado do servidor) e cada lote é codificado e enviado antes do
+próximo ser lido: a memória fica constante, qualquer que seja o número de
+linhas. Com `gzip=true`, os lotes passam por um compressor incremental e o
+arquivo sai como `.gz`.
+
+Os geradores abrem a própria sessão: eles continuam rodando depois que a
+rota retorna e a sessão da requisição já foi fechada.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, timezone
+from typing import Literal, Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.core import config
+from app.core.database import SessionLocal, async_session
+
+
+ExportFormat = Literal["csv", "ndjson"]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def period(start: Optional[datetime], end: Optional[datetime],
+           utc: bool) -> tuple[Optional[datetime], Optional[datetime]]:
+    '''Valida o período [start, end) e remove o fuso para comparar com as colunas.
+
+    Colunas `created_at` são gravadas em UTC (`utc=True`: datas com fuso são
+    convertidas); horários de agendamento são locais e só perdem o fuso.
+    '''
+    def naive(value):
+        if value is None or value.tzinfo is None:
+            return value
+        if utc:
+            value = value.astimezone(timezone.utc)
+        return value.replace(tzinfo=None)
+
+    start, end = naive(start), naive(end)
+    if start and end and end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="O fim do período deve ser posterior ao início.")
+    return start, end
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+class Encoder:
+    '''Converte lotes de linhas (Row) em bytes no formato pedido, comprimidos ou não.'''
+
+    def __init__(self, fmt: ExportFormat, columns: list[str], compress: bool = False):
+        self.fmt = fmt
+        self.columns = columns
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    def _out(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) if self._compressor else data
+
+    def start(self) -> bytes:
+        if self.fmt == "csv":
+            return self._out(self._csv([self.columns]))
+        return b""
+
+    def encode(self, rows) -> bytes:
+        if self.fmt == "csv":
+            return self._out(self._csv(rows))
+        return self._out("".join(
+            json.dumps(row._asdict(), ensure_ascii=False, default=_json_default) + "\n"
+            for row in rows).encode())
+
+    def finish(self) -> bytes:
+        return self._compressor.flush() if self._compressor else b""
+
+    @staticmethod
+    def _csv(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [value.isoformat() if isinstance(value, (datetime, date)) else value for value in row]
+            for row in rows)
+        return buffer.getvalue().encode()
+
+
+def stream_export(query, encoder: Encoder):
+    '''Gerador síncrono: lê `query` em lotes numa sessão própria.'''
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=config.EXPORT_BATCH_SIZE))
+        yield encoder.start()
+        for rows in result.partitions():
+            chunk = encoder.encode(rows)
+            if chunk:
+                yield chunk
+        yield encoder.finish()
+
+
+async def astream_export(query, encoder: Encoder):
+    '''Versão assíncrona de `stream_export`.'''
+    async with async_session() as db:
+        result = await db.stream(query.execution_options(yield_per=config.EXPORT_BATCH_SIZE))
+        yield encoder.start()
+        async for rows in result.partitions():
+            chunk = encoder.encode(rows)
+            if chunk:
+                yield chunk
+        yield encoder.finish()
+
+
+def export_response(query, name: str, fmt: ExportFormat, compress: bool,
+                    asynchronous: bool = False) -> StreamingResponse:
+    '''StreamingResponse com o arquivo `name.csv`/`name.ndjson` (ou `.gz`) da consulta.'''
+    encoder = Encoder(fmt, list(query.selected_columns.keys()), compress)
+    body = astream_export(query, encoder) if asynchronous else stream_export(query, encoder)
+    filename = f"{name}.{fmt}" + (".gz" if compress else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if compress else MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,140 @@
+"""Cabeçalho `Idempotency-Key` nos POST de vendas, agendamentos e clientes.
+
+Um cliente que repete a requisição (ex.: timeout numa rede instável) com a
+mesma chave recebe a resposta da primeira vez, sem repetir o débito de
+estoque, a verificação de conflito ou o cadastro.
+
+A chave é reservada com um INSERT no início da própria transação da
+escrita, e a resposta é gravada nela antes do commit: a escrita e a chave
+entram (ou são desfeitas) juntas. Uma repetição que chega enquanto a
+primeira ainda está em andamento espera pelo lock da chave; se a primeira
+confirmar, a repetição devolve a resposta guardada, e se falhar, a
+repetição é executada normalmente. Respostas de erro não são guardadas.
+
+As chaves valem `IDEMPOTENCY_TTL_SECONDS`; as vencidas são apagadas a cada
+nova reserva (pelo índice de `expires_at`, cada linha uma vez só).
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import Header, HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.core import config, metrics
+
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+idempotency_requests_total = metrics.Counter(
+    metrics.registry, "idempotency_requests_total",
+    "Requisições com Idempotency-Key, por endpoint e resultado.", ("endpoint", "result"))
+
+
+def header(idempotency_key: Optional[str] = Header(
+        None, alias=HEADER, min_length=1, max_length=255,
+        description="Repetições com a mesma chave recebem a resposta original")) -> Optional[str]:
+    '''Dependência que lê o cabeçalho `Idempotency-Key` (opcional).'''
+    return idempotency_key
+
+
+def request_hash(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+def _reserve(key: str, endpoint: str, payload: BaseModel):
+    now = datetime.now(timezone.utc)
+    return (
+        delete(models.IdempotencyKey).where(models.IdempotencyKey.expires_at <= now),
+        insert(models.IdempotencyKey).values(
+            key=key, endpoint=endpoint, request_hash=request_hash(payload),
+            created_at=now, expires_at=now + timedelta(seconds=config.IDEMPOTENCY_TTL_SECONDS)),
+    )
+
+
+def _stored_query(key: str, endpoint: str):
+    return select(models.IdempotencyKey).where(
+        models.IdempotencyKey.key == key, models.IdempotencyKey.endpoint == endpoint)
+
+
+def _replay(record, endpoint: str, payload: BaseModel) -> Response:
+    '''Resposta guardada para a chave, ou o erro se ela não puder ser reaproveitada.'''
+    if record is None or record.response is None:
+        idempotency_requests_total.inc(endpoint=endpoint, result="conflict")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail="A requisição com esta Idempotency-Key não pôde ser confirmada; tente novamente.")
+    if record.request_hash != request_hash(payload):
+        idempotency_requests_total.inc(endpoint=endpoint, result="mismatch")
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail="Esta Idempotency-Key já foi usada com outro corpo de requisição.")
+    idempotency_requests_total.inc(endpoint=endpoint, result="replayed")
+    return Response(content=record.response, status_code=record.status_code,
+                    media_type="application/json", headers={REPLAYED_HEADER: "true"})
+
+
+def _store(key: str, endpoint: str, schema: type[BaseModel], obj, status_code: int):
+    idempotency_requests_total.inc(endpoint=endpoint, result="stored")
+    body = schema.model_validate(obj, from_attributes=True).model_dump_json()
+    return (update(models.IdempotencyKey)
+            .where(models.IdempotencyKey.key == key, models.IdempotencyKey.endpoint == endpoint)
+            .values(status_code=status_code, response=body))
+
+
+def claim(db, key: Optional[str], endpoint: str, payload: BaseModel) -> Optional[Response]:
+    '''Reserva a chave na transação de `db`, antes de qualquer outro comando.
+
+    Devolve None quando a requisição deve ser executada (sem chave ou chave
+    nova) e a resposta guardada quando é uma repetição.
+
+    Raises:
+        HTTPException: 422 se a chave já foi usada com outro corpo; 409 se a
+                       resposta original não estiver disponível.
+    '''
+    if key is None:
+        return None
+    purge, reserve = _reserve(key, endpoint, payload)
+    db.execute(purge)
+    try:
+        db.execute(reserve)
+        return None
+    except IntegrityError:
+        db.rollback()
+    return _replay(db.scalar(_stored_query(key, endpoint)), endpoint, payload)
+
+
+async def aclaim(db, key: Optional[str], endpoint: str, payload: BaseModel) -> Optional[Response]:
+    '''Versão assíncrona de `claim`.'''
+    if key is None:
+        return None
+    purge, reserve = _reserve(key, endpoint, payload)
+    await db.execute(purge)
+    try:
+        await db.execute(reserve)
+        return None
+    except IntegrityError:
+        await db.rollback()
+    return _replay(await db.scalar(_stored_query(key, endpoint)), endpoint, payload)
+
+
+def save(db, key: Optional[str], endpoint: str, schema: type[BaseModel], obj,
+         status_code: int = 200) -> None:
+    '''Guarda `obj` (já com flush) serializado por `schema`; chame antes do commit.
+
+    O objeto é relido do banco antes, para que a resposta guardada seja igual
+    à que a rota devolve depois do commit (ex.: datas como o banco as grava).
+    '''
+    if key is not None:
+        db.refresh(obj)
+        db.execute(_store(key, endpoint, schema, obj, status_code))
+
+
+async def asave(db, key: Optional[str], endpoint: str, schema: type[BaseModel], obj,
+                status_code: int = 200) -> None:
+    '''Versão assíncrona de `save`.'''
+    if key is not None:
+        await db.refresh(obj)
+        await db.execute(_store(key, endpoint, schema, obj, status_code))
@@ -0,0 +1,127 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import config
+
+
+logger = logging.getLogger("app.sql")
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    '''Normaliza um SQL para comparar "formatos" de consulta.
+
+    Listas `IN (?, ?, ?)` de tamanhos diferentes viram `IN (?)` e espaços
+    são colapsados, para que a mesma consulta com parâmetros diferentes
+    seja contada como repetição.
+    '''
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    '''Estatísticas de SQL acumuladas durante uma única requisição.'''
+
+    __slots__ = ("count", "total_time", "slowest_time", "slowest_statement", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        if config.SQL_DEBUG:
+            self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        '''Formatos executados mais de `threshold` vezes (suspeitas de N+1).'''
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    '''Retorna as estatísticas da requisição em andamento, se houver.'''
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+class SQLInstrumentationMiddleware:
+    '''Middleware ASGI que mede o SQL executado em cada requisição.
+
+    Adiciona à resposta os cabeçalhos `X-DB-Queries` (número de comandos) e
+    `Server-Timing` (tempo total no banco e o comando mais lento). Com
+    `SQL_DEBUG` ativo, registra um aviso quando o mesmo formato de comando
+    roda mais de `SQL_N_PLUS_ONE_THRESHOLD` vezes na mesma requisição.
+    '''
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"server-timing", (
+                    f'db;dur={stats.total_time * 1000:.2f};desc="{stats.count} queries", '
+                    f"db-slowest;dur={stats.slowest_time * 1000:.2f}"
+                ).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            if config.SQL_DEBUG:
+                self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope, stats: QueryStats) -> None:
+        route = f'{scope.get("method")} {scope.get("path")}'
+        for shape, n in stats.repeated_shapes(config.SQL_N_PLUS_ONE_THRESHOLD):
+            logger.warning("Possível N+1 em %s: %d execuções de: %s", route, n, shape)
+        if stats.slowest_statement is not None:
+            logger.debug("%s: %d queries, %.2f ms no banco; mais lenta (%.2f ms): %s",
+                         route, stats.count, stats.total_time * 1000,
+                         stats.slowest_time * 1000, stats.slowest_statement)
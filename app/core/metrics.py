@@ -0,0 +1,477 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos
+    fcntl = None
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import config
+
+
+logger = logging.getLogger("app.metrics")
+
+# Arquivos de METRICS_DIR além dos snapshots de cada processo.
+DEAD_WORKERS_FILE = "dead_workers.json"
+LOCK_FILE = "metrics.lock"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labelnames: tuple, labelvalues: tuple) -> str:
+    return json.dumps(dict(zip(labelnames, labelvalues)), sort_keys=True)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict, extra: Optional[dict] = None) -> str:
+    items = dict(labels)
+    if extra:
+        items.update(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in items.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _merge(target: dict, metrics: dict, include_gauges: bool = True) -> None:
+    '''Soma as amostras de um snapshot em `target` (gauges opcionalmente).'''
+    for name, metric in metrics.items():
+        if metric["type"] == "gauge" and not include_gauges:
+            continue
+        merged = target.setdefault(name, {**metric, "samples": {}})
+        for key, value in metric["samples"].items():
+            current = merged["samples"].get(key)
+            if metric["type"] == "histogram":
+                if current is None:
+                    merged["samples"][key] = {"buckets": list(value["buckets"]),
+                                              "sum": value["sum"], "count": value["count"]}
+                else:
+                    current["buckets"] = [a + b for a, b in zip(current["buckets"], value["buckets"])]
+                    current["sum"] += value["sum"]
+                    current["count"] += value["count"]
+            else:
+                merged["samples"][key] = (current or 0.0) + value
+
+
+class _Metric:
+    '''Base das métricas: guarda um valor por combinação de labels.'''
+
+    type_name = ""
+
+    def __init__(self, registry: "Registry", name: str, documentation: str,
+                 labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict = {}
+        registry.register(self)
+
+    def _key(self, labels: dict) -> str:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} espera os labels {self.labelnames}")
+        return _label_key(self.labelnames, tuple(str(labels[n]) for n in self.labelnames))
+
+    def samples(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+
+class Counter(_Metric):
+    '''Contador monotônico (somado entre processos).'''
+
+    type_name = "counter"
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        super().__init__(registry, name, documentation, labelnames)
+        if not self.labelnames:
+            self._values[self._key({})] = 0.0
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    '''Valor instantâneo. Entre processos, soma apenas os processos vivos.'''
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    '''Histograma com buckets cumulativos no formato Prometheus.'''
+
+    type_name = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(),
+                 buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = data
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data["buckets"][i] += 1
+            data["sum"] += value
+            data["count"] += 1
+
+    def samples(self) -> dict:
+        with self._lock:
+            return {k: {"buckets": list(v["buckets"]), "sum": v["sum"], "count": v["count"]}
+                    for k, v in self._values.items()}
+
+
+class Registry:
+    '''Registro em processo das métricas da aplicação.
+
+    Com vários workers do uvicorn cada processo tem o seu registro. Quando
+    `METRICS_DIR` está definido, cada processo grava periodicamente um
+    snapshot em `<METRICS_DIR>/metrics_<pid>_<sufixo>.json` e o `/metrics`
+    de qualquer worker soma os snapshots de todos eles. Contadores e
+    histogramas de processos encerrados passam para `dead_workers.json` e
+    continuam somados; gauges só entram enquanto o snapshot do processo
+    estiver sendo atualizado.
+    '''
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._token_pid: Optional[int] = None
+        self._token = ""
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        '''Registra uma função chamada antes de cada snapshot (ex.: gauges lidos do pool).'''
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        for collector in self._collectors:
+            collector()
+        return {
+            name: {
+                "type": metric.type_name,
+                "help": metric.documentation,
+                "buckets": list(getattr(metric, "buckets", ())),
+                "samples": metric.samples(),
+            }
+            for name, metric in self._metrics.items()
+        }
+
+    # --- Multiprocesso ---
+
+    def _process_token(self) -> str:
+        '''Identifica o processo no nome do snapshot: pid + sufixo aleatório.
+
+        O sufixo evita que um processo novo que herde o pid de um worker
+        encerrado sobrescreva o snapshot dele. É refeito após um fork.
+        '''
+        if self._token_pid != os.getpid():
+            self._token_pid = os.getpid()
+            self._token = f"{self._token_pid}_{uuid.uuid4().hex[:12]}"
+        return self._token
+
+    def _snapshot_path(self, directory: str) -> str:
+        return os.path.join(directory, f"metrics_{self._process_token()}.json")
+
+    @staticmethod
+    def _write_json(path: str, data: dict) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    @contextmanager
+    def _dir_lock(directory: str):
+        '''Lock exclusivo de METRICS_DIR para mover snapshots para o total dos encerrados.'''
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(directory, LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _load_dead(directory: str) -> dict:
+        try:
+            with open(os.path.join(directory, DEAD_WORKERS_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def flush(self) -> None:
+        '''Grava o snapshot deste processo em METRICS_DIR (escrita atômica).'''
+        directory = config.METRICS_DIR
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._write_json(self._snapshot_path(directory), {
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "metrics": self.snapshot(),
+        })
+
+    def retire(self) -> None:
+        '''Move os contadores deste processo para o total dos encerrados (na saída).'''
+        directory = config.METRICS_DIR
+        if not directory:
+            return
+        with self._dir_lock(directory):
+            dead = self._load_dead(directory)
+            _merge(dead, self.snapshot(), include_gauges=False)
+            self._write_json(os.path.join(directory, DEAD_WORKERS_FILE), dead)
+            try:
+                os.remove(self._snapshot_path(directory))
+            except FileNotFoundError:
+                pass
+
+    def start_flusher(self) -> None:
+        '''Inicia a thread que grava o snapshot a cada METRICS_FLUSH_INTERVAL segundos.'''
+        if not config.METRICS_DIR:
+            if config.WEB_CONCURRENCY > 1:
+                logger.warning(
+                    "WEB_CONCURRENCY=%d sem METRICS_DIR: o /metrics de cada worker mostra "
+                    "apenas as métricas do próprio processo.", config.WEB_CONCURRENCY)
+            return
+        if self._flusher is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(config.METRICS_FLUSH_INTERVAL)
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+        self.flush()
+        self._flusher = threading.Thread(target=loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.retire)
+
+    @staticmethod
+    def _is_fresh(path: str) -> bool:
+        '''Um snapshot não atualizado há 3 intervalos é de um processo parado ou encerrado.'''
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return False
+        return age <= 3 * config.METRICS_FLUSH_INTERVAL
+
+    @staticmethod
+    def _is_dead(data: dict) -> bool:
+        '''Se o processo do snapshot (parado há 3 intervalos) já terminou.
+
+        Só é possível confirmar no mesmo host; snapshots de outro host são
+        considerados encerrados pelo tempo sem atualização.
+        '''
+        if data.get("host") != socket.gethostname() or os.name != "posix":
+            return True
+        try:
+            os.kill(data["pid"], 0)
+        except ProcessLookupError:
+            return True
+        except (OSError, KeyError, TypeError):
+            return False
+        return False
+
+    def _collect_all(self) -> dict:
+        '''Soma os snapshots de METRICS_DIR.
+
+        Os snapshots de processos encerrados sem `retire` (ex.: SIGKILL) são
+        incorporados ao total dos encerrados e apagados, sob o lock do
+        diretório: os contadores mudam de arquivo sem nunca diminuir.
+        '''
+        directory = config.METRICS_DIR
+        if not directory:
+            return self.snapshot()
+
+        self.flush()
+        merged: dict = {}
+        own_path = self._snapshot_path(directory)
+        with self._dir_lock(directory):
+            dead = self._load_dead(directory)
+            retired = False
+            for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                fresh = path == own_path or self._is_fresh(path)
+                if not fresh and self._is_dead(data):
+                    _merge(dead, data["metrics"], include_gauges=False)
+                    os.remove(path)
+                    retired = True
+                    continue
+                _merge(merged, data["metrics"], include_gauges=fresh)
+            if retired:
+                self._write_json(os.path.join(directory, DEAD_WORKERS_FILE), dead)
+        _merge(merged, dead, include_gauges=False)
+        return merged
+
+    def render(self) -> str:
+        '''Gera o texto no formato de exposição do Prometheus (0.0.4).'''
+        lines = []
+        for name, metric in sorted(self._collect_all().items()):
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for key, value in sorted(metric["samples"].items()):
+                labels = json.loads(key)
+                if metric["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                for bound, count in zip(metric["buckets"], value["buckets"]):
+                    lines.append(f"{name}_bucket{_format_labels(labels, {'le': _format_value(bound)})} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, {'le': '+Inf'})} {value['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = Counter(
+    registry, "http_requests_total", "Requisições HTTP atendidas.",
+    ("method", "route", "status"))
+http_request_duration_seconds = Histogram(
+    registry, "http_request_duration_seconds", "Latência das requisições HTTP em segundos.",
+    ("method", "route"))
+http_requests_in_progress = Gauge(
+    registry, "http_requests_in_progress", "Requisições HTTP em andamento.",
+    ("method",))
+db_pool_checkouts_total = Counter(
+    registry, "db_pool_checkouts_total", "Conexões retiradas do pool.",
+    ("stack",))
+db_pool_checked_out = Gauge(
+    registry, "db_pool_checked_out", "Conexões do pool em uso no momento.",
+    ("stack",))
+db_pool_overflow = Gauge(
+    registry, "db_pool_overflow", "Conexões abertas além de pool_size.",
+    ("stack",))
+sqlite_lock_errors_total = Counter(
+    registry, "sqlite_lock_errors_total",
+    "Comandos que esgotaram o busy_timeout esperando um lock do SQLite.")
+
+
+def watch_pool(engine: Engine, stack: str) -> None:
+    '''Conta as retiradas e devoluções do pool de `engine` com o label `stack`.
+
+    Os listeners ficam no engine (e passam para o pool novo após um
+    `dispose`), não na classe `Pool`: assim os pools das pilhas síncrona e
+    assíncrona não somam na mesma série.
+    '''
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkouts_total.inc(stack=stack)
+        db_pool_checked_out.inc(stack=stack)
+
+    def on_checkin(dbapi_connection, connection_record):
+        db_pool_checked_out.dec(stack=stack)
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+
+
+def _collect_pool_overflow() -> None:
+    from app.core.database import active_engines
+
+    for stack, engine in active_engines().items():
+        overflow = getattr(engine.pool, "overflow", None)
+        if overflow is not None:
+            db_pool_overflow.set(max(0, overflow()), stack=stack)
+
+
+registry.add_collector(_collect_pool_overflow)
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_db_error(exception_context):
+    '''Conta os erros "database is locked" (busy_timeout esgotado).'''
+    message = str(exception_context.original_exception).lower()
+    if "database is locked" in message or "database is busy" in message:
+        sqlite_lock_errors_total.inc()
+
+
+class MetricsMiddleware:
+    '''Middleware ASGI que alimenta as métricas HTTP.
+
+    A rota é registrada pelo template (ex.: /api/customers/{customer_id}),
+    para que IDs não criem uma série nova a cada requisição.
+    '''
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_capturing_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method=method)
+        try:
+            await self.app(scope, receive, send_capturing_status)
+        finally:
+            http_requests_in_progress.dec(method=method)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration_seconds.observe(
+                time.perf_counter() - start, method=method, route=route_path)
+            http_requests_total.inc(method=method, route=route_path, status=str(status_code))
@@ -0,0 +1,81 @@
+"""Paginação por cursor (keyset) para os endpoints de listagem.
+
+Em vez de `OFFSET`, que obriga o banco a percorrer e descartar todas as
+linhas anteriores, a próxima página começa logo depois da última linha
+recebida: `WHERE (sort_key, id) > (:ultimo_sort_key, :ultimo_id)`. Com um
+índice em `sort_key` o custo de qualquer página é o mesmo da primeira.
+
+O cursor é opaco para o cliente (JSON em base64url) e volta no cabeçalho
+`Link` (rel="next") e em `X-Next-Cursor`; o corpo da resposta continua sendo
+a lista. `skip` segue funcionando para compatibilidade.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import DateTime, tuple_
+
+
+# Maior `limit` aceito pelas listagens (`Query(100, ge=1, le=MAX_LIMIT)`).
+MAX_LIMIT = 1000
+
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    if isinstance(sort_value, (datetime, date)):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column) -> tuple:
+    '''Decodifica o cursor; lança HTTPException 400 se ele for inválido.'''
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(sort_column.type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        if not isinstance(row_id, int):
+            raise ValueError(row_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    return sort_value, row_id
+
+
+def keyset(query, sort_column, id_column, limit: int, skip: int = 0, cursor: str | None = None):
+    '''Aplica ordenação estável e a janela da página a uma Query ou select().
+
+    Busca `limit + 1` linhas: a linha extra só indica que existe próxima
+    página e é descartada por `next_page`.
+    '''
+    order = (id_column,) if sort_column is id_column else (sort_column, id_column)
+    query = query.order_by(*order)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        if sort_column is id_column:
+            query = query.where(id_column > row_id)
+        else:
+            query = query.where(tuple_(sort_column, id_column) > tuple_(sort_value, row_id))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(max(limit, 0) + 1)
+
+
+def next_page(request: Request, response: Response, items: list, limit: int, sort_attr: str) -> list:
+    '''Corta a linha extra e, se houver próxima página, informa o cursor nos cabeçalhos.'''
+    if limit < 1:
+        return []
+    if len(items) <= limit:
+        return items
+
+    items = items[:limit]
+    last = items[-1]
+    cursor = encode_cursor(getattr(last, sort_attr), last.id)
+    url = request.url.remove_query_params("skip").include_query_params(cursor=cursor)
+    response.headers["Link"] = f'<{url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = cursor
+    return items
@@ -0,0 +1,120 @@
+"""Busca textual de clientes com FTS5 (SQLite).
+
+`customers_fts` é uma tabela FTS5 de conteúdo externo sobre `customers.name`,
+mantida pelos triggers abaixo. O tokenizer `unicode61 remove_diacritics 2`
+ignora acentos dos dois lados, então "joao" encontra "João". Em outros
+bancos a busca cai para `ILIKE`.
+"""
+import re
+
+from sqlalchemy import text
+
+
+FTS_TABLE = "customers_fts"
+
+CREATE_FTS_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5("
+    "name, content='customers', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+FTS_TRIGGERS = {
+    "customers_fts_ai": (
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN "
+        "INSERT INTO customers_fts(rowid, name) VALUES (new.id, new.name); END"
+    ),
+    "customers_fts_ad": (
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name) VALUES ('delete', old.id, old.name); END"
+    ),
+    "customers_fts_au": (
+        "CREATE TRIGGER IF NOT EXISTS customers_fts_au AFTER UPDATE OF name ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+        "INSERT INTO customers_fts(rowid, name) VALUES (new.id, new.name); END"
+    ),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(term: str) -> str:
+    '''Converte o texto digitado em uma consulta FTS5 de prefixo.
+
+    Cada palavra vira um termo entre aspas com `*` (prefixo), e todos precisam
+    aparecer: "jo conc" -> "jo"* "conc"*. Operadores e aspas do usuário são
+    descartados, então a consulta é sempre válida.
+    '''
+    return " ".join(f'"{token}"*' for token in _TOKEN.findall(term or ""))
+
+
+def create_triggers(connection) -> None:
+    for ddl in FTS_TRIGGERS.values():
+        connection.execute(text(ddl))
+
+
+def drop_triggers(connection) -> None:
+    for name in FTS_TRIGGERS:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+def rebuild(connection) -> None:
+    '''Reconstrói o índice a partir de `customers` (após cargas sem triggers).'''
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def install(connection) -> None:
+    '''Cria a tabela FTS e os triggers, e indexa os clientes já existentes.'''
+    connection.execute(text(CREATE_FTS_TABLE))
+    create_triggers(connection)
+    rebuild(connection)
+
+
+def has_fts(connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first() is not None
+
+
+def install_on_create(target, connection, **kw):
+    '''Listener de `after_create` da tabela customers (ver app/models.py).
+
+    Bancos criados com `Base.metadata.create_all` (simulador, benchmarks,
+    seed.py) ganham o mesmo índice que a migração cria.
+    '''
+    if connection.dialect.name == "sqlite":
+        install(connection)
+
+
+def drop_on_drop(target, connection, **kw):
+    '''Listener de `before_drop` da tabela customers.'''
+    if connection.dialect.name == "sqlite":
+        drop_triggers(connection)
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+def search_customers_statement(term: str, limit: int, dialect_name: str):
+    '''Monta a consulta de busca de clientes ativos por nome, ordenada por relevância.
+
+    Retorna None quando o texto não tem nenhuma palavra pesquisável.
+    '''
+    query = fts_query(term)
+    if not query:
+        return None
+
+    if dialect_name == "sqlite":
+        return text(
+            "SELECT c.id, c.name FROM customers_fts "
+            "JOIN customers AS c ON c.id = customers_fts.rowid "
+            "WHERE customers_fts MATCH :query AND c.is_active = 1 "
+            "ORDER BY customers_fts.rank LIMIT :limit"
+        ).bindparams(query=query, limit=limit)
+
+    pattern = "%" + "%".join(_TOKEN.findall(term)) + "%"
+    return text(
+        "SELECT id, name FROM customers "
+        "WHERE is_active = :active AND name ILIKE :pattern "
+        "ORDER BY name LIMIT :limit"
+    ).bindparams(active=True, pattern=pattern, limit=limit)
@@ -1,9 +1,24 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import customers, bookings, sales, employees, pets, dashboard, inventory, schedule
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from app.core import config, metrics
+from app.core.database import dispose_async_engine
+from app.core.instrumentation import SQLInstrumentationMiddleware
+from .routers import (customers, bookings, sales, employees, pets, dashboard, inventory,
+                      schedule, stream, alert)
 
 
-app = FastAPI(title="Pet Control Hub", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.METRICS_ENABLED:
+        metrics.registry.start_flusher()
+    yield
+    await dispose_async_engine()
+
+
+app = FastAPI(title="Pet Control Hub", version="1.0.0", lifespan=lifespan)
 
 
 # Lista de origens que podem acessar a API
@@ -19,21 +34,79 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-DB-Queries", "Link", "X-Next-Cursor", "X-Cache",
+                    "Idempotent-Replayed"],
 )
 
+if config.SQL_INSTRUMENTATION:
+    app.add_middleware(SQLInstrumentationMiddleware)
+
+if config.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        """Métricas da aplicação no formato de texto do Prometheus."""
+        return PlainTextResponse(metrics.registry.render(),
+                                 media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+sync_routers = [
+    customers.router,
+    bookings.router,
+    schedule.router,
+    sales.router,
+    employees.router,
+    pets.router,
+    dashboard.router,
+    inventory.router,
+    alert.router,
+    stream.router,
+]
+
+
+def _route_keys(router: APIRouter) -> set:
+    return {(route.path, method)
+            for route in router.routes if isinstance(route, APIRoute)
+            for method in route.methods}
 
-app.include_router(customers.router)
 
-app.include_router(bookings.router)
+def _without_routes(router: APIRouter, served: set) -> APIRouter:
+    '''Copia o router removendo as rotas (caminho, método) já servidas.'''
+    remaining = [route for route in router.routes
+                 if not isinstance(route, APIRoute)
+                 or not {(route.path, m) for m in route.methods} <= served]
+    return APIRouter(routes=remaining)
 
-app.include_router(schedule.router)
 
-app.include_router(sales.router)
+if config.DB_STACK == "async":
+    from .routers.aio import (customers as aio_customers, bookings as aio_bookings,
+                              sales as aio_sales, employees as aio_employees,
+                              pets as aio_pets, dashboard as aio_dashboard,
+                              inventory as aio_inventory, schedule as aio_schedule,
+                              alert as aio_alert)
 
-app.include_router(employees.router)
+    async_routers = [
+        aio_customers.router,
+        aio_bookings.router,
+        aio_schedule.router,
+        aio_sales.router,
+        aio_employees.router,
+        aio_pets.router,
+        aio_dashboard.router,
+        aio_inventory.router,
+        aio_alert.router,
+    ]
 
-app.include_router(pets.router)
+    served = set().union(*(_route_keys(router) for router in async_routers))
 
-app.include_router(dashboard.router)
+    # Rotas que só existem na pilha síncrona entram primeiro, para que
+    # caminhos literais (ex.: /export) não sejam capturados por /{id}.
+    for router in sync_routers:
+        app.include_router(_without_routes(router, served))
 
-app.include_router(inventory.router)
+    for router in async_routers:
+        app.include_router(router)
+else:
+    for router in sync_routers:
+        app.include_router(router)
@@ -1,6 +1,10 @@
-from sqlalchemy import (Column, Integer, String, Float, DateTime,
-                        Boolean, ForeignKey, func)
+from datetime import datetime, timezone
+
+from sqlalchemy import (Column, Integer, String, Text, Float, Date, DateTime,
+                        Boolean, ForeignKey, Index, and_, event, func, text)
 from app.core.database import Base
+from app.core import search
+from app.utils.scheduling import booking_end, service_duration
 from sqlalchemy.orm import relationship
 
 
@@ -22,6 +26,11 @@ class Customer(Base):
     pets = relationship("Pet", back_populates="owner", cascade="all, delete-orphan")
     sales = relationship("Sale", back_populates="customer", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_customers_active_name", "name",
+              sqlite_where=is_active == True, postgresql_where=is_active == True),
+    )
+
 class Pet(Base):
     '''Representa um pet, pertecente a um cliente.'''
     __tablename__ = "pets"
@@ -42,6 +51,11 @@ class Pet(Base):
     bookings = relationship("Booking", back_populates="pet", cascade="all, delete-orphan")
     vaccines = relationship("Vaccine", back_populates="pet", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Também serve como índice da FK customer_id (coluna líder).
+        Index("ix_pets_customer_id_is_active", "customer_id", "is_active"),
+    )
+
 class Employee(Base):
     '''Representa um funcionário do PetShop.'''
     __tablename__ = "employees"
@@ -59,6 +73,22 @@ class Employee(Base):
 
     bookings = relationship("Booking", back_populates="employee")
 
+    __table_args__ = (
+        Index("ix_employees_active_name", "name",
+              sqlite_where=is_active == True, postgresql_where=is_active == True),
+    )
+
+def _default_duration(context):
+    '''Duração derivada do serviço quando o INSERT não informa (inclusive em lote).'''
+    return service_duration(context.get_current_parameters()["service_name"])
+
+
+def _default_ends_at(context):
+    params = context.get_current_parameters()
+    duration = params.get("duration_minutes") or service_duration(params["service_name"])
+    return booking_end(params["scheduled_time"], duration)
+
+
 class Booking(Base):
     '''Representa um agendamento de serviço para um pet com um funcionário específico.'''
     __tablename__ = "bookings"
@@ -69,14 +99,27 @@ class Booking(Base):
 
     service_name = Column(String(100), nullable=False)
     scheduled_time = Column(DateTime(timezone=True), index=True, nullable=False)
+    duration_minutes = Column(Integer, nullable=False, default=_default_duration,
+                              server_default=text("30"))
+    # Fim do atendimento (scheduled_time + duration_minutes), gravado para que a
+    # verificação de sobreposição seja uma comparação simples no banco.
+    ends_at = Column(DateTime(timezone=True), nullable=False, default=_default_ends_at)
     delivery = Column(Boolean, default=False)
-    pet_id = Column(Integer, ForeignKey("pets.id"), nullable=False)
+    pet_id = Column(Integer, ForeignKey("pets.id"), index=True, nullable=False)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
 
     is_active = Column(Boolean, default=True, nullable=False)
     
     pet = relationship("Pet", back_populates="bookings")
     employee = relationship("Employee", back_populates="bookings")
+
+    __table_args__ = (
+        # Verificação de conflito de horário por funcionário.
+        Index("ix_bookings_employee_id_scheduled_time_is_active",
+              "employee_id", "scheduled_time", "is_active"),
+        Index("ix_bookings_active_scheduled_time", "scheduled_time",
+              sqlite_where=is_active == True, postgresql_where=is_active == True),
+    )
     
 class Inventory(Base):
     '''Representa um produto no inventário do PetShop.'''
@@ -95,18 +138,40 @@ class Inventory(Base):
 
     sale_items = relationship("Sale", back_populates="product")
 
+    __table_args__ = (
+        Index("ix_inventory_product_name_is_active", "product_name", "is_active"),
+        # Só os itens ativos em estoque baixo: /api/alert/low-stock/ e
+        # ?low_stock=true leem este conjunto sem percorrer o estoque todo. As
+        # colunas extras tornam o índice de cobertura para o alerta (e fazem o
+        # SQLite preferi-lo ao índice único de product_name mesmo sem ANALYZE).
+        Index("ix_inventory_low_stock", "product_name", "id", "quantity",
+              "low_stock_threshold", "is_active",
+              sqlite_where=and_(is_active == True, quantity <= low_stock_threshold),
+              postgresql_where=and_(is_active == True, quantity <= low_stock_threshold)),
+    )
+
+def _utcnow():
+    '''Mesmo instante de `func.now()`, mas enviado pela aplicação.
+
+    No SQLite o `CURRENT_TIMESTAMP` grava 'YYYY-MM-DD HH:MM:SS', sem a fração
+    de segundo que o SQLAlchemy usa nos parâmetros; como a comparação é de
+    texto, filtros e cursores por `created_at` erravam vendas do mesmo segundo.
+    '''
+    return datetime.now(timezone.utc)
+
+
 class Sale(Base):
     '''Representa uma linha de venda com produto para um cliente.'''
     __tablename__ = "sales"
 
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     quantity = Column(Integer, nullable=False)
     total_value = Column(Float, nullable=False)
-    product_id = Column(Integer, ForeignKey("inventory.id"), nullable=False)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False) 
+    product_id = Column(Integer, ForeignKey("inventory.id"), index=True, nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True, nullable=False)
     
     is_active = Column(Boolean, default=True, nullable=False)
 
@@ -114,6 +179,48 @@ class Sale(Base):
     product = relationship("Inventory", back_populates="sale_items")
     customer = relationship("Customer", back_populates="sales")
 
+    __table_args__ = (
+        Index("ix_sales_active_created_at", "created_at",
+              sqlite_where=is_active == True, postgresql_where=is_active == True),
+    )
+
+class SalesDaily(Base):
+    '''Totais das vendas ativas por dia (UTC), produto e cliente.
+
+    Mantida na mesma transação das vendas (ver app/services/sales_daily.py);
+    os relatórios de receita e volume leem daqui em vez de agregar `sales`.
+    '''
+    __tablename__ = "sales_daily"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("inventory.id"), primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True)
+
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+    sales_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_sales_daily_product_id_day", "product_id", "day"),
+        Index("ix_sales_daily_customer_id_day", "customer_id", "day"),
+    )
+
+class IdempotencyKey(Base):
+    '''Resposta guardada de um POST enviado com `Idempotency-Key`.
+
+    A linha é gravada na mesma transação da escrita (ver
+    app/core/idempotency.py) e vale até `expires_at`.
+    '''
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    endpoint = Column(String(100), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
 class Vaccine(Base):
     '''Representa uma vacina aplicada a um pet.'''
     __tablename__ = "vaccines"
@@ -124,6 +231,11 @@ class Vaccine(Base):
 
     vaccine_name = Column(String(100), nullable=False)
     date_of_application = Column(DateTime(timezone=True), nullable=False)
-    pet_id = Column(Integer, ForeignKey("pets.id"), nullable=False)
+    pet_id = Column(Integer, ForeignKey("pets.id"), index=True, nullable=False)
+
+    pet = relationship("Pet", back_populates="vaccines")
+
 
-    pet = relationship("Pet", back_populates="vaccines")
\ No newline at end of file
+# Índice FTS5 de nomes de clientes (ver app/core/search.py).
+event.listen(Customer.__table__, "after_create", search.install_on_create)
+event.listen(Customer.__table__, "before_drop", search.drop_on_drop)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.core.database import get_async_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.schemas import inventory as schemas
+from app.services import inventory as stock_rules
+
+
+router = APIRouter(
+    prefix="/api/alert",
+    tags=["Alerts"]
+)
+
+
+@router.get("/low-stock/", response_model=list[schemas.LowStockItem])
+async def get_low_stock_alert(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Lista os itens em estoque baixo pelo índice parcial (versão assíncrona)."""
+    items = (await db.execute(keyset(stock_rules.low_stock_query(), models.Inventory.product_name,
+                                     models.Inventory.id, limit, cursor=cursor))).all()
+    return [item._asdict() for item in next_page(request, response, items, limit, "product_name")]
@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.schemas import booking as schemas
+from app.core.database import get_async_db
+from app.core import export, idempotency
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.services import bookings as booking_rules
+
+router = APIRouter(
+    prefix="/api/bookings",
+    tags=["Bookings"]
+)
+
+
+async def get_booking_or_404(booking_id: int,
+                             db: AsyncSession = Depends(get_async_db)):
+    """
+    Dependência assíncrona que busca um agendamento pelo ID.
+    Lança HTTPException 404 se o agendamento não for encontrado.
+    """
+    db_booking = await db.scalar(select(models.Booking).where(
+        models.Booking.id == booking_id,
+        models.Booking.is_active == True
+    ))
+
+    if not db_booking:
+        raise HTTPException(
+            status_code=404,
+            detail="Agendamento não encontrado")
+
+    return db_booking
+
+
+@router.post("/", response_model=schemas.Booking)
+async def create_new_booking(booking: schemas.Booking,
+                             db: AsyncSession = Depends(get_async_db),
+                             idempotency_key: Optional[str] = Depends(idempotency.header)):
+    """Cria um novo agendamento se o intervalo não se sobrepuser a outro do funcionário."""
+    replay = await idempotency.aclaim(db, idempotency_key, "POST /api/bookings/", booking)
+    if replay:
+        return replay
+
+    db_booking = models.Booking(**booking_rules.prepare_new_booking(booking.dict()))
+    db.add(db_booking)
+    await db.flush()
+
+    conflict = await db.scalar(booking_rules.conflict_query(
+        db_booking.employee_id, db_booking.scheduled_time, db_booking.ends_at,
+        exclude_id=db_booking.id))
+    if conflict:
+        error = booking_rules.conflict_error(conflict)
+        await db.rollback()
+        raise error
+
+    await idempotency.asave(db, idempotency_key, "POST /api/bookings/",
+                            schemas.Booking, db_booking)
+    await db.commit()
+    await db.refresh(db_booking)
+    booking_rules.booking_changed("booking.created", booking_rules.booking_event(db_booking))
+    return db_booking
+
+
+@router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_booking(
+        booking: models.Booking = Depends(get_booking_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    """Soft delete de um agendamento pelo seu ID."""
+
+    booking.is_active = False
+    data = booking_rules.booking_event(booking)
+    db.add(booking)
+    await db.commit()
+    booking_rules.booking_changed("booking.cancelled", data)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.patch("/{booking_id}", response_model=schemas.Booking)
+async def update_booking(
+        booking_update: schemas.BookingUpdate,
+        db_booking: models.Booking = Depends(get_booking_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    """Atualiza um agendamento existente, verificando conflitos se o horário mudar."""
+
+    before = (db_booking.employee_id, db_booking.scheduled_time)
+    rescheduled = booking_rules.apply_booking_update(
+        db_booking, booking_update.dict(exclude_unset=True))
+
+    db.add(db_booking)
+    if rescheduled:
+        await db.flush()
+        conflict = await db.scalar(booking_rules.conflict_query(
+            db_booking.employee_id, db_booking.scheduled_time, db_booking.ends_at,
+            exclude_id=db_booking.id))
+        if conflict:
+            error = booking_rules.conflict_error(conflict)
+            await db.rollback()
+            raise error
+
+    await db.commit()
+    await db.refresh(db_booking)
+    booking_rules.booking_changed("booking.updated", booking_rules.booking_event(db_booking), before)
+    return db_booking
+
+
+@router.get("/", response_model=list[schemas.Booking])
+async def get_all_bookings(request: Request, response: Response,
+                           skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_LIMIT),
+                           cursor: str | None = None,
+                           db: AsyncSession = Depends(get_async_db)):
+    """Retorna uma lista de agendamentos, em ordem de horário, com paginação por `skip` ou `cursor`."""
+    query = select(models.Booking).where(models.Booking.is_active == True)
+    bookings = await db.scalars(keyset(query, models.Booking.scheduled_time, models.Booking.id,
+                                       limit, skip, cursor))
+
+    return next_page(request, response, bookings.all(), limit, "scheduled_time")
+
+
+@router.get("/export")
+async def export_bookings(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    fmt: export.ExportFormat = Query("csv", alias="format"),
+    gzip: bool = False
+):
+    """Exporta os agendamentos ativos que começam em [from, to), em CSV ou NDJSON, em streaming."""
+    start, end = export.period(start, end, utc=False)
+    return export.export_response(booking_rules.export_query(start, end), "agendamentos", fmt, gzip,
+                                  asynchronous=True)
+
+
+@router.get("/{booking_id}", response_model=schemas.Booking)
+async def get_booking_by_id(
+        booking: models.Booking = Depends(get_booking_or_404)):
+    """Busca um agendamento específico pelo ID."""
+
+    return booking
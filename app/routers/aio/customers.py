@@ -0,0 +1,146 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.core.database import get_async_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.core import export, idempotency, search
+from app.schemas import customer as schemas
+
+
+router = APIRouter(
+    prefix="/api/customers",
+    tags=["Customers"]
+)
+
+
+async def get_customer_or_404(customer_id: int,
+                              db: AsyncSession = Depends(get_async_db)):
+    """
+    Dependência assíncrona que busca um cliente ATIVO pelo ID.
+    Lança HTTPException 404 se o cliente não for encontrado ou estiver inativo.
+    """
+    db_customer = await db.scalar(select(models.Customer).where(
+        models.Customer.id == customer_id,
+        models.Customer.is_active == True
+    ))
+
+    if not db_customer:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cliente com id {customer_id} não encontrado"
+        )
+    return db_customer
+
+
+@router.post("/", response_model=schemas.Customer, status_code=status.HTTP_201_CREATED)
+async def create_new_customer(customer: schemas.CustomerIn,
+                              db: AsyncSession = Depends(get_async_db),
+                              idempotency_key: Optional[str] = Depends(idempotency.header)):
+    """Cria um novo cliente (versão assíncrona de `create_new_customer`)."""
+    replay = await idempotency.aclaim(db, idempotency_key, "POST /api/customers/", customer)
+    if replay:
+        return replay
+
+    existing_customer = await db.scalar(select(models.Customer).where(
+        models.Customer.cpf == customer.cpf).limit(1))
+
+    if existing_customer:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Já existe um cliente cadastrado com este CPF. Cliente: {existing_customer.name}"
+        )
+
+    db_customer = models.Customer(**customer.dict())
+    db.add(db_customer)
+    await db.flush()
+    await idempotency.asave(db, idempotency_key, "POST /api/customers/",
+                            schemas.Customer, db_customer, status.HTTP_201_CREATED)
+    await db.commit()
+    await db.refresh(db_customer)
+    return db_customer
+
+
+@router.get("/", response_model=list[schemas.Customer])
+async def get_all_customers(request: Request, response: Response,
+                            skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_LIMIT),
+                            cursor: str | None = None,
+                            db: AsyncSession = Depends(get_async_db)):
+    """Retorna uma lista de clientes, ordenada por nome, com paginação por `skip` ou `cursor`."""
+    query = select(models.Customer).where(models.Customer.is_active == True)
+    customers = await db.scalars(keyset(query, models.Customer.name, models.Customer.id,
+                                        limit, skip, cursor))
+
+    return next_page(request, response, customers.all(), limit, "name")
+
+
+@router.get("/export")
+async def export_customers(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    fmt: export.ExportFormat = Query("csv", alias="format"),
+    gzip: bool = False
+):
+    """Exporta os clientes ativos (cadastrados em [from, to), se informado) em CSV ou NDJSON."""
+    start, end = export.period(start, end, utc=True)
+    query = (select(models.Customer.id, models.Customer.created_at, models.Customer.name,
+                    models.Customer.phone, models.Customer.address, models.Customer.cpf)
+             .where(models.Customer.is_active == True)
+             .order_by(models.Customer.id))
+    if start is not None:
+        query = query.where(models.Customer.created_at >= start)
+    if end is not None:
+        query = query.where(models.Customer.created_at < end)
+    return export.export_response(query, "clientes", fmt, gzip, asynchronous=True)
+
+
+@router.get("/{customer_id}", response_model=schemas.Customer)
+async def get_customer_by_id(
+        customer: models.Customer = Depends(get_customer_or_404)):
+    """Retorna um cliente pelo seu ID."""
+    return customer
+
+
+@router.get("/search/", response_model=list[schemas.CustomerSearchResult])
+async def search_customers_by_name(name: str, limit: int = Query(20, ge=1, le=100),
+                                   db: AsyncSession = Depends(get_async_db)):
+    """Busca clientes por nome no índice FTS5, por prefixo e sem acentos."""
+
+    statement = search.search_customers_statement(name, limit, db.bind.dialect.name)
+    results = (await db.execute(statement)).all() if statement is not None else []
+
+    if not results:
+        raise HTTPException(
+            status_code=404, detail="Nenhum cliente encontrado")
+
+    return [{"id": r[0], "name": r[1]} for r in results]
+
+
+@router.patch("/{customer_id}", response_model=schemas.Customer)
+async def update_customer(
+        customer_update: schemas.CustomerUpdate,
+        db_customer: models.Customer = Depends(get_customer_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    '''Atualiza um cliente existente.'''
+
+    for key, value in customer_update.dict(exclude_unset=True).items():
+        setattr(db_customer, key, value)
+    db.add(db_customer)
+    await db.commit()
+    await db.refresh(db_customer)
+    return db_customer
+
+
+@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_customer(
+    customer: models.Customer = Depends(get_customer_or_404),
+    db: AsyncSession = Depends(get_async_db)
+):
+    '''Soft delete de um cliente pelo seu ID.'''
+    customer.is_active = False
+    db.add(customer)
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.core.database import get_async_db
+from app.schemas import dashboard as schemas
+from app.services import sales_daily as rollup
+from datetime import date
+from typing import Optional
+
+
+router = APIRouter(
+    prefix="/api/dashboard",
+    tags=["Dashboard & KPIs"]
+)
+
+
+@router.get("/", response_model=schemas.KPIs)
+async def get_dashboard_kpis(db: AsyncSession = Depends(get_async_db)):
+    """Retorna um resumo com os principais KPIs do negócio (versão assíncrona)."""
+
+    total_revenue_result, total_sales_result = (await db.execute(rollup.totals_query())).one()
+    total_revenue = total_revenue_result or 0.0
+
+    total_sales = total_sales_result or 0
+    total_bookings = await db.scalar(select(func.count(models.Booking.id)))
+    total_customers = await db.scalar(select(func.count(models.Customer.id)))
+
+    return schemas.KPIs(
+        total_revenue=total_revenue,
+        total_sales=total_sales,
+        total_bookings=total_bookings,
+        total_customers=total_customers
+    )
+
+
+@router.get("/sales", response_model=list[schemas.SalesDay])
+async def get_sales_by_day(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    product_id: Optional[int] = None,
+    customer_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Receita e volume por dia no período, lidos do rollup diário (versão assíncrona)."""
+    rows = (await db.execute(rollup.report_query(start, end, product_id, customer_id))).all()
+    return [row._asdict() for row in rows]
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.core.database import get_async_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.services import bookings as booking_rules
+from app.schemas import employee as schemas
+
+
+router = APIRouter(
+    prefix="/api/employees",
+    tags=["Employees"]
+)
+
+
+async def get_employee_or_404(employee_id: int,
+                              db: AsyncSession = Depends(get_async_db)):
+    """
+    Dependência assíncrona que busca um funcionário ATIVO pelo ID.
+    Lança HTTPException 404 se o funcionário não for encontrado ou estiver inativo.
+    """
+    db_employee = await db.scalar(select(models.Employee).where(
+        models.Employee.id == employee_id,
+        models.Employee.is_active == True
+    ))
+    if not db_employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Funcionário com id {employee_id} não encontrado ou está inativo."
+        )
+    return db_employee
+
+
+@router.post("/", response_model=schemas.Employee, status_code=status.HTTP_201_CREATED)
+async def create_new_employee(employee: schemas.EmployeeIn,
+                              db: AsyncSession = Depends(get_async_db)):
+    """Cria um novo funcionário após checar por duplicatas de CPF."""
+
+    existing_employee = await db.scalar(select(models.Employee).where(
+        models.Employee.cpf == employee.cpf).limit(1))
+
+    if existing_employee:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Já existe um funcionário cadastrado com este CPF. Funcionário: {existing_employee.name}"
+        )
+
+    db_employee = models.Employee(**employee.dict())
+    db.add(db_employee)
+    await db.commit()
+    await db.refresh(db_employee)
+    return db_employee
+
+
+@router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_employee(
+        employee: models.Employee = Depends(get_employee_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    '''Soft delete de um funcionario pelo seu ID.'''
+
+    employee.is_active = False
+    db.add(employee)
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.patch("/{employee_id}", response_model=schemas.Employee)
+async def update_employee(
+        employee_update: schemas.EmployeeUpdate,
+        db_employee: models.Employee = Depends(get_employee_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    '''Atualiza um funcionário existente.'''
+
+    for key, value in employee_update.dict(exclude_unset=True).items():
+        setattr(db_employee, key, value)
+
+    db.add(db_employee)
+    await db.commit()
+    await db.refresh(db_employee)
+    # Nome e dados aparecem nas agendas em cache.
+    booking_rules.schedule_cache.clear()
+    return db_employee
+
+
+@router.get("/", response_model=list[schemas.Employee])
+async def get_all_employees(request: Request, response: Response,
+                            skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_LIMIT),
+                            cursor: str | None = None,
+                            db: AsyncSession = Depends(get_async_db)):
+    '''Retorna uma lista de funcionários, ordenada por nome, com paginação por `skip` ou `cursor`.'''
+    query = select(models.Employee).where(models.Employee.is_active == True)
+    employees = await db.scalars(keyset(query, models.Employee.name, models.Employee.id,
+                                        limit, skip, cursor))
+
+    return next_page(request, response, employees.all(), limit, "name")
+
+
+@router.get("/{employee_id}", response_model=schemas.Employee)
+async def get_employee_by_id(
+    employee: models.Employee = Depends(get_employee_or_404)
+):
+    """Retorna um funcionário ativo pelo seu ID."""
+    return employee
@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.core.database import get_async_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.schemas import inventory as schemas
+from app.services import inventory as stock_rules
+
+
+router = APIRouter(
+    prefix="/api/inventory",
+    tags=["Inventory"]
+)
+
+
+async def get_inventory_item_or_404(item_id: int,
+                                    db: AsyncSession = Depends(get_async_db)):
+    """
+    Dependência assíncrona que busca um item do inventário pelo ID.
+    Lança HTTPException 404 se o item não for encontrado.
+    """
+    db_item = await db.scalar(select(models.Inventory).where(
+        models.Inventory.id == item_id,
+        models.Inventory.is_active == True))
+
+    if not db_item:
+        raise HTTPException(status_code=404,
+                            detail=f"Item não encontrado com id {item_id}.")
+    return db_item
+
+
+@router.post("/", response_model=schemas.Inventory, status_code=status.HTTP_201_CREATED)
+async def create_inventory_item(inventory_item: schemas.InventoryIn,
+                                db: AsyncSession = Depends(get_async_db)):
+    """Cria um novo item no inventário."""
+
+    db_item = models.Inventory(**inventory_item.dict())
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    stock_rules.publish_stock_transition(db_item, was_low=False)
+    return db_item
+
+
+@router.get("/", response_model=list[schemas.Inventory])
+async def get_inventory_items(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    name: str | None = Query(
+        None, description="Filtre por nome do produto(busca parcial)"),
+    low_stock: bool | None = Query(
+        None, description="Filtre por itens com estoque baixo"),
+    include_inactive: bool = False
+):
+    """Retorna uma lista de itens do inventário com filtros e paginação."""
+    query = select(models.Inventory)
+
+    if not include_inactive:
+        query = query.where(models.Inventory.is_active == True)
+
+    if name:
+        query = query.where(models.Inventory.product_name.ilike(f"%{name}%"))
+
+    if low_stock:
+        query = query.where(stock_rules.low_stock_condition())
+
+    items = await db.scalars(keyset(query, models.Inventory.product_name, models.Inventory.id,
+                                    limit, skip, cursor))
+
+    return next_page(request, response, items.all(), limit, "product_name")
+
+
+@router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_inventory_item(
+        item: models.Inventory = Depends(get_inventory_item_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    '''Soft delete de um item do inventário pelo seu ID.'''
+
+    was_low = stock_rules.is_low_stock(item)
+    item.is_active = False
+    db.add(item)
+    await db.commit()
+    stock_rules.publish_stock_transition(item, was_low)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.patch("/{item_id}", response_model=schemas.Inventory)
+async def update_inventory_item(
+        item_update: schemas.InventoryUpdate,
+        db_item: models.Inventory = Depends(get_inventory_item_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    '''Atualiza um item do inventário existente.'''
+
+    was_low = stock_rules.is_low_stock(db_item)
+    for key, value in item_update.dict(exclude_unset=True).items():
+        setattr(db_item, key, value)
+
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    stock_rules.publish_stock_transition(db_item, was_low)
+    return db_item
+
+
+@router.get("/{item_id}", response_model=schemas.Inventory)
+async def get_inventory_item_by_id(
+        item: models.Inventory = Depends(get_inventory_item_or_404)):
+    '''Retorna um item do inventário pelo seu ID.'''
+
+    return item
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.core.database import get_async_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.services import bookings as booking_rules
+from app.schemas import pet as schemas
+
+router = APIRouter(
+    prefix="/api/pets",
+    tags=["Pets"]
+)
+
+
+async def get_pet_or_404(pet_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Dependência assíncrona que busca um pet ATIVO pelo ID.
+    Lança HTTPException 404 se o pet não for encontrado ou estiver inativo.
+    """
+    db_pet = await db.scalar(select(models.Pet).where(
+        models.Pet.id == pet_id,
+        models.Pet.is_active == True))
+
+    if not db_pet:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Pet com ID {pet_id} não encontrado ou está inativo."
+        )
+    return db_pet
+
+
+@router.post("/", response_model=schemas.Pet)
+async def create_pet(pet: schemas.PetIn, db: AsyncSession = Depends(get_async_db)):
+    """Cria um novo pet no banco de dados."""
+    db_pet = models.Pet(**pet.dict())
+    db.add(db_pet)
+    await db.commit()
+    await db.refresh(db_pet)
+    return db_pet
+
+
+@router.get("/", response_model=list[schemas.Pet])
+async def get_all_pets(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=MAX_LIMIT),
+        cursor: str | None = None,
+        include_inactive: bool = False
+):
+    """Retorna uma lista de pets com paginação por `skip` ou `cursor`."""
+    query = select(models.Pet)
+
+    if not include_inactive:
+        query = query.where(models.Pet.is_active == True)
+
+    pets = await db.scalars(keyset(query, models.Pet.id, models.Pet.id, limit, skip, cursor))
+    return next_page(request, response, pets.all(), limit, "id")
+
+
+@router.delete("/{pet_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_pet(
+        pet: models.Pet = Depends(get_pet_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    '''Soft delete de um pet pelo seu ID.'''
+
+    pet.is_active = False
+    db.add(pet)
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.patch("/{pet_id}", response_model=schemas.Pet)
+async def update_pet(
+        pet_update: schemas.PetUpdate,
+        pet: models.Pet = Depends(get_pet_or_404),
+        db: AsyncSession = Depends(get_async_db)):
+    '''Atualiza um pet existente.'''
+
+    for key, value in pet_update.dict(exclude_unset=True).items():
+        setattr(pet, key, value)
+
+    db.add(pet)
+    await db.commit()
+    await db.refresh(pet)
+    # Nome e dados aparecem nas agendas em cache.
+    booking_rules.schedule_cache.clear()
+    return pet
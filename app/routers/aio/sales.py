@@ -0,0 +1,155 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models
+from app.core import events, export, idempotency
+from app.core.database import async_session, get_async_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.schemas import sale as schemas
+from app.services import inventory as stock_rules
+from app.services import sales as sale_rules
+from app.services import sales_daily as rollup
+from datetime import datetime
+from typing import Optional
+
+
+router = APIRouter(
+    prefix="/api/sales",
+    tags=["Sales"]
+)
+
+
+async def get_sale_or_404(sale_id: int,
+                          db: AsyncSession = Depends(get_async_db)):
+    '''Dependência assíncrona que busca uma venda pelo ID.
+
+    Lança HTTPException 404 se a venda não for encontrada.
+    '''
+    db_sale = await db.scalar(select(models.Sale).where(
+        models.Sale.id == sale_id,
+        models.Sale.is_active == True))
+
+    if not db_sale:
+        raise HTTPException(
+            status_code=404,
+            detail="Venda não encontrada"
+        )
+
+    return db_sale
+
+
+@router.post("/", response_model=schemas.SaleResponse)
+async def create_new_sale(sale: schemas.Sale,
+                          db: AsyncSession = Depends(get_async_db),
+                          idempotency_key: Optional[str] = Depends(idempotency.header)):
+    '''Cria uma nova venda no banco de dados e debita o estoque.'''
+    replay = await idempotency.aclaim(db, idempotency_key, "POST /api/sales/", sale)
+    if replay:
+        return replay
+
+    product_id = await db.scalar(select(models.Inventory.id).where(
+        models.Inventory.product_name == sale.product_name))
+
+    if product_id is None:
+        raise HTTPException(
+            status_code=404, detail="Item não encontrado no inventário")
+
+    quantities = {product_id: sale.quantity}
+    debited = (await db.execute(stock_rules.decrement_stock(quantities))).all()
+    if not debited:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Fora de estoque")
+
+    try:
+        db_sale = models.Sale(
+            product_id=product_id,
+            customer_id=sale.customer_id,
+            quantity=sale.quantity,
+            total_value=sale.total_value
+        )
+        db.add(db_sale)
+        await db.flush()
+        await db.execute(rollup.upsert(db), rollup.deltas([stock_rules.sale_event(db_sale)]))
+        await idempotency.asave(db, idempotency_key, "POST /api/sales/",
+                                schemas.SaleResponse, db_sale)
+        await db.commit()
+        await db.refresh(db_sale)
+    except Exception:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500, detail="Nao foi possivel criar a venda")
+
+    events.publish("sale.created", stock_rules.sale_event(db_sale))
+    stock_rules.publish_decrement_transitions(debited, quantities)
+    return db_sale
+
+
+@router.delete("/{sale_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_sale(
+    sale: models.Sale = Depends(get_sale_or_404),
+    db: AsyncSession = Depends(get_async_db)
+):
+    '''Soft delete de uma venda pelo seu ID.'''
+    if (await db.execute(sale_rules.deactivate(sale.id))).rowcount:
+        await db.execute(rollup.upsert(db), rollup.deltas([stock_rules.sale_event(sale)], sign=-1))
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/export")
+async def export_sales(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    fmt: export.ExportFormat = Query("csv", alias="format"),
+    gzip: bool = False
+):
+    """Exporta as vendas ativas do período [from, to) em CSV ou NDJSON, em streaming."""
+    start, end = sale_rules.sales_window(start, end, None, None)
+    return export.export_response(sale_rules.export_query(start, end), "vendas", fmt, gzip,
+                                  asynchronous=True)
+
+
+@router.get("/{sale_id}", response_model=schemas.SaleResponse)
+async def get_sale_by_id(sale: models.Sale = Depends(get_sale_or_404)):
+    '''Retorna uma venda pelo seu ID.'''
+
+    return sale
+
+
+async def stream_sales(start: Optional[datetime], end: Optional[datetime]):
+    '''Gera o array JSON das vendas do período, um lote de cada vez, com sessão própria.'''
+    async with async_session() as db:
+        result = await db.stream(sale_rules.stream_query(start, end))
+        yield b"["
+        first = True
+        async for rows in result.partitions():
+            yield sale_rules.sales_json_chunk(rows, first)
+            first = False
+        yield b"]"
+
+
+@router.get("/", response_model=list[schemas.SaleResponse])
+async def get_sales(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    month: Optional[int] = Query(
+        None, ge=1, le=12, description="Filtra vendas por mês"),
+    year: Optional[int] = Query(None, ge=1, le=9998, description="Filtra vendas por ano"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    stream: bool = False
+):
+    """Retorna as vendas do período [from, to) (ou do mês), paginadas ou em streaming."""
+    start, end = sale_rules.sales_window(start, end, month, year)
+    if stream:
+        return StreamingResponse(stream_sales(start, end), media_type="application/json")
+
+    query = sale_rules.sales_query(start, end)
+    sales = await db.scalars(keyset(query, models.Sale.created_at, models.Sale.id,
+                                    limit, skip, cursor))
+    return next_page(request, response, sales.all(), limit, "created_at")
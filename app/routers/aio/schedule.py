@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Literal, Optional, Union
+from app import models
+from app.core import config
+from app.core.database import get_async_db
+from app.services import bookings as booking_rules
+from app.schemas import booking as schemas
+
+
+router = APIRouter(
+    prefix="/api/schedule",
+    tags=["Schedule"]
+)
+
+
+ScheduleResponse = Union[list[schemas.BookingResponse], list[schemas.EmployeeSchedule]]
+
+
+@router.get("/", response_model=ScheduleResponse)
+async def get_schedule(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    employee_id: Optional[int] = None,
+    group_by: Optional[Literal["employee"]] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna os agendamentos ativos que começam em [from, to) (versão assíncrona).
+
+    O pet e o funcionário vêm na mesma consulta (`joinedload`), já que o
+    carregamento lazy não é permitido com AsyncSession. Usa o mesmo cache da
+    versão síncrona.
+    """
+    default_start, default_length = booking_rules.today_window()
+    start, end = booking_rules.resolve_window(start, end, default_start, default_length)
+    key = (start, end, employee_id, group_by)
+    body = booking_rules.schedule_cache.get(key)
+    cache_status = "HIT"
+    if body is None:
+        cache_status = "MISS"
+        generation = booking_rules.schedule_cache.generation
+        bookings = (await db.scalars(booking_rules.schedule_query(start, end, employee_id))).all()
+        body = booking_rules.render_schedule(bookings, group_by)
+        booking_rules.schedule_cache.set(key, body, generation)
+
+    return Response(content=body, media_type="application/json", headers={"X-Cache": cache_status})
+
+
+@router.get("/today/", response_model=ScheduleResponse)
+async def get_todays_schedule(
+    employee_id: Optional[int] = None,
+    group_by: Optional[Literal["employee"]] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Retorna os agendamentos ativos de hoje (rota usada pela tela de Agenda)."""
+    return await get_schedule(None, None, employee_id, group_by, db)
+
+
+@router.get("/availability", response_model=schemas.Availability)
+async def get_availability(
+    employee_id: Optional[int] = None,
+    service: Optional[str] = None,
+    duration_minutes: Optional[int] = Query(None, gt=0, le=config.BOOKING_MAX_DURATION_MINUTES),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Retorna os horários livres no período (versão assíncrona)."""
+    start, end = booking_rules.resolve_window(start, end)
+    duration = booking_rules.resolve_duration(service or "", duration_minutes)
+
+    employees_query = select(models.Employee.id, models.Employee.name).where(
+        models.Employee.is_active == True
+    )
+    if employee_id is not None:
+        employees_query = employees_query.where(models.Employee.id == employee_id)
+    employees = (await db.execute(employees_query.order_by(models.Employee.name))).all()
+    if employee_id is not None and not employees:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Funcionário com id {employee_id} não encontrado ou está inativo."
+        )
+
+    bookings = (await db.execute(booking_rules.window_query(
+        start, end, [employee_id] if employee_id is not None else None))).all()
+
+    return {
+        "service": service,
+        "duration_minutes": duration,
+        "from": start,
+        "to": end,
+        "employees": booking_rules.availability(employees, bookings, start, end, duration),
+    }
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+from app import models
+from app.core.database import get_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.schemas import inventory as schemas
+from app.services import inventory as stock_rules
+
+
+router = APIRouter(
+    prefix="/api/alert",
+    tags=["Alerts"]
+)
+
+
+@router.get("/low-stock/", response_model=list[schemas.LowStockItem])
+def get_low_stock_alert(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    db: Session = Depends(get_db)
+):
+    """Lista os itens ativos com `quantity <= low_stock_threshold`, por nome.
+
+    A consulta lê só o índice parcial `ix_inventory_low_stock`, que contém
+    apenas os itens em estoque baixo: o custo acompanha o tamanho do alerta,
+    não o do estoque. Para acompanhar as mudanças sem consultar de novo,
+    assine `GET /api/stream?types=stock` (`stock.low` e `stock.restored`
+    chegam quando um item cruza o limite).
+
+    Args:
+        limit (int): Máximo de itens por página.
+        cursor (str, optional): Cursor da próxima página (`X-Next-Cursor`).
+        db (Session): A sessão do banco de dados, injetada pelo FastAPI.
+
+    Returns:
+        list[schemas.LowStockItem]: Os itens em estoque baixo.
+    """
+    items = db.execute(keyset(stock_rules.low_stock_query(), models.Inventory.product_name,
+                              models.Inventory.id, limit, cursor=cursor)).all()
+    return [item._asdict() for item in next_page(request, response, items, limit, "product_name")]
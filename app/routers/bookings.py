@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 from app import models
 from app.schemas import booking as schemas
 from app.core.database import get_db
+from app.core import events, export, idempotency
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.services import bookings as booking_rules
 
 router = APIRouter(
     prefix="/api/bookings",
@@ -32,16 +40,23 @@ def get_booking_or_404(booking_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=schemas.Booking)
-def create_new_booking(booking: schemas.Booking, db: Session = Depends(get_db)):
+def create_new_booking(booking: schemas.Booking, db: Session = Depends(get_db),
+                       idempotency_key: Optional[str] = Depends(idempotency.header)):
     """Cria um novo agendamento após verificar a disponibilidade de horário.
 
-    Esta rota primeiro consulta o banco de dados para garantir que não existe
-    outro agendamento para o mesmo funcionário no mesmo horário. Se o horário
-    estiver livre, o novo agendamento é criado.
+    O agendamento ocupa [scheduled_time, scheduled_time + duration_minutes);
+    sem `duration_minutes`, a duração vem do serviço. Ele é gravado e, na
+    mesma transação, o banco é consultado por qualquer outro agendamento do
+    mesmo funcionário que se sobreponha a esse intervalo. Se houver, a
+    transação é desfeita.
+
+    Com o cabeçalho `Idempotency-Key`, uma repetição devolve o agendamento
+    original em vez de esbarrar no conflito com ele mesmo.
 
     Args:
         booking (schemas.Booking): Os dados do novo agendamento a ser criado.
         db (Session): A sessão do banco de dados, injetada pelo FastAPI.
+        idempotency_key (str, optional): O cabeçalho `Idempotency-Key`.
 
     Raises:
         HTTPException: Com status 409 (Conflict), caso o horário já esteja
@@ -50,24 +65,102 @@ def create_new_booking(booking: schemas.Booking, db: Session = Depends(get_db)):
     Returns:
         tables.Booking: O objeto do agendamento que foi salvo no banco de dados.
     """
-    existing_booking = db.query(models.Booking).filter(
-        models.Booking.employee_id == booking.employee_id,
-        models.Booking.scheduled_time == booking.scheduled_time,
-        models.Booking.is_active == True
-    ).first()
+    replay = idempotency.claim(db, idempotency_key, "POST /api/bookings/", booking)
+    if replay:
+        return replay
+
+    db_booking = models.Booking(**booking_rules.prepare_new_booking(booking.dict()))
+    db.add(db_booking)
+    db.flush()
+
+    conflict = db.scalars(booking_rules.conflict_query(
+        db_booking.employee_id, db_booking.scheduled_time, db_booking.ends_at,
+        exclude_id=db_booking.id)).first()
+    if conflict:
+        error = booking_rules.conflict_error(conflict)
+        db.rollback()
+        raise error
+
+    idempotency.save(db, idempotency_key, "POST /api/bookings/",
+                     schemas.Booking, db_booking)
+    db.commit()
+    db.refresh(db_booking)
+    booking_rules.booking_changed("booking.created", booking_rules.booking_event(db_booking))
+    return db_booking
+
+
+@router.post("/bulk", response_model=schemas.BookingBulkResult, status_code=status.HTTP_201_CREATED)
+def create_bookings_bulk(payload: schemas.BookingBulkRequest, db: Session = Depends(get_db)):
+    """Cria vários agendamentos, incluindo recorrências, numa única transação.
 
+    Cada item pode trazer uma regra de recorrência (ex.: a cada 2 semanas, 12
+    vezes), expandida em ocorrências. Todas são gravadas com um único INSERT
+    e, com o lock de escrita já obtido, a agenda de cada funcionário é lida
+    uma vez para a janela coberta pelo lote; as ocorrências são conferidas
+    em memória entre si e contra essa agenda.
 
-    if existing_booking:
+    Em `all_or_nothing`, qualquer ocorrência recusada desfaz o lote todo. Em
+    `best_effort`, só as recusadas são removidas e as demais confirmadas.
+
+    Args:
+        payload (schemas.BookingBulkRequest): Os itens e o modo do lote.
+        db (Session): A sessão do banco de dados, injetada pelo FastAPI.
+
+    Raises:
+        HTTPException: 400 se o lote passar do máximo de ocorrências.
+        HTTPException: 409 em `all_or_nothing` se alguma ocorrência for
+                       recusada; o relatório vem no `detail`.
+
+    Returns:
+        schemas.BookingBulkResult: As ocorrências criadas e as recusadas, com o motivo.
+    """
+    occurrences = booking_rules.expand_bulk(payload.bookings)
+    rows = [row for _, row in occurrences]
+
+    employee_ids = set(db.scalars(select(models.Employee.id).where(
+        models.Employee.id.in_({row["employee_id"] for row in rows}),
+        models.Employee.is_active == True)))
+    pet_ids = set(db.scalars(select(models.Pet.id).where(
+        models.Pet.id.in_({row["pet_id"] for row in rows}),
+        models.Pet.is_active == True)))
+    errors = booking_rules.reference_errors(occurrences, employee_ids, pet_ids)
+
+    valid = [n for n in range(len(rows)) if n not in errors]
+    created, rejected = {}, []
+    if valid and not (errors and payload.mode == "all_or_nothing"):
+        valid_rows = [rows[n] for n in valid]
+        # Um único INSERT de várias linhas. Os ids são gerados em ordem crescente
+        # na ordem das linhas; ordená-los evita o `sort_by_parameter_order`,
+        # que no SQLite vira um INSERT por linha.
+        ids = sorted(db.scalars(insert(models.Booking).returning(models.Booking.id), valid_rows))
+
+        bookings = []
+        for employee_id, (start, end) in booking_rules.employee_windows(valid_rows).items():
+            bookings.extend(db.execute(booking_rules.window_query(start, end, [employee_id])))
+
+        conflicts = booking_rules.bulk_conflicts(valid_rows, ids, bookings)
+        for k, booking_id in enumerate(ids):
+            if k in conflicts:
+                errors[valid[k]] = conflicts[k]
+                rejected.append(booking_id)
+            else:
+                created[valid[k]] = booking_id
+
+    if errors and payload.mode == "all_or_nothing":
+        db.rollback()
         raise HTTPException(
-            status_code=409,
-            detail=f"O funcionário já possui um agendamento neste horário ({booking.scheduled_time})."
+            status_code=status.HTTP_409_CONFLICT,
+            detail=jsonable_encoder(booking_rules.bulk_result(occurrences, {}, errors))
         )
 
-    db_booking = models.Booking(**booking.dict())
-    db.add(db_booking)
+    if rejected:
+        db.execute(delete(models.Booking).where(models.Booking.id.in_(rejected)))
     db.commit()
-    db.refresh(db_booking)
-    return db_booking
+    booking_rules.invalidate_schedule(*(
+        (rows[n]["employee_id"], rows[n]["scheduled_time"]) for n in created))
+    for n, booking_id in created.items():
+        events.publish("booking.created", {"id": booking_id, **rows[n], "is_active": True})
+    return booking_rules.bulk_result(occurrences, created, errors)
 
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -86,8 +179,10 @@ def delete_booking(
     """
 
     booking.is_active = False
+    data = booking_rules.booking_event(booking)
     db.add(booking)
     db.commit()
+    booking_rules.booking_changed("booking.cancelled", data)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -105,34 +200,77 @@ def update_booking(
 
     Raises:
         HTTPException: Exceção HTTP 404 se o agendamento não for encontrado.
+        HTTPException: Exceção HTTP 409 se o novo horário, funcionário ou
+                       duração conflitar com outro agendamento.
 
     Returns:
         models.Booking: O objeto do agendamento atualizado.
     """
 
-    for key, value in booking_update.dict(exclude_unset=True).items():
-        setattr(db_booking, key, value)
+    before = (db_booking.employee_id, db_booking.scheduled_time)
+    rescheduled = booking_rules.apply_booking_update(
+        db_booking, booking_update.dict(exclude_unset=True))
 
     db.add(db_booking)
+    if rescheduled:
+        db.flush()
+        conflict = db.scalars(booking_rules.conflict_query(
+            db_booking.employee_id, db_booking.scheduled_time, db_booking.ends_at,
+            exclude_id=db_booking.id)).first()
+        if conflict:
+            error = booking_rules.conflict_error(conflict)
+            db.rollback()
+            raise error
+
     db.commit()
     db.refresh(db_booking)
+    booking_rules.booking_changed("booking.updated", booking_rules.booking_event(db_booking), before)
     return db_booking
 
 
 @router.get("/", response_model=list[schemas.Booking])
-def get_all_bookings(skip: int = 0, limit: int = 100,
+def get_all_bookings(request: Request, response: Response,
+                     skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_LIMIT),
+                     cursor: str | None = None,
                      db: Session = Depends(get_db)):
-    """Retorna uma lista de agendamentos com suporte a paginação.
+    """Retorna uma lista de agendamentos, em ordem de horário, com suporte a paginação.
 
     Este endpoint permite buscar agendamentos em lotes, especificando o número
     de registros a pular (`skip`) e o limite de resultados por página (`limit`).
     Se nenhum parâmetro for fornecido, retorna os primeiros 100 agendamentos.
+    A próxima página também pode ser pedida pelo `cursor` devolvido nos
+    cabeçalhos `Link` e `X-Next-Cursor`.
     """
-    bookings = db.query(models.Booking).filter(
+    query = db.query(models.Booking).filter(
         models.Booking.is_active == True
-    ).offset(skip).limit(limit).all()
+    )
+    bookings = keyset(query, models.Booking.scheduled_time, models.Booking.id,
+                      limit, skip, cursor).all()
+
+    return next_page(request, response, bookings, limit, "scheduled_time")
+
+
+@router.get("/export")
+def export_bookings(
+    start: Optional[datetime] = Query(
+        None, alias="from", description="Agendamentos a partir deste horário (inclusivo)"),
+    end: Optional[datetime] = Query(
+        None, alias="to", description="Agendamentos até este horário (exclusivo)"),
+    fmt: export.ExportFormat = Query("csv", alias="format"),
+    gzip: bool = Query(False, description="Comprime o arquivo (.gz)")
+):
+    """
+    Exporta os agendamentos ativos que começam em [from, to), em CSV ou NDJSON.
 
-    return bookings
+    Cada linha traz o agendamento com o nome do funcionário, o pet e o
+    cliente dono do pet. O arquivo é gerado em streaming, em lotes de
+    `EXPORT_BATCH_SIZE`.
+
+    Raises:
+        HTTPException: 400 se o período for inválido.
+    """
+    start, end = export.period(start, end, utc=False)
+    return export.export_response(booking_rules.export_query(start, end), "agendamentos", fmt, gzip)
 
 
 @router.get("/{booking_id}", response_model=schemas.Booking)
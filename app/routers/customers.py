@@ -1,7 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
 from app import models
 from app.core.database import get_db
+from app.core import export, idempotency, search
+from app.core.pagination import MAX_LIMIT, keyset, next_page
 from app.schemas import customer as schemas
 
 
@@ -31,12 +43,18 @@ def get_customer_or_404(customer_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=schemas.Customer, status_code=status.HTTP_201_CREATED)
-def create_new_customer(customer: schemas.CustomerIn, db: Session = Depends(get_db)):
+def create_new_customer(customer: schemas.CustomerIn, db: Session = Depends(get_db),
+                        idempotency_key: Optional[str] = Depends(idempotency.header)):
     """Cria um novo cliente.
 
     A validação e normalização do CPF e telefone são feitas automaticamente pelo schema CustomerIn.
-    Esta rota apenas verifica a duplicidade de CPF no banco de dados.
+    Esta rota apenas verifica a duplicidade de CPF no banco de dados. Com o
+    cabeçalho `Idempotency-Key`, uma repetição devolve o cliente criado em
+    vez do 409 de CPF duplicado.
     """
+    replay = idempotency.claim(db, idempotency_key, "POST /api/customers/", customer)
+    if replay:
+        return replay
 
     existing_customer = db.query(models.Customer).filter(
         models.Customer.cpf == customer.cpf).first()
@@ -49,27 +67,267 @@ def create_new_customer(customer: schemas.CustomerIn, db: Session = Depends(get_
 
     db_customer = models.Customer(**customer.dict())
     db.add(db_customer)
+    db.flush()
+    idempotency.save(db, idempotency_key, "POST /api/customers/",
+                     schemas.Customer, db_customer, status.HTTP_201_CREATED)
     db.commit()
     db.refresh(db_customer)
     return db_customer
 
 
+BULK_CHUNK_SIZE = 1000
+
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl",
+                "application/x-jsonlines", "application/jsonlines"}
+CSV_TYPES = {"text/csv", "application/csv"}
+
+
+async def _iter_lines(request: Request):
+    '''Lê o corpo da requisição aos pedaços e devolve linha por linha.'''
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _ndjson_records(lines):
+    '''Gera (linha, dados, erro) para cada objeto JSON não vazio.'''
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield row, None, "JSON inválido"
+            continue
+        if not isinstance(data, dict):
+            yield row, None, "Cada linha deve ser um objeto JSON"
+            continue
+        yield row, data, None
+
+
+async def _csv_records(lines):
+    '''Gera (linha, dados, erro) para cada registro do CSV, a partir do cabeçalho.
+
+    Aceita `,` ou `;` como separador (planilhas em português costumam
+    exportar com `;`) e campos entre aspas com quebras de linha.
+    '''
+    header = None
+    delimiter = ","
+    pending = ""
+    row = 0
+    async for line in lines:
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+
+        if header is None:
+            if record.count(";") > record.count(","):
+                delimiter = ";"
+            header = [column.strip().lower()
+                      for column in next(csv.reader([record], delimiter=delimiter))]
+            continue
+
+        row += 1
+        values = next(csv.reader([record], delimiter=delimiter))
+        yield row, dict(zip(header, values)), None
+
+    if pending:
+        row += 1
+        yield row, None, "Registro com aspas não fechadas"
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg'].removeprefix('Value error, ')}"
+        for error in exc.errors()
+    )
+
+
+def _import_chunk(db: Session, records: list, seen_cpfs: set, seen_phones: set) -> tuple[int, list]:
+    '''Valida e insere um lote de registros; retorna (criados, erros).
+
+    A duplicidade contra o banco é verificada com uma única consulta
+    `cpf IN (...) OR phone IN (...)` por lote, e as linhas aceitas entram
+    num único INSERT executemany.
+    '''
+    errors = []
+    valid = []
+    for row, data, error in records:
+        if error:
+            errors.append({"row": row, "detail": error})
+            continue
+        try:
+            customer = schemas.CustomerIn(**data)
+        except ValidationError as exc:
+            errors.append({"row": row, "detail": _validation_message(exc)})
+            continue
+        if customer.cpf in seen_cpfs:
+            errors.append({"row": row, "detail": "CPF repetido no arquivo"})
+            continue
+        if customer.phone in seen_phones:
+            errors.append({"row": row, "detail": "Telefone repetido no arquivo"})
+            continue
+        seen_cpfs.add(customer.cpf)
+        seen_phones.add(customer.phone)
+        valid.append((row, customer))
+
+    if not valid:
+        return 0, errors
+
+    existing = db.query(models.Customer.cpf, models.Customer.phone).filter(or_(
+        models.Customer.cpf.in_([customer.cpf for _, customer in valid]),
+        models.Customer.phone.in_([customer.phone for _, customer in valid]),
+    )).all()
+    taken_cpfs = {r.cpf for r in existing}
+    taken_phones = {r.phone for r in existing}
+
+    accepted = []
+    for row, customer in valid:
+        if customer.cpf in taken_cpfs:
+            errors.append({"row": row, "detail": "Já existe um cliente cadastrado com este CPF"})
+        elif customer.phone in taken_phones:
+            errors.append({"row": row, "detail": "Já existe um cliente cadastrado com este telefone"})
+        else:
+            accepted.append((row, customer.dict()))
+
+    if not accepted:
+        return 0, errors
+
+    try:
+        db.execute(insert(models.Customer.__table__), [values for _, values in accepted])
+        db.commit()
+        return len(accepted), errors
+    except IntegrityError:
+        # Outro processo cadastrou o mesmo CPF/telefone entre a verificação
+        # e o INSERT: refaz o lote linha a linha para apontar quais falharam.
+        db.rollback()
+
+    created = 0
+    for row, values in accepted:
+        try:
+            db.execute(insert(models.Customer.__table__), values)
+            db.commit()
+            created += 1
+        except IntegrityError:
+            db.rollback()
+            errors.append({"row": row, "detail": "Já existe um cliente cadastrado com este CPF ou telefone"})
+    return created, errors
+
+
+@router.post("/bulk", response_model=schemas.CustomerBulkResult)
+async def bulk_import_customers(request: Request, db: Session = Depends(get_db)):
+    """Importa clientes em lote a partir de NDJSON ou CSV.
+
+    O corpo é lido em streaming, com `Content-Type: application/x-ndjson`
+    (um objeto por linha) ou `text/csv` (cabeçalho com name, phone, address
+    e cpf). As linhas são validadas pelo schema CustomerIn em lotes de
+    `BULK_CHUNK_SIZE`; cada lote faz uma só consulta de duplicidade e um só
+    INSERT. Linhas com erro não impedem a importação das demais e voltam
+    no relatório, numeradas a partir de 1 (sem contar o cabeçalho do CSV).
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        records = _ndjson_records(_iter_lines(request))
+    elif content_type in CSV_TYPES:
+        records = _csv_records(_iter_lines(request))
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Envie o arquivo como application/x-ndjson ou text/csv"
+        )
+
+    total = created = 0
+    errors = []
+    seen_cpfs, seen_phones = set(), set()
+    chunk = []
+
+    async def flush():
+        nonlocal created
+        chunk_created, chunk_errors = await run_in_threadpool(
+            _import_chunk, db, chunk, seen_cpfs, seen_phones)
+        created += chunk_created
+        errors.extend(chunk_errors)
+
+    async for record in records:
+        total += 1
+        chunk.append(record)
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            await flush()
+            chunk = []
+    if chunk:
+        await flush()
+
+    errors.sort(key=lambda error: error["row"])
+    return {"total": total, "created": created, "failed": len(errors), "errors": errors}
+
+
 @router.get("/", response_model=list[schemas.Customer])
-def get_all_customers(skip: int = 0, limit: int = 100,
+def get_all_customers(request: Request, response: Response,
+                      skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_LIMIT),
+                      cursor: str | None = None,
                       db: Session = Depends(get_db)):
     """
-    Retorna uma lista de clientes com suporte a paginação.
+    Retorna uma lista de clientes, ordenada por nome, com suporte a paginação.
 
     Este endpoint permite buscar clientes em lotes,
     especificando o número de registros a pular (`skip`) e o limite
     de resultados por página (`limit`). Se nenhum parâmetro for fornecido,
     retorna os primeiros 100 clientes.
+
+    Para percorrer muitas páginas, prefira o `cursor`: quando há uma próxima
+    página, ele vem nos cabeçalhos `Link` (rel="next") e `X-Next-Cursor`, e
+    o custo de cada página não cresce com a profundidade.
     """
-    customers = db.query(models.Customer).filter(
+    query = db.query(models.Customer).filter(
         models.Customer.is_active == True
-    ).offset(skip).limit(limit).all()
+    )
+    customers = keyset(query, models.Customer.name, models.Customer.id,
+                       limit, skip, cursor).all()
 
-    return customers
+    return next_page(request, response, customers, limit, "name")
+
+
+@router.get("/export")
+def export_customers(
+    start: Optional[datetime] = Query(
+        None, alias="from", description="Clientes cadastrados a partir deste instante (inclusivo)"),
+    end: Optional[datetime] = Query(
+        None, alias="to", description="Clientes cadastrados até este instante (exclusivo)"),
+    fmt: export.ExportFormat = Query("csv", alias="format"),
+    gzip: bool = Query(False, description="Comprime o arquivo (.gz)")
+):
+    """
+    Exporta os clientes ativos, opcionalmente só os cadastrados em [from, to),
+    em CSV ou NDJSON.
+
+    O arquivo é gerado em streaming, em ordem de id, lido em lotes de
+    `EXPORT_BATCH_SIZE`.
+
+    Raises:
+        HTTPException: 400 se o período for inválido.
+    """
+    start, end = export.period(start, end, utc=True)
+    query = (select(models.Customer.id, models.Customer.created_at, models.Customer.name,
+                    models.Customer.phone, models.Customer.address, models.Customer.cpf)
+             .where(models.Customer.is_active == True)
+             .order_by(models.Customer.id))
+    if start is not None:
+        query = query.where(models.Customer.created_at >= start)
+    if end is not None:
+        query = query.where(models.Customer.created_at < end)
+    return export.export_response(query, "clientes", fmt, gzip)
 
 
 @router.get("/{customer_id}", response_model=schemas.Customer)
@@ -83,19 +341,90 @@ def get_customer_by_id(
     return customer
 
 
+@router.get("/{customer_id}/overview", response_model=schemas.CustomerOverview)
+def get_customer_overview(
+        sales_limit: int = Query(10, ge=1, le=100),
+        bookings_limit: int = Query(10, ge=1, le=100),
+        customer: models.Customer = Depends(get_customer_or_404),
+        db: Session = Depends(get_db)):
+    """
+    Retorna a visão completa de um cliente: pets ativos com vacinas, as
+    últimas `sales_limit` vendas com o nome do produto e os próximos
+    `bookings_limit` agendamentos com o nome do funcionário.
+
+    Os relacionamentos são carregados com `selectinload`/`joinedload`, então
+    a resposta custa sempre 5 consultas, independente de quantos pets,
+    vacinas ou vendas o cliente tiver.
+    """
+    pets = db.query(models.Pet).options(
+        selectinload(models.Pet.vaccines)
+    ).filter(
+        models.Pet.customer_id == customer.id,
+        models.Pet.is_active == True
+    ).order_by(models.Pet.name).all()
+
+    sales = db.query(models.Sale).options(
+        joinedload(models.Sale.product)
+    ).filter(
+        models.Sale.customer_id == customer.id,
+        models.Sale.is_active == True
+    ).order_by(models.Sale.created_at.desc(), models.Sale.id.desc()).limit(sales_limit).all()
+
+    bookings = db.query(models.Booking).join(models.Booking.pet).options(
+        contains_eager(models.Booking.pet),
+        joinedload(models.Booking.employee)
+    ).filter(
+        models.Pet.customer_id == customer.id,
+        models.Booking.is_active == True,
+        models.Booking.scheduled_time >= datetime.now()
+    ).order_by(models.Booking.scheduled_time).limit(bookings_limit).all()
+
+    return {
+        "customer": customer,
+        "pets": [{
+            "id": pet.id,
+            "name": pet.name,
+            "breed": pet.breed,
+            "species": pet.species,
+            "date_of_birth": pet.date_of_birth,
+            "vaccines": sorted(pet.vaccines, key=lambda v: v.date_of_application, reverse=True),
+        } for pet in pets],
+        "recent_sales": [{
+            "id": sale.id,
+            "product_id": sale.product_id,
+            "product_name": sale.product.product_name,
+            "quantity": sale.quantity,
+            "total_value": sale.total_value,
+            "created_at": sale.created_at,
+        } for sale in sales],
+        "upcoming_bookings": [{
+            "id": booking.id,
+            "service_name": booking.service_name,
+            "scheduled_time": booking.scheduled_time,
+            "delivery": booking.delivery,
+            "pet_id": booking.pet_id,
+            "pet_name": booking.pet.name,
+            "employee_id": booking.employee_id,
+            "employee_name": booking.employee.name,
+        } for booking in bookings],
+    }
+
+
 
 @router.get("/search/", response_model=list[schemas.CustomerSearchResult])
-def search_customers_by_name(name: str, db: Session = Depends(get_db)):
+def search_customers_by_name(name: str, limit: int = Query(20, ge=1, le=100),
+                             db: Session = Depends(get_db)):
     """
     Busca clientes com base no nome e retorna o nome e ID para identificação.
 
-    Este endpoint otimizado retorna uma lista de objetos contendo
-    apenas o ID e o nome dos clientes que correspondem à busca.
+    Usa o índice FTS5 `customers_fts`: cada palavra digitada casa por prefixo
+    ("jo conc" encontra "João da Conceição"), sem diferenciar acentos, e os
+    resultados vêm ordenados por relevância, no máximo `limit`.
     """
 
-    results = db.query(models.Customer.id, models.Customer.name).filter(
-        models.Customer.is_active == True,
-        models.Customer.name.ilike(f"%{name}%")).all()
+    statement = search.search_customers_statement(
+        name, limit, db.get_bind().dialect.name)
+    results = db.execute(statement).all() if statement is not None else []
 
     if not results:
         raise HTTPException(
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app import models
 from app.core.database import get_db
+from app.services import sales_daily as rollup
 from sqlalchemy import func
 from app.schemas import dashboard as schemas
+from datetime import date
+from typing import Optional
 
 
 
@@ -23,6 +26,9 @@ def get_dashboard_kpis(db: Session = Depends(get_db)):
     A URL final deste endpoint é a combinação do prefixo do router com a
     rota definida aqui (ex: GET /api/dashboard/).
 
+    A receita e o número de vendas vêm do rollup diário (`sales_daily`), que
+    só contém vendas ativas, em vez de uma agregação sobre `sales`.
+
     Args:
         db (Session): A sessão do banco de dados, injetada pelo FastAPI.
 
@@ -31,10 +37,10 @@ def get_dashboard_kpis(db: Session = Depends(get_db)):
                       de vendas, agendamentos e clientes.
     """
 
-    total_revenue_result = db.query(func.sum(models.Sale.total_value)).scalar()
+    total_revenue_result, total_sales_result = db.execute(rollup.totals_query()).one()
     total_revenue = total_revenue_result or 0.0
 
-    total_sales = db.query(func.count(models.Sale.id)).scalar()
+    total_sales = total_sales_result or 0
     total_bookings = db.query(func.count(models.Booking.id)).scalar()
     total_customers = db.query(func.count(models.Customer.id)).scalar()
 
@@ -44,3 +50,33 @@ def get_dashboard_kpis(db: Session = Depends(get_db)):
         total_bookings=total_bookings,
         total_customers=total_customers
     )
+
+
+@router.get("/sales", response_model=list[schemas.SalesDay])
+def get_sales_by_day(
+    start: Optional[date] = Query(None, alias="from", description="Primeiro dia (inclusivo)"),
+    end: Optional[date] = Query(None, alias="to", description="Último dia (exclusivo)"),
+    product_id: Optional[int] = None,
+    customer_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Receita, unidades vendidas e número de vendas por dia (UTC) no período.
+
+    Lê do rollup diário (`sales_daily`): o custo depende do número de dias,
+    produtos e clientes do período, não do número de vendas.
+
+    Args:
+        start (date, optional): Primeiro dia do período (`from`).
+        end (date, optional): Dia seguinte ao último (`to`).
+        product_id (int, optional): Restringe a um produto.
+        customer_id (int, optional): Restringe a um cliente.
+        db (Session): A sessão do banco de dados, injetada pelo FastAPI.
+
+    Raises:
+        HTTPException: 400 se `to` não for posterior a `from`.
+
+    Returns:
+        list[schemas.SalesDay]: Um item por dia com vendas, em ordem.
+    """
+    rows = db.execute(rollup.report_query(start, end, product_id, customer_id)).all()
+    return [row._asdict() for row in rows]
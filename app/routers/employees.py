@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status,  Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status,  Response
 from sqlalchemy.orm import Session
 from app import models
 from app.core.database import get_db
-import re
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.services import bookings as booking_rules
 from app.schemas import employee as schemas
 
 
@@ -29,13 +30,6 @@ def get_employee_or_404(employee_id: int, db: Session = Depends(get_db)):
     return db_employee
 
 
-def normalize_phone(phone: str) -> str:
-    '''Remove todos os caracteres não numéricos de um número de telefone.'''
-    if not phone:
-        return ""
-    return re.sub(r'\D', '', phone)
-
-
 @router.post("/", response_model=schemas.Employee, status_code=status.HTTP_201_CREATED)
 def create_new_employee(employee: schemas.EmployeeIn, db: Session = Depends(get_db)):
     """Cria um novo funcionário após checar por duplicatas de CPF.
@@ -118,21 +112,29 @@ def update_employee(
     db.add(db_employee)
     db.commit()
     db.refresh(db_employee)
+    # Nome e dados aparecem nas agendas em cache.
+    booking_rules.schedule_cache.clear()
     return db_employee
 
 
 @router.get("/", response_model=list[schemas.Employee])
-def get_all_employees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    '''Retorna uma lista de funcionários com suporte a paginação.
+def get_all_employees(request: Request, response: Response,
+                      skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_LIMIT),
+                      cursor: str | None = None,
+                      db: Session = Depends(get_db)):
+    '''Retorna uma lista de funcionários, ordenada por nome, com suporte a paginação.
 
     Este endpoint permite buscar funcionários em lotes, especificando o número
     de registros a pular (`skip`) e o limite de resultados por página (`limit`).
     Se nenhum parâmetro for fornecido, retorna os primeiros 100 funcionários.
+    A próxima página também pode ser pedida pelo `cursor` devolvido nos
+    cabeçalhos `Link` e `X-Next-Cursor`.
     '''
-    employees = db.query(models.Employee).filter(
-        models.Employee.is_active == True).offset(skip).limit(limit).all()
+    query = db.query(models.Employee).filter(models.Employee.is_active == True)
+    employees = keyset(query, models.Employee.name, models.Employee.id,
+                       limit, skip, cursor).all()
 
-    return employees
+    return next_page(request, response, employees, limit, "name")
 
 
 @router.get("/{employee_id}", response_model=schemas.Employee)
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from app import models
 from app.core.database import get_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
 from app.schemas import inventory as schemas
+from app.services import inventory as stock_rules
 
 
 router = APIRouter(
@@ -53,14 +55,18 @@ def create_inventory_item(inventory_item: schemas.InventoryIn, db: Session = Dep
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    stock_rules.publish_stock_transition(db_item, was_low=False)
     return db_item
 
 
 @router.get("/", response_model=list[schemas.Inventory])
 def get_inventory_items(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
     name: str | None = Query(
         None, description="Filtre por nome do produto(busca parcial)"),
     low_stock: bool | None = Query(
@@ -72,6 +78,7 @@ def get_inventory_items(
     - Use `?low_stock=true` para filtrar por estoque baixo.
     - Use `?name=Ração` para buscar itens por nome.
     - Use `?skip=0&limit=50` para paginar os resultados.
+    - Ou siga o `cursor` dos cabeçalhos `Link`/`X-Next-Cursor` para páginas profundas.
     """
     query = db.query(models.Inventory)
 
@@ -82,12 +89,12 @@ def get_inventory_items(
         query = query.filter(models.Inventory.product_name.ilike(f"%{name}%"))
 
     if low_stock:
-        query = query.filter(models.Inventory.quantity <=
-                             models.Inventory.low_stock_threshold)
+        query = query.filter(stock_rules.low_stock_condition())
 
-    items = query.offset(skip).limit(limit).all()
+    items = keyset(query, models.Inventory.product_name, models.Inventory.id,
+                   limit, skip, cursor).all()
 
-    return items
+    return next_page(request, response, items, limit, "product_name")
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -95,15 +102,19 @@ def delete_inventory_item(item: models.Inventory = Depends(get_inventory_item_or
                           db: Session = Depends(get_db)):
     '''Soft delete de um item do inventário pelo seu ID.
 
+    Um item em estoque baixo sai do alerta: publica `stock.restored`.
+
     Args:
         item_id (int): O ID do item a ser deletado.
 
         db (Session): A sessão do banco de dados, injetada pelo FastAPI.
     '''
 
+    was_low = stock_rules.is_low_stock(item)
     item.is_active = False
     db.add(item)
     db.commit()
+    stock_rules.publish_stock_transition(item, was_low)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -126,12 +137,14 @@ def update_inventory_item(item_update: schemas.InventoryUpdate,
         models.Inventory: O objeto do item atualizado.
     '''
 
+    was_low = stock_rules.is_low_stock(db_item)
     for key, value in item_update.dict(exclude_unset=True).items():
         setattr(db_item, key, value)
 
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    stock_rules.publish_stock_transition(db_item, was_low)
     return db_item
 
 
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException,  Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request,  Response, status
 from sqlalchemy.orm import Session
 from app import models
 from app.core.database import get_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+from app.services import bookings as booking_rules
 from app.schemas import pet as schemas
 
 router = APIRouter(
@@ -48,9 +50,12 @@ def create_pet(pet: schemas.PetIn, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=list[schemas.Pet])
 def get_all_pets(
+        request: Request,
+        response: Response,
         db: Session = Depends(get_db),
-        skip: int = 0,
-        limit: int = 100,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=MAX_LIMIT),
+        cursor: str | None = None,
         include_inactive: bool = False
 ):
     
@@ -62,6 +67,9 @@ def get_all_pets(
     Se nenhum parâmetro for fornecido, retorna os primeiros 100 pets.
     
     Permite a inclusao de pets inativos na lista.
+
+    A próxima página também pode ser pedida pelo `cursor` devolvido nos
+    cabeçalhos `Link` e `X-Next-Cursor`.
     """
     
     query = db.query(models.Pet)
@@ -69,8 +77,8 @@ def get_all_pets(
     if not include_inactive:
         query = query.filter(models.Pet.is_active == True)
     
-    pets = query.offset(skip).limit(limit).all()
-    return pets
+    pets = keyset(query, models.Pet.id, models.Pet.id, limit, skip, cursor).all()
+    return next_page(request, response, pets, limit, "id")
 
 
 
@@ -119,4 +127,6 @@ def update_pet(
     db.add(pet)
     db.commit()
     db.refresh(pet)
+    # Nome e dados aparecem nas agendas em cache.
+    booking_rules.schedule_cache.clear()
     return pet
\ No newline at end of file
@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app import models
-from app.core.database import get_db
+from app.core import events, export, idempotency
+from app.core.database import SessionLocal, get_db
+from app.core.pagination import MAX_LIMIT, keyset, next_page
 from app.schemas import sale as schemas
-from sqlalchemy import extract
+from app.services import inventory as stock_rules
+from app.services import sales as sale_rules
+from app.services import sales_daily as rollup
+from sqlalchemy import insert, select
+from datetime import datetime
 from typing import Optional
 
 
@@ -31,16 +39,23 @@ def get_sale_or_404(sale_id: int, db: Session = Depends(get_db)):
     return db_sale
 
 
-@router.post("/", response_model=schemas.Sale)
-def create_new_sale(sale: schemas.Sale, db: Session = Depends(get_db)):
+@router.post("/", response_model=schemas.SaleResponse)
+def create_new_sale(sale: schemas.Sale, db: Session = Depends(get_db),
+                    idempotency_key: Optional[str] = Depends(idempotency.header)):
     '''Cria uma nova venda no banco de dados e debita o estoque.
 
-    Esta função verifica se o produto existe e se há quantidade
-    suficiente em estoque antes de registrar a venda.
+    O débito é um UPDATE condicional (`quantity >= n`): a conferência do
+    estoque e a baixa acontecem no mesmo comando, então vendas simultâneas
+    do mesmo produto não conseguem vender além do que há em estoque. A
+    venda entra no rollup diário (`sales_daily`) na mesma transação.
+
+    Com o cabeçalho `Idempotency-Key`, uma repetição da mesma venda devolve
+    a resposta original sem debitar o estoque de novo.
 
     Args:
         sale (schemas.Sale): Objeto com os dados da venda a ser criada.
         db (Session): Sessão do banco de dados injetada pelo FastAPI.
+        idempotency_key (str, optional): O cabeçalho `Idempotency-Key`.
 
     Raises:
         HTTPException 404: Se o produto não for encontrado no inventário.
@@ -49,32 +64,104 @@ def create_new_sale(sale: schemas.Sale, db: Session = Depends(get_db)):
     Returns:
         tables.Sale: O objeto da venda que foi salvo no banco de dados.
     '''
-    db_inventory_item = db.query(models.Inventory).filter(
-        models.Inventory.product_name == sale.product_name).first()
+    replay = idempotency.claim(db, idempotency_key, "POST /api/sales/", sale)
+    if replay:
+        return replay
+
+    product_id = db.scalar(select(models.Inventory.id).where(
+        models.Inventory.product_name == sale.product_name))
 
-    if not db_inventory_item:
+    if product_id is None:
         raise HTTPException(
             status_code=404, detail="Item não encontrado no inventário")
 
-    if db_inventory_item.quantity < sale.quantity:
+    quantities = {product_id: sale.quantity}
+    debited = db.execute(stock_rules.decrement_stock(quantities)).all()
+    if not debited:
+        db.rollback()
         raise HTTPException(status_code=400, detail="Fora de estoque")
 
     try:
-        db_inventory_item.quantity -= sale.quantity
-        db.add(db_inventory_item)
-
-        db_sale = models.Sale(**sale.dict())
+        db_sale = models.Sale(
+            product_id=product_id,
+            customer_id=sale.customer_id,
+            quantity=sale.quantity,
+            total_value=sale.total_value
+        )
         db.add(db_sale)
+        db.flush()
+        db.execute(rollup.upsert(db), rollup.deltas([stock_rules.sale_event(db_sale)]))
+        idempotency.save(db, idempotency_key, "POST /api/sales/",
+                         schemas.SaleResponse, db_sale)
         db.commit()
         db.refresh(db_sale)
-        db.refresh(db_inventory_item)
-        return db_sale
     except Exception as e:
         db.rollback()
         raise HTTPException(
             status_code=500, detail="Nao foi possivel criar a venda")
 
+    events.publish("sale.created", stock_rules.sale_event(db_sale))
+    stock_rules.publish_decrement_transitions(debited, quantities)
+    return db_sale
+
+
+@router.post("/checkout", response_model=schemas.CheckoutResult, status_code=status.HTTP_201_CREATED)
+def checkout(payload: schemas.Checkout, db: Session = Depends(get_db)):
+    """Registra um carrinho com vários produtos numa única transação.
+
+    O estoque de todos os produtos é debitado por um único UPDATE
+    condicional e as vendas entram num único INSERT, então o custo não
+    cresce com o número de itens. Linhas do mesmo produto são somadas e
+    aceitas ou recusadas juntas.
+
+    Em `all_or_nothing`, qualquer linha recusada desfaz o carrinho todo. Em
+    `best_effort`, as linhas recusadas ficam de fora e as demais são vendidas.
+    As vendas criadas entram no rollup diário antes do commit.
+
+    Args:
+        payload (schemas.Checkout): O cliente, os itens e o modo.
+        db (Session): A sessão do banco de dados, injetada pelo FastAPI.
+
+    Raises:
+        HTTPException: 409 em `all_or_nothing` se algum produto não existir
+                       ou não tiver estoque; o relatório vem no `detail`.
 
+    Returns:
+        schemas.CheckoutResult: As vendas criadas e as linhas recusadas, com o motivo.
+    """
+    products = dict(db.execute(sale_rules.products_query(payload.items)).all())
+    quantities, errors = sale_rules.stock_quantities(payload.items, products)
+
+    debited = []
+    if quantities and not (errors and payload.mode == "all_or_nothing"):
+        debited = db.execute(stock_rules.decrement_stock(quantities)).all()
+        errors.update(sale_rules.stock_errors(
+            payload.items, products, {row.id for row in debited}))
+
+    if errors and payload.mode == "all_or_nothing":
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=jsonable_encoder(sale_rules.checkout_result(payload.items, {}, errors))
+        )
+
+    lines = sale_rules.sale_rows(payload, products, errors)
+    created = {}
+    if lines:
+        # Mesmo recurso do lote de agendamentos: um INSERT de várias linhas,
+        # com os ids ordenados em vez de `sort_by_parameter_order`.
+        inserted = sorted(db.execute(
+            insert(models.Sale).returning(models.Sale.id, models.Sale.created_at),
+            [row for _, row in lines]))
+        created = {n: {"id": sale.id, "created_at": sale.created_at, **row}
+                   for (n, row), sale in zip(lines, inserted)}
+        db.execute(rollup.upsert(db), rollup.deltas(created.values()))
+    db.commit()
+
+    for sale in created.values():
+        events.publish("sale.created", sale)
+    stock_rules.publish_decrement_transitions(debited, quantities)
+    return sale_rules.checkout_result(payload.items, created, errors)
 
 
 @router.delete("/{sale_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -84,6 +171,10 @@ def delete_sale(
 ):
     '''Soft delete de uma venda pelo seu ID.
 
+    A venda sai do rollup diário (`sales_daily`) na mesma transação. A
+    exclusão é um UPDATE condicional em `is_active`, então duas exclusões
+    simultâneas da mesma venda não a descontam duas vezes.
+
     Args:
         sale_id (int): O ID da venda a ser deletada.
         db (Session): A sessão do banco de dados, injetada pelo FastAPI.
@@ -91,13 +182,36 @@ def delete_sale(
     Returns:
         Response: Uma resposta HTTP com o status 204 (No Content) em caso de sucesso.
     '''
-    sale.is_active = False
-    db.add(sale)
+    if db.execute(sale_rules.deactivate(sale.id)).rowcount:
+        db.execute(rollup.upsert(db), rollup.deltas([stock_rules.sale_event(sale)], sign=-1))
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.get("/{sale_id}", response_model=schemas.Sale)
+@router.get("/export")
+def export_sales(
+    start: Optional[datetime] = Query(
+        None, alias="from", description="Vendas a partir deste instante (inclusivo)"),
+    end: Optional[datetime] = Query(
+        None, alias="to", description="Vendas até este instante (exclusivo)"),
+    fmt: export.ExportFormat = Query("csv", alias="format"),
+    gzip: bool = Query(False, description="Comprime o arquivo (.gz)")
+):
+    """
+    Exporta as vendas ativas do período [from, to) em CSV ou NDJSON.
+
+    Cada linha traz a venda, o cliente (nome e CPF) e o produto. O arquivo é
+    gerado em streaming, lido do banco em lotes de `EXPORT_BATCH_SIZE`, então
+    a memória não cresce com o período.
+
+    Raises:
+        HTTPException: 400 se o período for inválido.
+    """
+    start, end = sale_rules.sales_window(start, end, None, None)
+    return export.export_response(sale_rules.export_query(start, end), "vendas", fmt, gzip)
+
+
+@router.get("/{sale_id}", response_model=schemas.SaleResponse)
 def get_sale_by_id(
         sale: models.Sale = Depends(get_sale_or_404),
         db: Session = Depends(get_db)):
@@ -111,34 +225,64 @@ def get_sale_by_id(
         HTTPException: Exceção HTTP 404 se a venda não for encontrada.
 
     Returns:
-        schemas.Sale: O objeto da venda solicitado.
+        schemas.SaleResponse: O objeto da venda solicitado.
     '''
 
     return sale
 
 
-@router.get("/", response_model=list[schemas.Sale])
+def stream_sales(start: Optional[datetime], end: Optional[datetime]):
+    '''Gera o array JSON das vendas do período, um lote de cada vez.
+
+    Abre a própria sessão: o gerador continua rodando depois que a rota
+    retorna e a sessão da requisição já foi fechada.
+    '''
+    with SessionLocal() as db:
+        result = db.execute(sale_rules.stream_query(start, end))
+        yield b"["
+        for n, rows in enumerate(result.partitions()):
+            yield sale_rules.sales_json_chunk(rows, first=n == 0)
+        yield b"]"
+
+
+@router.get("/", response_model=list[schemas.SaleResponse])
 def get_sales(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
+    start: Optional[datetime] = Query(
+        None, alias="from", description="Vendas a partir deste instante (inclusivo)"),
+    end: Optional[datetime] = Query(
+        None, alias="to", description="Vendas até este instante (exclusivo)"),
     month: Optional[int] = Query(
         None, ge=1, le=12, description="Filtra vendas por mês"),
-    year: Optional[int] = Query(None, description="Filtra vendas por ano")
+    year: Optional[int] = Query(None, ge=1, le=9998, description="Filtra vendas por ano"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    cursor: str | None = None,
+    stream: bool = Query(
+        False, description="Envia todas as vendas do período, em streaming e sem paginação")
 ):
     """
-    Retorna uma lista de vendas.
+    Retorna uma lista de vendas, da mais antiga para a mais recente.
 
-    - Se nenhum parâmetro for fornecido, retorna todas as vendas.
-    - Se os parâmetros 'month' e 'year' forem fornecidos, 
-      retorna as vendas filtradas por esse período.
-    """
-    query = db.query(models.Sale).filter(models.Sale.is_active == True)
-
-    # Aplica o filtro apenas se ambos os parâmetros forem fornecidos
-    if month is not None and year is not None:
-        query = query.filter(
-            extract('month', models.Sale.created_at) == month,
-            extract('year', models.Sale.created_at) == year
-        )
+    - `from`/`to` filtram pelo período [from, to) de `created_at`; `month` e
+      `year`, juntos, equivalem ao mês inteiro. O filtro é um intervalo
+      direto na coluna e usa o índice parcial de vendas ativas.
+    - A lista é paginada (`limit`, padrão 100); a próxima página vem pelo
+      `cursor` dos cabeçalhos `Link` e `X-Next-Cursor`.
+    - Com `stream=true`, todas as vendas do período são enviadas num único
+      array JSON, lido e serializado em lotes, sem carregar tudo na memória.
 
-    sales = query.all()
-    return sales
+    Raises:
+        HTTPException: 400 se o período for inválido, se `from`/`to` vierem
+                       junto com `month`/`year` ou se o cursor for inválido.
+    """
+    start, end = sale_rules.sales_window(start, end, month, year)
+    if stream:
+        return StreamingResponse(stream_sales(start, end), media_type="application/json")
+
+    query = sale_rules.sales_query(start, end)
+    sales = db.scalars(keyset(query, models.Sale.created_at, models.Sale.id,
+                              limit, skip, cursor)).all()
+    return next_page(request, response, sales, limit, "created_at")
@@ -1,45 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, selectinload
-from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Literal, Optional, Union
 from app import models
+from app.core import config
 from app.core.database import get_db
-from sqlalchemy import func
+from app.services import bookings as booking_rules
 from app.schemas import booking as schemas
 
 
-
-
 router = APIRouter(
     prefix="/api/schedule",
     tags=["Schedule"]
 )
 
 
-@router.get("/", response_model=list[schemas.BookingResponse])
-def get_todays_schedule(db: Session = Depends(get_db)):
+ScheduleResponse = Union[list[schemas.BookingResponse], list[schemas.EmployeeSchedule]]
+
+
+@router.get("/", response_model=ScheduleResponse)
+def get_schedule(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    employee_id: Optional[int] = None,
+    group_by: Optional[Literal["employee"]] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna os agendamentos ativos que começam no período [from, to).
+
+    Sem `from`, o período começa hoje à meia-noite; sem `to`, dura um dia.
+    O filtro é um intervalo semiaberto direto em `scheduled_time`, que usa o
+    índice parcial de agendamentos ativos, e o pet e o funcionário vêm na
+    mesma consulta (`joinedload`). Com `group_by=employee`, os agendamentos
+    são agrupados por funcionário, o que monta o quadro semanal numa única
+    chamada.
+
+    A resposta serializada fica em cache por período, funcionário e
+    agrupamento (cabeçalho `X-Cache: HIT` ou `MISS`) até expirar ou até uma
+    escrita de agendamento dentro do período invalidá-la.
+
+    Args:
+        start (Optional[datetime]): Início do período (`from`), inclusivo.
+        end (Optional[datetime]): Fim do período (`to`), exclusivo.
+        employee_id (Optional[int]): Restringe a um funcionário.
+        group_by (Optional[str]): "employee" para agrupar por funcionário.
+        db (Session): A sessão do banco de dados, injetada pelo FastAPI.
+
+    Raises:
+        HTTPException: 400 se o período for inválido ou longo demais.
+
+    Returns:
+        Uma lista de agendamentos, com pet e funcionário, ou uma lista de
+        funcionários com seus agendamentos quando `group_by=employee`.
     """
-    Retorna uma lista com todos os agendamentos agendados para o dia de hoje.
+    default_start, default_length = booking_rules.today_window()
+    start, end = booking_rules.resolve_window(start, end, default_start, default_length)
+    key = (start, end, employee_id, group_by)
+    body = booking_rules.schedule_cache.get(key)
+    cache_status = "HIT"
+    if body is None:
+        cache_status = "MISS"
+        generation = booking_rules.schedule_cache.generation
+        bookings = db.scalars(booking_rules.schedule_query(start, end, employee_id)).all()
+        body = booking_rules.render_schedule(bookings, group_by)
+        booking_rules.schedule_cache.set(key, body, generation)
+
+    return Response(content=body, media_type="application/json", headers={"X-Cache": cache_status})
 
-    Este endpoint realiza uma consulta para buscar todos os registros da tabela de agendamentos
-    que possuem a data programada igual ao dia atual. Inclui os dados do pet e do funcionário
-    relacionados a cada agendamento.
 
-    A URL final será a combinação do prefixo do router de agendamentos com a rota definida aqui
-    (ex: GET /api/schedule/).
+@router.get("/today/", response_model=ScheduleResponse)
+def get_todays_schedule(
+    employee_id: Optional[int] = None,
+    group_by: Optional[Literal["employee"]] = None,
+    db: Session = Depends(get_db)
+):
+    """Retorna os agendamentos ativos de hoje (rota usada pela tela de Agenda)."""
+    return get_schedule(None, None, employee_id, group_by, db)
+
+
+@router.get("/availability", response_model=schemas.Availability)
+def get_availability(
+    employee_id: Optional[int] = None,
+    service: Optional[str] = None,
+    duration_minutes: Optional[int] = Query(None, gt=0, le=config.BOOKING_MAX_DURATION_MINUTES),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna os horários livres de um funcionário (ou de todos os ativos) no período.
+
+    Os agendamentos de todos os funcionários pedidos são lidos com uma única
+    consulta por faixa de horário; as lacunas dentro do horário de
+    atendimento são calculadas em memória numa só varredura por
+    funcionário. Cada lacuna devolvida comporta o serviço inteiro: qualquer
+    início entre `start` e `latest_start` pode ser agendado sem conflito.
 
     Args:
+        employee_id (Optional[int]): Restringe a busca a um funcionário.
+        service (Optional[str]): Nome do serviço, usado para definir a duração.
+        duration_minutes (Optional[int]): Duração explícita; tem prioridade sobre o serviço.
+        start (Optional[datetime]): Início do período (`from`); padrão: agora.
+        end (Optional[datetime]): Fim do período (`to`); padrão: 7 dias após o início.
         db (Session): A sessão do banco de dados, injetada pelo FastAPI.
 
+    Raises:
+        HTTPException: 400 se o período for inválido ou longo demais.
+        HTTPException: 404 se o funcionário não existir ou estiver inativo.
+
     Returns:
-        list[schemas.BookingResponse]: Uma lista de objetos, onde cada objeto representa
-        um agendamento do dia, com informações do pet e do funcionário.
+        schemas.Availability: A duração considerada e as lacunas de cada funcionário.
     """
-    today = date.today()
-    bookings_today = db.query(models.Booking).options(
-        selectinload(models.Booking.pet),
-        selectinload(models.Booking.employee)
-    ).filter(
-        func.date(models.Booking.scheduled_time) == today
-    ).all()
-
-    return bookings_today
+    start, end = booking_rules.resolve_window(start, end)
+    duration = booking_rules.resolve_duration(service or "", duration_minutes)
+
+    employees_query = db.query(models.Employee.id, models.Employee.name).filter(
+        models.Employee.is_active == True
+    )
+    if employee_id is not None:
+        employees_query = employees_query.filter(models.Employee.id == employee_id)
+    employees = employees_query.order_by(models.Employee.name).all()
+    if employee_id is not None and not employees:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Funcionário com id {employee_id} não encontrado ou está inativo."
+        )
+
+    bookings = db.execute(booking_rules.window_query(
+        start, end, [employee_id] if employee_id is not None else None)).all()
+
+    return {
+        "service": service,
+        "duration_minutes": duration,
+        "from": start,
+        "to": end,
+        "employees": booking_rules.availability(employees, bookings, start, end, duration),
+    }
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core import config, events
+
+
+router = APIRouter(
+    prefix="/api/stream",
+    tags=["Stream"]
+)
+
+
+EVENT_GROUPS = {"booking", "sale", "stock"}
+
+
+@router.get("")
+async def stream_events(
+    types: Optional[str] = Query(
+        None, description="Grupos de evento separados por vírgula: booking, sale, stock")
+):
+    """
+    Stream de eventos (Server-Sent Events) com as escritas já confirmadas.
+
+    Eventos: `booking.created`, `booking.updated`, `booking.cancelled`,
+    `sale.created`, `stock.low` e `stock.restored`; o `data` é o JSON do
+    registro. Sem eventos, um comentário de keep-alive é enviado a cada
+    `STREAM_HEARTBEAT_SECONDS`. Um cliente que não consome os eventos a tempo
+    recebe `overflow` e é desconectado; ao reconectar, deve recarregar o
+    estado pela API.
+
+    Args:
+        types (Optional[str]): Restringe aos grupos informados (ex.: "booking,stock").
+
+    Raises:
+        HTTPException: 400 se algum grupo for desconhecido.
+        HTTPException: 503 se o limite de clientes conectados for atingido.
+    """
+    groups = None
+    if types:
+        groups = frozenset(group.strip() for group in types.split(",") if group.strip())
+        unknown = groups - EVENT_GROUPS
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Grupos de evento desconhecidos: {', '.join(sorted(unknown))}"
+            )
+    if len(events.bus) >= config.STREAM_MAX_CLIENTS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Limite de conexões ao stream atingido"
+        )
+
+    async def event_stream():
+        subscription = events.bus.subscribe(groups)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=config.STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is events.OVERFLOW:
+                    yield "event: overflow\ndata: {}\n\n"
+                    break
+                yield message
+        finally:
+            events.bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
+from app.core import config
 
 
 class PetResponse(BaseModel):
@@ -30,18 +31,74 @@ class Booking(BaseModel):
     scheduled_time: datetime
     employee_id: int
     delivery: bool
+    # Em minutos; se omitida, é derivada do serviço (ver app/utils/scheduling.py).
+    duration_minutes: Optional[int] = Field(
+        None, gt=0, le=config.BOOKING_MAX_DURATION_MINUTES)
+
+
+class RecurrenceRule(BaseModel):
+    '''Repetição de um agendamento: a cada `interval` dias/semanas, `count` vezes no total.'''
+    frequency: Literal["daily", "weekly"] = "weekly"
+    interval: int = Field(1, ge=1, le=52)
+    count: int = Field(..., ge=1, le=config.BOOKING_BULK_MAX_OCCURRENCES)
+
+
+class BookingBulkItem(Booking):
+    recurrence: Optional[RecurrenceRule] = None
+
+
+class BookingBulkRequest(BaseModel):
+    '''
+    Lote de agendamentos. Em "all_or_nothing" qualquer conflito cancela o
+    lote inteiro; em "best_effort" só as ocorrências com problema são puladas.
+    '''
+    bookings: list[BookingBulkItem] = Field(..., min_length=1)
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+
+
+class BookingBulkCreated(BaseModel):
+    id: int
+    item: int
+    scheduled_time: datetime
+    ends_at: datetime
+    employee_id: int
+
+
+class BookingBulkError(BaseModel):
+    '''Ocorrência recusada: `item` é a posição no lote (a partir de 0).'''
+    item: int
+    scheduled_time: datetime
+    employee_id: int
+    detail: str
+
+
+class BookingBulkResult(BaseModel):
+    total: int
+    created: int
+    failed: int
+    bookings: list[BookingBulkCreated]
+    errors: list[BookingBulkError]
 
 
 class BookingResponse(BaseModel):
     id: int
     service_name: str
     scheduled_time: datetime
+    duration_minutes: Optional[int] = None
+    ends_at: Optional[datetime] = None
     employee: EmployeeResponse
     pet: PetResponse
 
     class Config:
         from_attributes = True
 
+class EmployeeSchedule(BaseModel):
+    employee: EmployeeResponse
+    bookings: list[BookingResponse]
+
+    class Config:
+        from_attributes = True
+
 class CustomerSearchResult(BaseModel):
     id: int
     name: str
@@ -52,6 +109,8 @@ class CustomerSearchResult(BaseModel):
 class BookingUpdate(BaseModel):
     service_name: Optional[str] = None
     scheduled_time: Optional[datetime] = None
+    duration_minutes: Optional[int] = Field(
+        None, gt=0, le=config.BOOKING_MAX_DURATION_MINUTES)
     delivery: Optional[bool] = None
     pet_id: Optional[int] = None
     employee_id: Optional[int] = None
@@ -59,3 +118,23 @@ class BookingUpdate(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class AvailabilitySlot(BaseModel):
+    start: datetime
+    end: datetime
+    latest_start: datetime
+
+
+class EmployeeAvailability(BaseModel):
+    employee_id: int
+    name: str
+    slots: list[AvailabilitySlot]
+
+
+class Availability(BaseModel):
+    service: Optional[str] = None
+    duration_minutes: int
+    start: datetime = Field(alias="from")
+    end: datetime = Field(alias="to")
+    employees: list[EmployeeAvailability]
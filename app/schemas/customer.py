@@ -1,15 +1,7 @@
 from pydantic import BaseModel, validator
 from datetime import datetime
-from validate_docbr import CPF
-import re
 from typing import Optional
-
-
-def normalize_text(text: str) -> str:
-    '''Remove todos os caracteres não alfanuméricos de um texto.'''
-    if not text:
-        return ""
-    return re.sub(r'\D', '', text)
+from app.utils.validation import normalize_cpf, normalize_text, validate_cpf, validate_phone
 
 
 
@@ -26,45 +18,87 @@ class CustomerIn(BaseModel):
     @validator('cpf')
     def validate_and_normalize_cpf(cls, v):
         '''Valida o CPF e o retorna normalizado.'''
-        normalized_cpf = normalize_cpf(v)
-
-        cpf_validator = CPF()
-        if not cpf_validator.validate(normalized_cpf):
-            raise ValueError('CPF inválido')
-
-        return normalized_cpf
+        return validate_cpf(v)
 
     @validator('phone')
     def validate_and_normalize_phone(cls, v):
         '''Valida o número de telefone e o retorna normalizado.'''
-        normalized_phone = normalize_text(v)
-
-        if not normalized_phone or len(normalized_phone) < 10:
-            raise ValueError('Número de telefone inválido')
-
-        return normalized_phone
+        return validate_phone(v)
 
 
 
+class Customer(CustomerIn):
+    """
+    Schema para retornar um cliente, incluindo o id.
+    """
+    id: int
 
+    class Config:
+        from_attributes = True
 
+class VaccineSummary(BaseModel):
+    id: int
+    vaccine_name: str
+    date_of_application: datetime
 
-def normalize_cpf(cpf: str) -> str:
-    '''Remove todos os caracteres não numéricos de um CPF.'''
-    if not cpf:
-        return ""
-    return re.sub(r'\D', '', cpf)
+    class Config:
+        from_attributes = True
 
 
-class Customer(CustomerIn):
-    """
-    Schema para retornar um cliente, incluindo o id.
-    """
+class PetOverview(BaseModel):
     id: int
+    name: str
+    breed: str
+    species: str
+    date_of_birth: Optional[datetime] = None
+    vaccines: list[VaccineSummary]
 
     class Config:
         from_attributes = True
 
+
+class SaleOverview(BaseModel):
+    id: int
+    product_id: int
+    product_name: str
+    quantity: int
+    total_value: float
+    created_at: Optional[datetime] = None
+
+
+class BookingOverview(BaseModel):
+    id: int
+    service_name: str
+    scheduled_time: datetime
+    delivery: Optional[bool] = None
+    pet_id: int
+    pet_name: str
+    employee_id: int
+    employee_name: str
+
+
+class CustomerOverview(BaseModel):
+    '''Visão completa do cliente para o balcão: pets, vendas recentes e próximos agendamentos.'''
+    customer: Customer
+    pets: list[PetOverview]
+    recent_sales: list[SaleOverview]
+    upcoming_bookings: list[BookingOverview]
+
+
+class CustomerBulkError(BaseModel):
+    '''Erro de uma linha da importação em lote (linhas numeradas a partir de 1).'''
+    row: int
+    detail: str
+
+
+class CustomerBulkResult(BaseModel):
+    '''Resumo da importação em lote de clientes.'''
+    total: int
+    created: int
+    failed: int
+    errors: list[CustomerBulkError]
+
+
 class CustomerSearchResult(BaseModel):
     id: int
     name: str
@@ -1,3 +1,5 @@
+from datetime import date
+
 from pydantic import BaseModel
 
 
@@ -7,4 +9,12 @@ class KPIs(BaseModel):
     total_revenue: float
     total_sales: int
     total_bookings: int
-    total_customers: int
\ No newline at end of file
+    total_customers: int
+
+
+class SalesDay(BaseModel):
+    '''Receita e volume de um dia, lidos do rollup diário de vendas.'''
+    day: date
+    quantity: int
+    revenue: float
+    sales_count: int
@@ -1,22 +1,8 @@
 from pydantic import BaseModel, validator
-from validate_docbr import CPF
-import re
 from typing import Optional
+from app.utils.validation import normalize_cpf, normalize_phone, validate_cpf, validate_phone
 
 
-
-def normalize_cpf(cpf: str) -> str:
-    '''Remove todos os caracteres não numéricos de um CPF.'''
-    if not cpf:
-        return ""
-    return re.sub(r'\D', '', cpf)
-
-def normalize_phone(phone: str) -> str:
-    '''Remove todos os caracteres não numéricos de um número de telefone.'''
-    if not phone:
-        return ""
-    return re.sub(r'\D', '', phone)
-
 class EmployeeIn(BaseModel):
     '''Representa o schema de um funcionário para validação de dados na API.
     Usado ao criar um novo funcionário via endpoint.
@@ -29,24 +15,12 @@ class EmployeeIn(BaseModel):
     @validator('cpf')
     def validate_and_normalize_cpf(cls, v):
         '''Valida o CPF e o retorna normalizado.'''
-        normalized_cpf = normalize_cpf(v)
-
-        cpf_validator = CPF()
-        if not cpf_validator.validate(normalized_cpf):
-            raise ValueError('CPF inválido')
-
-        return normalized_cpf
+        return validate_cpf(v)
     
     @validator('phone')
     def validate_and_normalize_phone(cls, v):
         '''Normaliza o telefone, removendo caracteres não numéricos.'''
-        normalized_phone = normalize_phone(v)
-        
-        # Validação simples para garantir que o telefone não é muito curto
-        if not normalized_phone or len(normalized_phone) < 10:
-            raise ValueError('Número de telefone inválido')
-            
-        return normalized_phone    
+        return validate_phone(v)
 
 
 class Employee(EmployeeIn):
@@ -21,6 +21,15 @@ class Inventory(InventoryIn):
     class Config:
         orm_mode = True
 
+class LowStockItem(BaseModel):
+    '''Item em estoque baixo; mesmos campos dos eventos `stock.low`/`stock.restored`.
+    '''
+    id: int
+    product_name: str
+    quantity: int
+    low_stock_threshold: int
+
+
 class InventoryUpdate(BaseModel):
     product_name: str | None = None
     quantity: int | None = None
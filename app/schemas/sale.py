@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Literal, Optional
+
+from app.core import config
 
 
 class Sale(BaseModel):
@@ -7,6 +11,57 @@ class Sale(BaseModel):
     Usado ao criar uma nova venda via endpoint.
     '''
     product_name: str
+    quantity: int = Field(..., gt=0)
+    total_value: float
+    customer_id: int
+
+
+class SaleResponse(BaseModel):
+    '''Schema para retornar uma venda registrada, incluindo o id.'''
+    id: int
+    product_id: int
+    customer_id: int
     quantity: int
     total_value: float
-    customer_id: int
\ No newline at end of file
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CheckoutItem(BaseModel):
+    '''Linha do carrinho: um produto, a quantidade e o valor cobrado.'''
+    product_name: str
+    quantity: int = Field(..., gt=0)
+    total_value: float
+
+
+class Checkout(BaseModel):
+    '''
+    Carrinho de um cliente. Em "all_or_nothing" qualquer item sem estoque
+    cancela a venda inteira; em "best_effort" só os itens com problema ficam de fora.
+    '''
+    customer_id: int
+    items: list[CheckoutItem] = Field(..., min_length=1, max_length=config.SALES_CHECKOUT_MAX_ITEMS)
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+
+
+class CheckoutSale(SaleResponse):
+    '''Venda criada para a linha `item` do carrinho (a partir de 0).'''
+    item: int
+
+
+class CheckoutError(BaseModel):
+    '''Linha recusada: `item` é a posição no carrinho (a partir de 0).'''
+    item: int
+    product_name: str
+    quantity: int
+    detail: str
+
+
+class CheckoutResult(BaseModel):
+    total: int
+    created: int
+    failed: int
+    sales: list[CheckoutSale]
+    errors: list[CheckoutError]
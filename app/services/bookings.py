@@ -0,0 +1,364 @@
+"""Regras de conflito de horário compartilhadas pelas pilhas sync e async.
+
+Dois agendamentos do mesmo funcionário conflitam quando os intervalos
+[scheduled_time, ends_at) se sobrepõem. A consulta limita `scheduled_time`
+dos dois lados (a partir de `início - duração máxima` até o fim do novo
+agendamento), então é uma busca por faixa no índice
+(employee_id, scheduled_time) e não uma varredura da agenda do funcionário.
+
+As rotas gravam o agendamento (flush) antes de procurar conflitos, dentro
+da mesma transação: no SQLite o INSERT/UPDATE já segura o lock de escrita,
+então duas requisições simultâneas não conseguem aprovar o mesmo horário.
+
+A busca de horários livres carrega os agendamentos de todos os
+funcionários pedidos com uma única consulta por faixa (`window_query`) e
+calcula as lacunas em memória com `ScheduleIndex`. A criação em lote usa o
+mesmo índice: grava todas as ocorrências, lê a janela de cada funcionário
+uma única vez e confere as ocorrências entre si e contra a agenda.
+
+As respostas de /api/schedule ficam em `schedule_cache`, já serializadas.
+Toda escrita de agendamento chama `booking_changed` depois do commit: ela
+remove do cache só as entradas cujo período e funcionário incluem o
+horário antigo ou o novo e publica o evento no stream (/api/stream).
+"""
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from pydantic import TypeAdapter
+
+from app import models
+from app.core import config, events
+from app.core.cache import TTLCache
+from app.schemas import booking as schemas
+from app.utils.scheduling import ScheduleIndex, booking_end, service_duration
+
+
+SCHEDULE_FIELDS = {"scheduled_time", "employee_id", "service_name", "duration_minutes"}
+
+
+def resolve_duration(service_name: str, duration_minutes: Optional[int]) -> int:
+    return duration_minutes or service_duration(service_name)
+
+
+def prepare_new_booking(data: dict) -> dict:
+    '''Completa os dados de criação com a duração e o horário de término.'''
+    data = dict(data)
+    data["duration_minutes"] = resolve_duration(data["service_name"], data.get("duration_minutes"))
+    data["ends_at"] = booking_end(data["scheduled_time"], data["duration_minutes"])
+    return data
+
+
+def apply_booking_update(db_booking: models.Booking, changes: dict) -> bool:
+    '''Aplica as alterações e recalcula o término; retorna se o horário mudou.
+
+    Se o serviço muda e a duração não é informada, a duração passa a ser a
+    do novo serviço.
+    '''
+    if changes.get("duration_minutes") is None:
+        changes.pop("duration_minutes", None)
+        if "service_name" in changes:
+            changes["duration_minutes"] = service_duration(changes["service_name"])
+
+    for key, value in changes.items():
+        setattr(db_booking, key, value)
+
+    if not SCHEDULE_FIELDS & changes.keys():
+        return False
+    db_booking.ends_at = booking_end(db_booking.scheduled_time, db_booking.duration_minutes)
+    return True
+
+
+def conflict_query(employee_id: int, start: datetime, end: datetime,
+                   exclude_id: Optional[int] = None):
+    '''SELECT do primeiro agendamento ativo do funcionário que se sobrepõe a [start, end).'''
+    earliest = start - timedelta(minutes=config.BOOKING_MAX_DURATION_MINUTES)
+    query = select(models.Booking).where(
+        models.Booking.employee_id == employee_id,
+        models.Booking.scheduled_time > earliest,
+        models.Booking.scheduled_time < end,
+        models.Booking.is_active == True,
+        models.Booking.ends_at > start,
+    )
+    if exclude_id is not None:
+        query = query.where(models.Booking.id != exclude_id)
+    return query.order_by(models.Booking.scheduled_time).limit(1)
+
+
+def conflict_message(start: datetime, end: datetime) -> str:
+    return (f"O funcionário já possui um agendamento neste horário "
+            f"({start:%d/%m/%Y %H:%M} às {end:%H:%M}).")
+
+
+def conflict_error(conflict) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=conflict_message(conflict.scheduled_time, conflict.ends_at)
+    )
+
+
+def _naive(value: datetime) -> datetime:
+    # As datas são gravadas sem fuso (como o SQLite as guarda); compara igual.
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def resolve_window(start: Optional[datetime], end: Optional[datetime],
+                   default_start: Optional[datetime] = None,
+                   default_length: timedelta = timedelta(days=7)) -> tuple[datetime, datetime]:
+    '''Valida o período pedido; sem datas, vai de `default_start` (ou agora) até `default_length` depois.'''
+    start = _naive(start) if start else (default_start or datetime.now().replace(second=0, microsecond=0))
+    end = _naive(end) if end else start + default_length
+    if end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="O fim do período deve ser posterior ao início.")
+    if end - start > timedelta(days=config.SCHEDULE_MAX_RANGE_DAYS):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"O período máximo é de {config.SCHEDULE_MAX_RANGE_DAYS} dias.")
+    return start, end
+
+
+def today_window() -> tuple[datetime, timedelta]:
+    '''Início do dia de hoje e a duração de um dia, para `resolve_window`.'''
+    return datetime.combine(datetime.now().date(), time()), timedelta(days=1)
+
+
+def schedule_query(start: datetime, end: datetime, employee_id: Optional[int] = None):
+    '''SELECT dos agendamentos ativos que começam em [start, end), com pet e funcionário.
+
+    O intervalo semiaberto em `scheduled_time` (em vez de `date(scheduled_time)`)
+    permite usar o índice parcial ix_bookings_active_scheduled_time.
+    '''
+    query = select(models.Booking).options(
+        joinedload(models.Booking.pet),
+        joinedload(models.Booking.employee),
+    ).where(
+        models.Booking.scheduled_time >= start,
+        models.Booking.scheduled_time < end,
+        models.Booking.is_active == True,
+    )
+    if employee_id is not None:
+        query = query.where(models.Booking.employee_id == employee_id)
+    return query.order_by(models.Booking.scheduled_time, models.Booking.id)
+
+
+def group_by_employee(bookings) -> list[dict]:
+    '''Agrupa os agendamentos (já ordenados por horário) por funcionário, em ordem de nome.'''
+    groups = {}
+    for booking in bookings:
+        groups.setdefault(booking.employee_id, []).append(booking)
+    return sorted(
+        ({"employee": items[0].employee, "bookings": items} for items in groups.values()),
+        key=lambda group: (group["employee"].name, group["employee"].id),
+    )
+
+
+schedule_cache = TTLCache("schedule", config.SCHEDULE_CACHE_MAX_ENTRIES,
+                          config.SCHEDULE_CACHE_TTL_SECONDS)
+
+_schedule_adapters = {
+    None: TypeAdapter(list[schemas.BookingResponse]),
+    "employee": TypeAdapter(list[schemas.EmployeeSchedule]),
+}
+
+
+def render_schedule(bookings, group_by: Optional[str]) -> bytes:
+    '''Serializa a agenda para JSON, no formato de `group_by`.'''
+    if group_by == "employee":
+        bookings = group_by_employee(bookings)
+    adapter = _schedule_adapters[group_by]
+    return adapter.dump_json(adapter.validate_python(bookings, from_attributes=True))
+
+
+def invalidate_schedule(*touched: tuple[int, datetime]) -> None:
+    '''Remove do cache as agendas que incluem algum (employee_id, scheduled_time) alterado.'''
+    touched = [(employee_id, _naive(when)) for employee_id, when in touched]
+
+    def affected(key) -> bool:
+        start, end, employee_id, _ = key
+        return any(start <= when < end and (employee_id is None or employee_id == touched_employee)
+                   for touched_employee, when in touched)
+
+    schedule_cache.invalidate(affected)
+
+
+def booking_event(booking) -> dict:
+    '''Dados do agendamento enviados no stream de eventos.'''
+    return {
+        "id": booking.id,
+        "service_name": booking.service_name,
+        "scheduled_time": booking.scheduled_time,
+        "ends_at": booking.ends_at,
+        "duration_minutes": booking.duration_minutes,
+        "employee_id": booking.employee_id,
+        "pet_id": booking.pet_id,
+        "delivery": booking.delivery,
+        "is_active": booking.is_active,
+    }
+
+
+def booking_changed(event_type: str, data: dict,
+                    previous: Optional[tuple[int, datetime]] = None) -> None:
+    '''Depois do commit: invalida as agendas afetadas e publica o evento.'''
+    touched = [(data["employee_id"], data["scheduled_time"])]
+    if previous is not None:
+        touched.append(previous)
+    invalidate_schedule(*touched)
+    events.publish(event_type, data)
+
+
+def export_query(start: Optional[datetime], end: Optional[datetime]):
+    '''Agendamentos ativos que começam em [start, end), com pet e funcionário, para /api/bookings/export.'''
+    query = (
+        select(models.Booking.id, models.Booking.scheduled_time, models.Booking.ends_at,
+               models.Booking.duration_minutes, models.Booking.service_name,
+               models.Booking.employee_id, models.Employee.name.label("employee_name"),
+               models.Booking.pet_id, models.Pet.name.label("pet_name"),
+               models.Pet.customer_id, models.Booking.delivery)
+        .join(models.Employee, models.Booking.employee_id == models.Employee.id)
+        .join(models.Pet, models.Booking.pet_id == models.Pet.id)
+        .where(models.Booking.is_active == True)
+        .order_by(models.Booking.scheduled_time, models.Booking.id)
+    )
+    if start is not None:
+        query = query.where(models.Booking.scheduled_time >= start)
+    if end is not None:
+        query = query.where(models.Booking.scheduled_time < end)
+    return query
+
+
+def window_query(start: datetime, end: datetime, employee_ids: Optional[list[int]] = None):
+    '''SELECT dos intervalos ativos que tocam [start, end), ordenados por funcionário.'''
+    earliest = start - timedelta(minutes=config.BOOKING_MAX_DURATION_MINUTES)
+    query = select(
+        models.Booking.id, models.Booking.employee_id,
+        models.Booking.scheduled_time, models.Booking.ends_at,
+    ).where(
+        models.Booking.scheduled_time > earliest,
+        models.Booking.scheduled_time < end,
+        models.Booking.is_active == True,
+        models.Booking.ends_at > start,
+    )
+    if employee_ids is not None:
+        query = query.where(models.Booking.employee_id.in_(employee_ids))
+    return query.order_by(models.Booking.employee_id, models.Booking.scheduled_time)
+
+
+def opening_hours(start: datetime, end: datetime):
+    '''Janelas de atendimento de cada dia, recortadas para [start, end).'''
+    day = start.date()
+    while day <= end.date():
+        opens = datetime.combine(day, time(config.SCHEDULE_OPENING_HOUR))
+        closes = datetime.combine(day, time(config.SCHEDULE_CLOSING_HOUR))
+        window_start, window_end = max(opens, start), min(closes, end)
+        if window_start < window_end:
+            yield window_start, window_end
+        day += timedelta(days=1)
+
+
+def availability(employees, bookings, start: datetime, end: datetime, duration: int) -> list[dict]:
+    '''Horários livres de cada funcionário onde cabe um serviço de `duration` minutos.'''
+    index = ScheduleIndex.from_bookings(bookings)
+    windows = list(opening_hours(start, end))
+    length = timedelta(minutes=duration)
+    result = []
+    for employee in employees:
+        intervals = index[employee.id]
+        slots = [
+            {"start": gap.start, "end": gap.end, "latest_start": gap.end - length}
+            for window_start, window_end in windows
+            for gap in intervals.free(window_start, window_end, duration)
+        ]
+        result.append({"employee_id": employee.id, "name": employee.name, "slots": slots})
+    return result
+
+
+def expand_bulk(items) -> list[tuple[int, dict]]:
+    '''Expande as recorrências do lote em (posição do item, dados da ocorrência).'''
+    occurrences = []
+    for position, item in enumerate(items):
+        data = prepare_new_booking(item.dict(exclude={"recurrence"}))
+        data["scheduled_time"] = _naive(data["scheduled_time"])
+        rule = item.recurrence
+        count, step = 1, timedelta(0)
+        if rule is not None:
+            count = rule.count
+            step = timedelta(days=rule.interval * (7 if rule.frequency == "weekly" else 1))
+        for n in range(count):
+            start = data["scheduled_time"] + n * step
+            occurrences.append((position, {
+                **data, "scheduled_time": start,
+                "ends_at": booking_end(start, data["duration_minutes"]),
+            }))
+            if len(occurrences) > config.BOOKING_BULK_MAX_OCCURRENCES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"O lote passa do máximo de {config.BOOKING_BULK_MAX_OCCURRENCES} ocorrências."
+                )
+    return occurrences
+
+
+def reference_errors(occurrences, employee_ids: set, pet_ids: set) -> dict[int, str]:
+    '''Ocorrências cujo funcionário ou pet não existe ou está inativo.'''
+    errors = {}
+    for n, (_, row) in enumerate(occurrences):
+        if row["employee_id"] not in employee_ids:
+            errors[n] = f"Funcionário com id {row['employee_id']} não encontrado ou está inativo."
+        elif row["pet_id"] not in pet_ids:
+            errors[n] = f"Pet com id {row['pet_id']} não encontrado ou está inativo."
+    return errors
+
+
+def employee_windows(rows) -> dict[int, tuple[datetime, datetime]]:
+    '''Menor início e maior término das ocorrências de cada funcionário.'''
+    windows = {}
+    for row in rows:
+        start, end = row["scheduled_time"], row["ends_at"]
+        current = windows.get(row["employee_id"])
+        if current is not None:
+            start, end = min(start, current[0]), max(end, current[1])
+        windows[row["employee_id"]] = (start, end)
+    return windows
+
+
+def bulk_conflicts(rows, ids: list[int], bookings) -> dict[int, str]:
+    '''Confere as ocorrências já gravadas, na ordem do lote.
+
+    `bookings` traz a agenda das janelas, incluindo as próprias ocorrências
+    (`ids`), que entram no índice uma a uma: a primeira de duas ocorrências
+    sobrepostas é aceita e a segunda recusada.
+    '''
+    own = set(ids)
+    index = ScheduleIndex.from_bookings(b for b in bookings if b.id not in own)
+    errors = {}
+    for n, (row, booking_id) in enumerate(zip(rows, ids)):
+        intervals = index[row["employee_id"]]
+        conflict = intervals.conflict(row["scheduled_time"], row["ends_at"])
+        if conflict is None:
+            intervals.add(row["scheduled_time"], row["ends_at"], booking_id)
+        elif conflict.booking_id in own:
+            errors[n] = (f"Conflita com outra ocorrência do lote "
+                         f"({conflict.start:%d/%m/%Y %H:%M} às {conflict.end:%H:%M}).")
+        else:
+            errors[n] = conflict_message(conflict.start, conflict.end)
+    return errors
+
+
+def bulk_result(occurrences, created: dict[int, int], errors: dict[int, str]) -> dict:
+    '''Relatório do lote; `created` e `errors` são indexados pela ocorrência.'''
+    return {
+        "total": len(occurrences),
+        "created": len(created),
+        "failed": len(errors),
+        "bookings": [
+            {"id": created[n], "item": position, "scheduled_time": row["scheduled_time"],
+             "ends_at": row["ends_at"], "employee_id": row["employee_id"]}
+            for n, (position, row) in enumerate(occurrences) if n in created
+        ],
+        "errors": [
+            {"item": position, "scheduled_time": row["scheduled_time"],
+             "employee_id": row["employee_id"], "detail": errors[n]}
+            for n, (position, row) in enumerate(occurrences) if n in errors
+        ],
+    }
@@ -0,0 +1,86 @@
+"""Baixa de estoque e transições de estoque baixo.
+
+As vendas debitam o estoque com um UPDATE condicional
+(`quantity = quantity - n ... WHERE quantity >= n`): a conferência e a
+escrita são o mesmo comando, então duas vendas simultâneas não conseguem
+vender a mesma unidade, e um carrinho inteiro é debitado numa única ida ao
+banco.
+
+Um item está em estoque baixo quando `quantity <= low_stock_threshold`. Só
+a mudança de estado gera evento (`stock.low` ao cruzar o limite para baixo,
+`stock.restored` ao voltar para cima), não cada alteração de quantidade.
+"""
+from sqlalchemy import and_, case, select, update
+
+from app import models
+from app.core import events
+
+
+def is_low_stock(item) -> bool:
+    return item.is_active and item.quantity <= item.low_stock_threshold
+
+
+def low_stock_condition():
+    '''`is_low_stock` em SQL, igual ao WHERE do índice parcial `ix_inventory_low_stock`.'''
+    return and_(models.Inventory.is_active == True,
+                models.Inventory.quantity <= models.Inventory.low_stock_threshold)
+
+
+def low_stock_query():
+    '''Itens em estoque baixo, com as colunas de `stock_event`.'''
+    return select(models.Inventory.id, models.Inventory.product_name,
+                  models.Inventory.quantity, models.Inventory.low_stock_threshold
+                  ).where(low_stock_condition())
+
+
+def stock_event(item) -> dict:
+    return {
+        "id": item.id,
+        "product_name": item.product_name,
+        "quantity": item.quantity,
+        "low_stock_threshold": item.low_stock_threshold,
+    }
+
+
+def publish_stock_transition(item, was_low: bool) -> None:
+    '''Depois do commit: publica o evento se o item entrou ou saiu do estoque baixo.'''
+    now_low = is_low_stock(item)
+    if now_low != was_low:
+        events.publish("stock.low" if now_low else "stock.restored", stock_event(item))
+
+
+def decrement_stock(quantities: dict[int, int]):
+    '''UPDATE que debita `quantities` (id do item -> unidades) de uma vez.
+
+    Só os itens com estoque suficiente são alterados; o RETURNING traz esses
+    itens já com a quantidade nova. Os ids ausentes do resultado não tinham
+    estoque e ficam intactos.
+    '''
+    amount = case(quantities, value=models.Inventory.id)
+    return (
+        update(models.Inventory)
+        .where(models.Inventory.id.in_(quantities), models.Inventory.quantity >= amount)
+        .values(quantity=models.Inventory.quantity - amount)
+        .returning(models.Inventory.id, models.Inventory.product_name,
+                   models.Inventory.quantity, models.Inventory.low_stock_threshold,
+                   models.Inventory.is_active)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def publish_decrement_transitions(rows, quantities: dict[int, int]) -> None:
+    '''Depois do commit: eventos de estoque dos itens devolvidos por `decrement_stock`.'''
+    for row in rows:
+        was_low = row.is_active and row.quantity + quantities[row.id] <= row.low_stock_threshold
+        publish_stock_transition(row, was_low)
+
+
+def sale_event(sale) -> dict:
+    return {
+        "id": sale.id,
+        "product_id": sale.product_id,
+        "customer_id": sale.customer_id,
+        "quantity": sale.quantity,
+        "total_value": sale.total_value,
+        "created_at": sale.created_at,
+    }
@@ -0,0 +1,146 @@
+"""Regras das vendas: listagem por período e carrinho (POST /api/sales/checkout).
+
+A listagem filtra por um intervalo semiaberto direto em `created_at`
+(`from <= created_at < to`), que usa o índice parcial de vendas ativas;
+`month`/`year` viram o mesmo intervalo. As páginas seguem por cursor
+(`created_at`, `id`) e o modo streaming lê e serializa as vendas em lotes
+de `SALES_STREAM_BATCH_SIZE`, sem montar a lista inteira em memória.
+
+Qualquer que seja o número de itens, o carrinho custa três comandos na
+mesma transação: uma consulta resolve os produtos pelo nome, um único
+UPDATE condicional (`inventory.decrement_stock`) debita o estoque de todos
+e um INSERT de várias linhas grava as vendas. Linhas do mesmo produto são
+somadas antes do débito e aceitas ou recusadas juntas.
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+
+from app import models
+from app.core import config, export
+from app.schemas import sale as schemas
+
+
+NOT_FOUND = "Item não encontrado no inventário"
+OUT_OF_STOCK = "Fora de estoque"
+
+SALE_COLUMNS = (
+    models.Sale.id, models.Sale.product_id, models.Sale.customer_id,
+    models.Sale.quantity, models.Sale.total_value, models.Sale.created_at,
+)
+
+_sales_adapter = TypeAdapter(list[schemas.SaleResponse])
+
+
+def sales_window(start: Optional[datetime], end: Optional[datetime],
+                 month: Optional[int], year: Optional[int]) -> tuple[Optional[datetime], Optional[datetime]]:
+    '''Limites [start, end) de `created_at` (UTC); `month` e `year` juntos viram o mês inteiro.'''
+    if month is not None and year is not None:
+        if start or end:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Use `from`/`to` ou `month`/`year`, não os dois.")
+        start = datetime(year, month, 1)
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+    return export.period(start, end, utc=True)
+
+
+def sales_query(start: Optional[datetime], end: Optional[datetime], *columns):
+    '''Vendas ativas com `created_at` em [start, end); sem `columns`, as entidades.'''
+    query = select(*(columns or (models.Sale,))).where(models.Sale.is_active == True)
+    if start is not None:
+        query = query.where(models.Sale.created_at >= start)
+    if end is not None:
+        query = query.where(models.Sale.created_at < end)
+    return query
+
+
+def stream_query(start: Optional[datetime], end: Optional[datetime]):
+    '''Colunas das vendas do período, em ordem, lidas em lotes (`yield_per`).'''
+    return (sales_query(start, end, *SALE_COLUMNS)
+            .order_by(models.Sale.created_at, models.Sale.id)
+            .execution_options(yield_per=config.SALES_STREAM_BATCH_SIZE))
+
+
+def export_query(start: Optional[datetime], end: Optional[datetime]):
+    '''Vendas ativas do período com cliente e produto, para /api/sales/export.'''
+    return (
+        sales_query(
+            start, end,
+            models.Sale.id, models.Sale.created_at,
+            models.Sale.customer_id, models.Customer.name.label("customer_name"),
+            models.Customer.cpf.label("customer_cpf"),
+            models.Sale.product_id, models.Inventory.product_name,
+            models.Sale.quantity, models.Sale.total_value,
+        )
+        .join(models.Customer, models.Sale.customer_id == models.Customer.id)
+        .join(models.Inventory, models.Sale.product_id == models.Inventory.id)
+        .order_by(models.Sale.created_at, models.Sale.id)
+    )
+
+
+def deactivate(sale_id: int):
+    '''Soft delete condicional: só a primeira exclusão de uma venda altera a linha.'''
+    return (update(models.Sale)
+            .where(models.Sale.id == sale_id, models.Sale.is_active == True)
+            .values(is_active=False)
+            .execution_options(synchronize_session=False))
+
+
+def sales_json_chunk(rows, first: bool) -> bytes:
+    '''Um lote de vendas como trecho de um array JSON (sem os colchetes).'''
+    sales = _sales_adapter.validate_python([row._asdict() for row in rows])
+    body = _sales_adapter.dump_json(sales)[1:-1]
+    return body if first or not body else b"," + body
+
+
+def products_query(items):
+    '''(product_name, id) dos produtos citados no carrinho.'''
+    return select(models.Inventory.product_name, models.Inventory.id).where(
+        models.Inventory.product_name.in_({item.product_name for item in items}))
+
+
+def stock_quantities(items, products: dict[str, int]) -> tuple[dict[int, int], dict[int, str]]:
+    '''Unidades pedidas por item de estoque e as linhas com produto desconhecido.'''
+    quantities, errors = {}, {}
+    for n, item in enumerate(items):
+        product_id = products.get(item.product_name)
+        if product_id is None:
+            errors[n] = NOT_FOUND
+        else:
+            quantities[product_id] = quantities.get(product_id, 0) + item.quantity
+    return quantities, errors
+
+
+def stock_errors(items, products: dict[str, int], debited: set[int]) -> dict[int, str]:
+    '''Linhas cujo produto existe mas não foi debitado por falta de estoque.'''
+    return {
+        n: OUT_OF_STOCK for n, item in enumerate(items)
+        if item.product_name in products and products[item.product_name] not in debited
+    }
+
+
+def sale_rows(checkout, products: dict[str, int], errors: dict[int, str]) -> list[tuple[int, dict]]:
+    '''(posição no carrinho, colunas da venda) das linhas aceitas.'''
+    return [
+        (n, {"product_id": products[item.product_name], "customer_id": checkout.customer_id,
+             "quantity": item.quantity, "total_value": item.total_value})
+        for n, item in enumerate(checkout.items) if n not in errors
+    ]
+
+
+def checkout_result(items, created: dict[int, dict], errors: dict[int, str]) -> dict:
+    '''Relatório do carrinho; `created` e `errors` são indexados pela linha.'''
+    return {
+        "total": len(items),
+        "created": len(created),
+        "failed": len(errors),
+        "sales": [{**created[n], "item": n} for n in range(len(items)) if n in created],
+        "errors": [
+            {"item": n, "product_name": item.product_name,
+             "quantity": item.quantity, "detail": errors[n]}
+            for n, item in enumerate(items) if n in errors
+        ],
+    }
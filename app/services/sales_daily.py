@@ -0,0 +1,150 @@
+"""Rollup diário das vendas (`sales_daily`) e o comando de reconstrução.
+
+Cada venda criada ou cancelada soma (ou subtrai) sua quantidade, seu valor
+e uma unidade de contagem na linha (dia, produto, cliente) correspondente,
+com um upsert executado na mesma transação da venda: o rollup nunca fica
+à frente nem atrás de `sales`. O dia é a data UTC de `created_at`.
+
+Os relatórios (dashboard e /api/dashboard/sales) somam no máximo uma linha
+por dia, produto e cliente em vez de varrer todas as vendas.
+
+Para recalcular a tabela a partir de `sales` (backfill, carga pelo seed ou
+correção de arredondamento acumulado):
+
+    python -m app.services.sales_daily                       # tudo
+    python -m app.services.sales_daily --from 2025-01-01 --to 2025-02-01
+"""
+import argparse
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Iterable, Mapping, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app import models
+from app.core import config
+
+
+_KEY = ("day", "product_id", "customer_id")
+_TOTALS = ("quantity", "revenue", "sales_count")
+
+
+def sale_day(created_at: datetime) -> date:
+    '''Dia UTC de uma venda; datas sem fuso já estão em UTC.'''
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def deltas(sales: Iterable[Mapping], sign: int = 1) -> list[dict]:
+    '''Parâmetros do upsert para `sales` (+1 ao criar, -1 ao cancelar).
+
+    `sales` são mapeamentos com product_id, customer_id, quantity,
+    total_value e created_at, como os eventos `sale.created`. Vendas da
+    mesma chave viram uma linha só.
+    '''
+    totals = defaultdict(lambda: [0, 0.0, 0])
+    for sale in sales:
+        row = totals[(sale_day(sale["created_at"]), sale["product_id"], sale["customer_id"])]
+        row[0] += sign * sale["quantity"]
+        row[1] += sign * sale["total_value"]
+        row[2] += sign
+    return [dict(zip(_KEY + _TOTALS, (*key, *values))) for key, values in totals.items()]
+
+
+def upsert(db):
+    '''INSERT ... ON CONFLICT que acumula os `deltas` nas linhas existentes.'''
+    table = models.SalesDaily.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(
+            {name: table.c[name] + stmt.inserted[name] for name in _TOTALS})
+    dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if dialect_insert is None:
+        raise ValueError(f"Upsert de sales_daily não suportado em '{dialect}'.")
+    stmt = dialect_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(_KEY),
+        set_={name: table.c[name] + stmt.excluded[name] for name in _TOTALS})
+
+
+def report_query(start: Optional[date], end: Optional[date],
+                 product_id: Optional[int] = None, customer_id: Optional[int] = None):
+    '''Receita, unidades e vendas por dia em [start, end), a partir do rollup.'''
+    if start and end and end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="O fim do período deve ser posterior ao início.")
+    daily = models.SalesDaily
+    query = select(
+        daily.day,
+        func.sum(daily.quantity).label("quantity"),
+        func.sum(daily.revenue).label("revenue"),
+        func.sum(daily.sales_count).label("sales_count"),
+    )
+    if start is not None:
+        query = query.where(daily.day >= start)
+    if end is not None:
+        query = query.where(daily.day < end)
+    if product_id is not None:
+        query = query.where(daily.product_id == product_id)
+    if customer_id is not None:
+        query = query.where(daily.customer_id == customer_id)
+    # Dias cujas vendas foram todas canceladas ficam com linhas zeradas.
+    return (query.group_by(daily.day)
+            .having(func.sum(daily.sales_count) > 0)
+            .order_by(daily.day))
+
+
+def totals_query():
+    '''Receita e número de vendas ativas, somados no rollup.'''
+    return select(func.sum(models.SalesDaily.revenue), func.sum(models.SalesDaily.sales_count))
+
+
+def rebuild(conn, start: Optional[date] = None, end: Optional[date] = None) -> int:
+    '''Recalcula os dias [start, end) a partir de `sales`; retorna as linhas gravadas.
+
+    Apaga e reinsere o período com um INSERT ... SELECT, dentro da transação
+    de `conn` (o chamador faz o commit).
+    '''
+    daily, sale = models.SalesDaily, models.Sale
+    clear = delete(daily)
+    source = (
+        select(func.date(sale.created_at), sale.product_id, sale.customer_id,
+               func.sum(sale.quantity), func.sum(sale.total_value), func.count())
+        .where(sale.is_active == True)
+        .group_by(func.date(sale.created_at), sale.product_id, sale.customer_id)
+    )
+    if start is not None:
+        clear = clear.where(daily.day >= start)
+        source = source.where(sale.created_at >= datetime.combine(start, datetime.min.time()))
+    if end is not None:
+        clear = clear.where(daily.day < end)
+        source = source.where(sale.created_at < datetime.combine(end, datetime.min.time()))
+
+    conn.execute(clear)
+    return conn.execute(insert(daily).from_select(list(_KEY + _TOTALS), source)).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói o rollup diário de vendas (sales_daily).")
+    parser.add_argument("--database-url", default=config.DATABASE_URL)
+    parser.add_argument("--from", dest="start", type=date.fromisoformat,
+                        help="Primeiro dia (AAAA-MM-DD, inclusivo)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat,
+                        help="Último dia (AAAA-MM-DD, exclusivo)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rows = rebuild(conn, args.start, args.end)
+    print(f"sales_daily: {rows} linhas em {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Regras de duração dos serviços e índice de intervalos em memória.
+
+A duração de um agendamento vem do cliente ou, se omitida, do serviço:
+a primeira palavra-chave de `SERVICE_DURATIONS` encontrada no nome do
+serviço (sem acentos e sem diferenciar maiúsculas) define os minutos.
+
+`ScheduleIndex` guarda os intervalos ocupados de cada funcionário em listas
+ordenadas pelo início: depois de carregar uma janela com uma única consulta,
+cada verificação de conflito custa O(log n) via `bisect`, sem voltar ao
+banco, e `free` encontra as lacunas de uma janela numa única varredura. É o
+que as operações em lote (disponibilidade, agendamentos recorrentes) usam
+para validar muitos horários de uma vez.
+"""
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from app.core import config
+
+
+# Ordem importa: "Banho e Tosa" deve casar com "tosa" antes de "banho".
+SERVICE_DURATIONS = (
+    ("tosa", 120),
+    ("banho", 60),
+    ("cirurgia", 180),
+    ("consulta", 30),
+    ("vacina", 15),
+    ("unha", 15),
+)
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+@lru_cache(maxsize=256)
+def service_duration(service_name: str) -> int:
+    '''Duração padrão, em minutos, do serviço informado.'''
+    folded = _fold(service_name)
+    for keyword, minutes in SERVICE_DURATIONS:
+        if keyword in folded:
+            return minutes
+    return config.BOOKING_DEFAULT_DURATION_MINUTES
+
+
+def booking_end(start: datetime, duration_minutes: int) -> datetime:
+    return start + timedelta(minutes=duration_minutes)
+
+
+class Interval(NamedTuple):
+    start: datetime
+    end: datetime
+    booking_id: Optional[int] = None
+
+
+class EmployeeIntervals:
+    '''Intervalos ocupados de um funcionário, ordenados pelo início.'''
+
+    def __init__(self):
+        self.starts: list[datetime] = []
+        self.intervals: list[Interval] = []
+
+    def add(self, start: datetime, end: datetime, booking_id: Optional[int] = None) -> None:
+        position = bisect_left(self.starts, start)
+        self.starts.insert(position, start)
+        self.intervals.insert(position, Interval(start, end, booking_id))
+
+    def conflict(self, start: datetime, end: datetime,
+                 exclude_id: Optional[int] = None) -> Optional[Interval]:
+        '''Primeiro intervalo que se sobrepõe a [start, end), ou None.
+
+        Só intervalos que começam antes de `end` e depois de
+        `start - BOOKING_MAX_DURATION_MINUTES` podem se sobrepor, então a
+        varredura para trás a partir do bisect é limitada a essa janela.
+        '''
+        earliest = start - timedelta(minutes=config.BOOKING_MAX_DURATION_MINUTES)
+        position = bisect_left(self.starts, end) - 1
+        while position >= 0 and self.starts[position] > earliest:
+            interval = self.intervals[position]
+            if interval.end > start and (exclude_id is None or interval.booking_id != exclude_id):
+                return interval
+            position -= 1
+        return None
+
+    def free(self, start: datetime, end: datetime, min_minutes: int = 0) -> list[Interval]:
+        '''Lacunas de [start, end) não cobertas por nenhum intervalo.
+
+        Varredura única sobre os intervalos ordenados que podem tocar a
+        janela; intervalos sobrepostos entre si são fundidos pelo cursor.
+        Só devolve lacunas de pelo menos `min_minutes`.
+        '''
+        min_length = timedelta(minutes=min_minutes)
+        earliest = start - timedelta(minutes=config.BOOKING_MAX_DURATION_MINUTES)
+        position = bisect_left(self.starts, earliest)
+        cursor = start
+        gaps = []
+        while position < len(self.intervals) and self.starts[position] < end:
+            interval = self.intervals[position]
+            if interval.start > cursor and interval.start - cursor >= min_length:
+                gaps.append(Interval(cursor, interval.start))
+            cursor = max(cursor, interval.end)
+            position += 1
+        if cursor < end and end - cursor >= min_length:
+            gaps.append(Interval(cursor, end))
+        return gaps
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def __len__(self):
+        return len(self.intervals)
+
+
+class ScheduleIndex(dict):
+    '''Mapa employee_id -> EmployeeIntervals, preenchido a partir de uma consulta.'''
+
+    def __missing__(self, employee_id: int) -> EmployeeIntervals:
+        intervals = self[employee_id] = EmployeeIntervals()
+        return intervals
+
+    @classmethod
+    def from_bookings(cls, bookings) -> "ScheduleIndex":
+        index = cls()
+        for booking in bookings:
+            index[booking.employee_id].add(booking.scheduled_time, booking.ends_at, booking.id)
+        return index
@@ -0,0 +1,94 @@
+"""Normalização e validação de CPF e telefone compartilhadas pelos schemas.
+
+A validação de CPF replica as regras do `validate_docbr.CPF().validate`
+(até 11 dígitos, completados com zeros à esquerda, e rejeição de dígitos
+todos iguais), mas sem criar objetos nem listas por chamada: os dígitos são
+lidos direto dos bytes ASCII e as somas ponderadas são desenroladas. Para
+validar milhares de CPFs de uma vez (importações em lote) use
+`validate_cpfs`. Comparação de desempenho: `python -m benchmarks.cpf`.
+"""
+import re
+from typing import Iterable
+
+
+_NON_DIGITS = re.compile(r"\D")
+
+# 48 = ord("0"). As somas abaixo usam os bytes ASCII direto e descontam
+# 48 * (soma dos pesos) no final, em vez de converter cada dígito.
+_FIRST_OFFSET = 48 * sum(range(2, 11))
+_SECOND_OFFSET = 48 * sum(range(2, 12))
+
+
+def only_digits(text: str) -> str:
+    '''Remove todos os caracteres não numéricos de um texto.'''
+    if not text:
+        return ""
+    if text.isascii() and text.isdigit():
+        return text
+    return _NON_DIGITS.sub("", text)
+
+
+normalize_text = only_digits
+normalize_cpf = only_digits
+normalize_phone = only_digits
+
+
+def _check_digit(total: int) -> int:
+    remainder = total % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def cpf_check_digits(base: str) -> str:
+    '''Calcula os dois dígitos verificadores para os 9 primeiros dígitos do CPF.'''
+    d = base.encode("ascii")
+    first = _check_digit(
+        10 * d[0] + 9 * d[1] + 8 * d[2] + 7 * d[3] + 6 * d[4]
+        + 5 * d[5] + 4 * d[6] + 3 * d[7] + 2 * d[8] - _FIRST_OFFSET)
+    second = _check_digit(
+        11 * d[0] + 10 * d[1] + 9 * d[2] + 8 * d[3] + 7 * d[4]
+        + 6 * d[5] + 5 * d[6] + 4 * d[7] + 3 * d[8] + 2 * (first + 48) - _SECOND_OFFSET)
+    return f"{first}{second}"
+
+
+def is_valid_cpf(cpf: str) -> bool:
+    '''Verifica os dígitos de um CPF já normalizado (apenas números).'''
+    if not cpf or len(cpf) > 11 or not cpf.isascii() or not cpf.isdigit():
+        return False
+    if len(cpf) < 11:
+        cpf = cpf.zfill(11)
+    if cpf == cpf[0] * 11:
+        return False
+
+    d = cpf.encode("ascii")
+    first = _check_digit(
+        10 * d[0] + 9 * d[1] + 8 * d[2] + 7 * d[3] + 6 * d[4]
+        + 5 * d[5] + 4 * d[6] + 3 * d[7] + 2 * d[8] - _FIRST_OFFSET)
+    if first != d[9] - 48:
+        return False
+    second = _check_digit(
+        11 * d[0] + 10 * d[1] + 9 * d[2] + 8 * d[3] + 7 * d[4]
+        + 6 * d[5] + 5 * d[6] + 4 * d[7] + 3 * d[8] + 2 * d[9] - _SECOND_OFFSET)
+    return second == d[10] - 48
+
+
+def validate_cpfs(cpfs: Iterable[str], normalize: bool = True) -> list[bool]:
+    '''Valida vários CPFs de uma vez, na mesma ordem da entrada.'''
+    if normalize:
+        cpfs = map(only_digits, cpfs)
+    return list(map(is_valid_cpf, cpfs))
+
+
+def validate_cpf(value: str) -> str:
+    '''Normaliza e valida um CPF; lança ValueError se for inválido (uso nos validators).'''
+    normalized = only_digits(value)
+    if not is_valid_cpf(normalized):
+        raise ValueError('CPF inválido')
+    return normalized
+
+
+def validate_phone(value: str) -> str:
+    '''Normaliza um telefone e garante ao menos 10 dígitos (DDD + número).'''
+    normalized = only_digits(value)
+    if not normalized or len(normalized) < 10:
+        raise ValueError('Número de telefone inválido')
+    return normalized
@@ -0,0 +1,71 @@
+"""Compara dois resultados de `benchmarks.run` e falha se houver regressão.
+
+    python -m benchmarks.compare base.json novo.json --metric p95_ms --threshold 0.15
+
+Um endpoint regrediu quando a métrica piora mais que `--threshold`
+(fração) E mais que `--min-delta-ms` em valor absoluto — o piso evita
+falsos positivos em endpoints que levam frações de milissegundo. Também
+conta como regressão um endpoint que passou a retornar erros.
+Sai com código 1 se alguma regressão for encontrada.
+"""
+import argparse
+import json
+import sys
+
+
+LOWER_IS_BETTER = {"p50_ms", "p95_ms", "p99_ms", "mean_ms", "db_queries_mean"}
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: dict, new: dict, metric: str, threshold: float, min_delta: float) -> list:
+    '''Retorna as linhas da comparação: (tamanho, endpoint, base, novo, variação, regressão).'''
+    rows = []
+    for size, endpoints in new["runs"].items():
+        base_endpoints = base["runs"].get(size, {})
+        for name, result in endpoints.items():
+            previous = base_endpoints.get(name)
+            if previous is None or previous.get(metric) is None or result.get(metric) is None:
+                continue
+            before, after = previous[metric], result[metric]
+            if metric in LOWER_IS_BETTER:
+                delta = after - before
+            else:
+                delta = before - after
+            change = delta / before if before else 0.0
+            regressed = (change > threshold and abs(delta) > min_delta) or \
+                (result["errors"] > 0 and previous["errors"] == 0)
+            rows.append((size, name, before, after, change, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark.")
+    parser.add_argument("base", help="Resultado de referência (JSON)")
+    parser.add_argument("new", help="Resultado a validar (JSON)")
+    parser.add_argument("--metric", default="p95_ms",
+                        help="Métrica comparada (p50_ms, p95_ms, p99_ms, throughput_rps...)")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Piora relativa tolerada (0.15 = 15%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="Piora absoluta mínima para contar como regressão")
+    args = parser.parse_args()
+
+    rows = compare(load(args.base), load(args.new), args.metric,
+                   args.threshold, args.min_delta_ms)
+
+    regressions = 0
+    for size, name, before, after, change, regressed in rows:
+        flag = "REGRESSÃO" if regressed else ""
+        regressions += regressed
+        print(f"{size:>8} {name:<42} {before:>10.2f} -> {after:>10.2f} {change:>+8.1%} {flag}")
+
+    print(f"\n{len(rows)} endpoints comparados ({args.metric}), {regressions} regressões.")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Microbenchmark da validação de CPF: `app.utils.validation` x `validate_docbr`.
+
+    python -m benchmarks.cpf --count 100000
+
+Mede, para a mesma lista de CPFs (metade válidos, com e sem máscara), o
+tempo por CPF de:
+
+- `validate_docbr.CPF().validate`, criando o validador a cada chamada, como
+  os schemas faziam;
+- o mesmo, reaproveitando uma instância;
+- `is_valid_cpf` (entrada já normalizada) e `validate_cpf` (normaliza);
+- `validate_cpfs`, a API em lote.
+
+Antes de medir, confere que as duas implementações concordam em todos os
+casos gerados.
+"""
+import argparse
+import random
+import time
+
+from app.utils.validation import (cpf_check_digits, is_valid_cpf, only_digits,
+                                  validate_cpf, validate_cpfs)
+
+
+def sample_cpfs(count: int, seed: int) -> list[str]:
+    '''Gera CPFs válidos e inválidos, com e sem máscara, e alguns casos de borda.'''
+    rng = random.Random(seed)
+    cpfs = ["", "123", "00000000000", "11111111111", "529.982.247-25", "5299822472",
+            "529982247251", "abc.def.ghi-jk"]
+    while len(cpfs) < count:
+        base = f"{rng.randrange(1_000_000_000):09d}"
+        cpf = base + cpf_check_digits(base)
+        if rng.random() < 0.5:
+            cpf = cpf[:9] + str((int(cpf[9]) + rng.randint(1, 9)) % 10) + cpf[10]
+        if rng.random() < 0.3:
+            cpf = f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+        cpfs.append(cpf)
+    return cpfs
+
+
+def measure(label: str, fn, count: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    per_item_us = best / count * 1e6
+    print(f"  {label:<44} {per_item_us:8.3f} µs/CPF  {count / best:>12,.0f} CPFs/s")
+    return per_item_us
+
+
+def _raises(fn, value) -> bool:
+    try:
+        fn(value)
+    except ValueError:
+        return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark da validação de CPF.")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cpfs = sample_cpfs(args.count, args.seed)
+    normalized = [only_digits(cpf) for cpf in cpfs]
+    print(f"{len(cpfs)} CPFs, melhor de {args.repeat} execuções")
+
+    try:
+        from validate_docbr import CPF
+    except ImportError:
+        CPF = None
+        print("  validate_docbr não instalado: medindo apenas app.utils.validation")
+
+    if CPF is not None:
+        reference = CPF()
+        mismatches = [cpf for cpf in normalized if reference.validate(cpf) != is_valid_cpf(cpf)]
+        if mismatches:
+            raise SystemExit(f"Divergência com validate_docbr em {len(mismatches)} CPFs, "
+                             f"ex.: {mismatches[:5]}")
+        print("  resultados idênticos aos do validate_docbr")
+
+        baseline = measure("validate_docbr, CPF() por chamada",
+                           lambda: [CPF().validate(only_digits(c)) for c in cpfs],
+                           len(cpfs), args.repeat)
+        measure("validate_docbr, instância reaproveitada",
+                lambda: [reference.validate(only_digits(c)) for c in cpfs],
+                len(cpfs), args.repeat)
+
+    measure("is_valid_cpf (já normalizado)",
+            lambda: [is_valid_cpf(c) for c in normalized], len(cpfs), args.repeat)
+    per_item = measure("validate_cpf (normaliza + valida)",
+                       lambda: [_raises(validate_cpf, c) for c in cpfs], len(cpfs), args.repeat)
+    batch = measure("validate_cpfs (lote)", lambda: validate_cpfs(cpfs), len(cpfs), args.repeat)
+
+    if CPF is not None:
+        print(f"\n  lote {baseline / batch:.1f}x mais rápido que o validate_docbr por chamada; "
+              f"validator {baseline / per_item:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
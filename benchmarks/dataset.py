@@ -0,0 +1,164 @@
+"""Gera bancos SQLite de benchmark com N linhas por tabela.
+
+Usa os models de `app/models.py` para criar o schema e insere os dados com
+`insert()` do SQLAlchemy Core em lotes (executemany), que é ordens de
+grandeza mais rápido do que passar pelos endpoints ou por `db.add`.
+
+    python -m benchmarks.dataset --rows 10000 --output benchmarks/data/petshop_10000.db
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, insert, text
+
+from app.core.database import Base
+from app import models
+from seed import cpf_from_base
+
+
+BATCH_SIZE = 10_000
+
+SERVICES = ["Banho e Tosa Completo", "Consulta de Rotina", "Vacinação V10", "Corte de Unhas"]
+SPECIES = ["Cachorro", "Gato"]
+BREEDS = ["Labrador", "Poodle", "Bulldog Francês", "Shih Tzu", "SRD (Sem Raça Definida)", "Siamês"]
+FIRST_NAMES = ["André", "Beatriz", "Carlos", "Daniela", "Eduardo", "João", "Conceição", "Luíza",
+               "Marcos", "Juliana", "Paulo", "Fernanda", "Ricardo", "Patrícia", "Sérgio"]
+LAST_NAMES = ["Silva", "Souza", "Costa", "Oliveira", "Pereira", "Araújo", "Gonçalves", "Nunes"]
+
+
+def employee_count(rows: int) -> int:
+    '''Funcionários são poucos numa loja real: 1 para cada 100 linhas (mínimo 20).'''
+    return max(20, rows // 100)
+
+
+def _batches(rows, batch_size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(conn, table, rows) -> None:
+    for batch in _batches(rows):
+        conn.execute(insert(table), batch)
+
+
+def build_database(path: str, rows: int, seed: int = 42) -> None:
+    '''Cria (ou recria) o banco em `path` com `rows` linhas por tabela.'''
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    n_employees = employee_count(rows)
+
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _fast_load(dbapi_connection, connection_record):
+        # Sem journal nem fsync durante a carga: o arquivo é descartável.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+    Base.metadata.create_all(engine)
+
+    def name():
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    def past(days):
+        return now - timedelta(days=rng.randint(0, days), seconds=rng.randint(0, 86399))
+
+    with engine.begin() as conn:
+        _insert(conn, models.Customer.__table__, ({
+            "name": name(),
+            "phone": f"21{i:011d}",
+            "address": f"Rua {rng.randint(1, 999)}, Bairro {rng.choice('ABCDE')}",
+            "cpf": cpf_from_base(i),
+            "created_at": past(730),
+            "is_active": rng.random() > 0.05,
+        } for i in range(1, rows + 1)))
+
+        _insert(conn, models.Employee.__table__, ({
+            "name": name(),
+            "job_title": rng.choice(["Tosador", "Veterinário", "Atendente"]),
+            "phone": f"21{i:09d}",
+            "cpf": cpf_from_base(500_000_000 + i),
+            "is_active": True,
+        } for i in range(1, n_employees + 1)))
+
+        _insert(conn, models.Pet.__table__, ({
+            "name": rng.choice(FIRST_NAMES),
+            "breed": rng.choice(BREEDS),
+            "species": rng.choice(SPECIES),
+            "date_of_birth": past(5000),
+            "customer_id": rng.randint(1, rows),
+            "is_active": rng.random() > 0.05,
+        } for _ in range(rows)))
+
+        _insert(conn, models.Inventory.__table__, ({
+            "product_name": f"Produto {i:07d}",
+            "quantity": rng.randint(0, 500),
+            "price": round(rng.uniform(5.0, 300.0), 2),
+            "low_stock_threshold": rng.randint(5, 20),
+            "is_active": rng.random() > 0.02,
+        } for i in range(1, rows + 1)))
+
+        _insert(conn, models.Booking.__table__, ({
+            "service_name": rng.choice(SERVICES),
+            "scheduled_time": (now.replace(minute=0, second=0)
+                               + timedelta(days=rng.randint(-60, 60), hours=rng.randint(-4, 4))),
+            "delivery": rng.random() > 0.7,
+            "pet_id": rng.randint(1, rows),
+            "employee_id": rng.randint(1, n_employees),
+            "created_at": past(120),
+            "is_active": rng.random() > 0.1,
+        } for _ in range(rows)))
+
+        def sale():
+            quantity = rng.randint(1, 5)
+            return {
+                "quantity": quantity,
+                "total_value": round(quantity * rng.uniform(5.0, 300.0), 2),
+                "product_id": rng.randint(1, rows),
+                "customer_id": rng.randint(1, rows),
+                "created_at": past(730),
+                "is_active": rng.random() > 0.03,
+            }
+
+        _insert(conn, models.Sale.__table__, (sale() for _ in range(rows)))
+
+        _insert(conn, models.Vaccine.__table__, ({
+            "vaccine_name": rng.choice(["V10", "Antirrábica", "Gripe Canina", "V4 Felina"]),
+            "date_of_application": past(1500),
+            "pet_id": rng.randint(1, rows),
+        } for _ in range(rows)))
+
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um banco SQLite de benchmark.")
+    parser.add_argument("--rows", type=int, required=True, help="Linhas por tabela")
+    parser.add_argument("--output", required=True, help="Caminho do arquivo .db")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_database(args.output, args.rows, args.seed)
+    print(f"{args.output}: {args.rows} linhas por tabela em {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
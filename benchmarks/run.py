@@ -0,0 +1,393 @@
+"""Benchmark dos endpoints da API contra bancos SQLite pré-populados.
+
+Cada endpoint é chamado em processo, via `httpx.ASGITransport`, e o
+resultado (p50/p95/p99, throughput, erros e queries por requisição) é
+gravado em JSON para ser comparado com `benchmarks/compare.py`.
+
+    python -m benchmarks.run --rows 10000 100000 1000000
+    python -m benchmarks.run --rows 10000 --only customers --stack async
+
+Como a URL do banco é lida na importação de `app`, cada tamanho roda em
+um subprocesso próprio, sobre uma cópia do banco (as rotas de escrita
+alteram os dados).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+from benchmarks.dataset import build_database, cpf_from_base, employee_count
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, "data")
+RESULTS_DIR = os.path.join(HERE, "results")
+
+
+@dataclass
+class Context:
+    '''Estado compartilhado pelos geradores de requisição de um tamanho.'''
+    rows: int
+    rng: random.Random
+    counter: int = 0
+
+    @property
+    def employees(self) -> int:
+        return employee_count(self.rows)
+
+    def next(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def id(self) -> int:
+        return self.rng.randint(1, self.rows)
+
+
+@dataclass
+class Endpoint:
+    '''Um cenário de benchmark: método, gerador de caminho/corpo e status esperados.'''
+    name: str
+    method: str
+    request: Callable[[Context], tuple]
+    expected: tuple = (200,)
+    weight: float = 1.0
+    tags: tuple = field(default_factory=tuple)
+
+
+def _customer(ctx):
+    n = ctx.next()
+    return "/api/customers/", {
+        "name": f"Cliente Benchmark {n}",
+        "phone": f"2198{n:08d}",
+        "address": "Rua do Benchmark, 1",
+        "cpf": cpf_from_base(900_000_000 + n),
+    }
+
+
+def _employee(ctx):
+    n = ctx.next()
+    return "/api/employees/", {
+        "name": f"Funcionário Benchmark {n}",
+        "job_title": "Tosador",
+        "phone": f"2197{n:08d}",
+        "cpf": cpf_from_base(800_000_000 + n),
+    }
+
+
+def _booking_bulk(ctx):
+    n = ctx.next()
+    when = datetime(2200, 1, 1) + timedelta(hours=2 * n)
+    return "/api/bookings/bulk", {"mode": "best_effort", "bookings": [{
+        "service_name": "Banho e Tosa Completo",
+        "pet_id": ctx.id(),
+        "scheduled_time": when.isoformat(),
+        "employee_id": ctx.rng.randint(1, ctx.employees),
+        "delivery": False,
+        "recurrence": {"frequency": "weekly", "interval": 2, "count": 12},
+    }]}
+
+
+def _booking(ctx):
+    n = ctx.next()
+    # Passo igual à duração do serviço (2h): os horários nunca se sobrepõem.
+    when = datetime(2100, 1, 1) + timedelta(hours=2 * n)
+    return "/api/bookings/", {
+        "service_name": "Banho e Tosa Completo",
+        "pet_id": ctx.id(),
+        "scheduled_time": when.isoformat(),
+        "employee_id": ctx.rng.randint(1, ctx.employees),
+        "delivery": False,
+    }
+
+
+ENDPOINTS = [
+    # --- Clientes ---
+    Endpoint("GET /api/customers/", "GET",
+             lambda c: (f"/api/customers/?skip={c.rng.randint(0, max(0, c.rows - 100))}&limit=100", None),
+             tags=("customers",)),
+    Endpoint("GET /api/customers/ (última página)", "GET",
+             lambda c: (f"/api/customers/?skip={max(0, c.rows - 100)}&limit=100", None),
+             weight=0.25, tags=("customers",)),
+    Endpoint("GET /api/customers/{id}", "GET",
+             lambda c: (f"/api/customers/{c.id()}", None), expected=(200, 404), tags=("customers",)),
+    Endpoint("GET /api/customers/{id}/overview", "GET",
+             lambda c: (f"/api/customers/{c.id()}/overview", None), expected=(200, 404),
+             tags=("customers",)),
+    Endpoint("GET /api/customers/search/", "GET",
+             lambda c: (f"/api/customers/search/?name={c.rng.choice(['Jo', 'Silva', 'Concei', 'Xyz'])}", None),
+             expected=(200, 404), weight=0.25, tags=("customers",)),
+    Endpoint("POST /api/customers/", "POST", _customer, expected=(201,), tags=("customers", "write")),
+    Endpoint("PATCH /api/customers/{id}", "PATCH",
+             lambda c: (f"/api/customers/{c.id()}", {"address": f"Rua {c.next()}"}),
+             expected=(200, 404), tags=("customers", "write")),
+    # --- Pets ---
+    Endpoint("GET /api/pets/", "GET",
+             lambda c: (f"/api/pets/?skip={c.rng.randint(0, max(0, c.rows - 100))}&limit=100", None),
+             tags=("pets",)),
+    Endpoint("POST /api/pets/", "POST", lambda c: ("/api/pets/", {
+        "name": "Rex", "breed": "SRD", "species": "Cachorro",
+        "date_of_birth": "2020-01-01T00:00:00", "customer_id": c.id()}), tags=("pets", "write")),
+    Endpoint("PATCH /api/pets/{id}", "PATCH",
+             lambda c: (f"/api/pets/{c.id()}", {"breed": "Poodle"}), expected=(200, 404), tags=("pets", "write")),
+    # --- Funcionários ---
+    Endpoint("GET /api/employees/", "GET", lambda c: ("/api/employees/?limit=100", None), tags=("employees",)),
+    Endpoint("GET /api/employees/{id}", "GET",
+             lambda c: (f"/api/employees/{c.rng.randint(1, c.employees)}", None), tags=("employees",)),
+    Endpoint("POST /api/employees/", "POST", _employee, expected=(201,), tags=("employees", "write")),
+    # --- Agendamentos ---
+    Endpoint("GET /api/bookings/", "GET",
+             lambda c: (f"/api/bookings/?skip={c.rng.randint(0, max(0, c.rows - 100))}&limit=100", None),
+             tags=("bookings",)),
+    Endpoint("GET /api/bookings/{id}", "GET",
+             lambda c: (f"/api/bookings/{c.id()}", None), expected=(200, 404), tags=("bookings",)),
+    Endpoint("GET /api/bookings/export (semana, ndjson)", "GET",
+             lambda c: (f"/api/bookings/export?format=ndjson&from={date.today()}"
+                        f"&to={date.today() + timedelta(days=7)}", None),
+             weight=0.05, tags=("bookings", "export")),
+    Endpoint("POST /api/bookings/", "POST", _booking, expected=(200, 409), tags=("bookings", "write")),
+    Endpoint("POST /api/bookings/bulk", "POST", _booking_bulk, expected=(201,), weight=0.25,
+             tags=("bookings", "write")),
+    Endpoint("PATCH /api/bookings/{id}", "PATCH",
+             lambda c: (f"/api/bookings/{c.id()}", {"delivery": True}),
+             expected=(200, 404), tags=("bookings", "write")),
+    Endpoint("GET /api/schedule/", "GET", lambda c: ("/api/schedule/", None), weight=0.25, tags=("schedule",)),
+    Endpoint("GET /api/schedule/ (semana, por funcionário)", "GET",
+             lambda c: (f"/api/schedule/?from={date.today() - timedelta(days=date.today().weekday())}"
+                        f"&to={date.today() + timedelta(days=7 - date.today().weekday())}&group_by=employee", None),
+             weight=0.25, tags=("schedule",)),
+    Endpoint("GET /api/schedule/availability", "GET",
+             lambda c: (f"/api/schedule/availability?employee_id={c.rng.randint(1, c.employees)}"
+                        "&service=Banho", None), expected=(200, 404), tags=("schedule",)),
+    Endpoint("GET /api/schedule/availability (todos)", "GET",
+             lambda c: ("/api/schedule/availability?service=Consulta", None), weight=0.25, tags=("schedule",)),
+    # --- Vendas ---
+    Endpoint("GET /api/sales/", "GET", lambda c: ("/api/sales/", None), weight=0.5, tags=("sales",)),
+    Endpoint("GET /api/sales/?from&to", "GET",
+             lambda c: (f"/api/sales/?from={datetime.now() - timedelta(days=7):%Y-%m-%d}", None),
+             weight=0.5, tags=("sales",)),
+    Endpoint("GET /api/sales/?stream (mês)", "GET",
+             lambda c: (f"/api/sales/?stream=true&from={datetime.now() - timedelta(days=30):%Y-%m-%d}", None),
+             weight=0.05, tags=("sales",)),
+    Endpoint("GET /api/sales/?month&year", "GET",
+             lambda c: (f"/api/sales/?month={c.rng.randint(1, 12)}&year={datetime.now().year}", None),
+             weight=0.05, tags=("sales",)),
+    Endpoint("GET /api/sales/export (mês, csv)", "GET",
+             lambda c: (f"/api/sales/export?from={datetime.now() - timedelta(days=30):%Y-%m-%d}", None),
+             weight=0.05, tags=("sales", "export")),
+    Endpoint("GET /api/sales/{id}", "GET",
+             lambda c: (f"/api/sales/{c.id()}", None), expected=(200, 404), tags=("sales",)),
+    Endpoint("POST /api/sales/", "POST", lambda c: ("/api/sales/", {
+        "product_name": f"Produto {c.id():07d}", "quantity": 1,
+        "total_value": 10.0, "customer_id": c.id()}), expected=(200, 400, 404), tags=("sales", "write")),
+    Endpoint("POST /api/sales/checkout", "POST", lambda c: ("/api/sales/checkout", {
+        "customer_id": c.id(), "mode": "best_effort",
+        "items": [{"product_name": f"Produto {c.id():07d}", "quantity": 1, "total_value": 10.0}
+                  for _ in range(5)]}), expected=(201,), weight=0.5, tags=("sales", "write")),
+    # --- Estoque ---
+    Endpoint("GET /api/inventory/", "GET",
+             lambda c: (f"/api/inventory/?skip={c.rng.randint(0, max(0, c.rows - 100))}&limit=100", None),
+             tags=("inventory",)),
+    Endpoint("GET /api/inventory/?low_stock=true", "GET",
+             lambda c: ("/api/inventory/?low_stock=true&limit=100", None), tags=("inventory",)),
+    Endpoint("GET /api/alert/low-stock/", "GET",
+             lambda c: ("/api/alert/low-stock/", None), tags=("inventory",)),
+    Endpoint("GET /api/inventory/?name", "GET",
+             lambda c: (f"/api/inventory/?name={c.rng.randint(0, 9999):04d}&limit=100", None),
+             weight=0.25, tags=("inventory",)),
+    Endpoint("GET /api/inventory/{id}", "GET",
+             lambda c: (f"/api/inventory/{c.id()}", None), expected=(200, 404), tags=("inventory",)),
+    Endpoint("PATCH /api/inventory/{id}", "PATCH",
+             lambda c: (f"/api/inventory/{c.id()}", {"price": 19.9}),
+             expected=(200, 404), tags=("inventory", "write")),
+    # --- Dashboard ---
+    Endpoint("GET /api/dashboard/", "GET", lambda c: ("/api/dashboard/", None), weight=0.25, tags=("dashboard",)),
+    Endpoint("GET /api/dashboard/sales", "GET",
+             lambda c: ("/api/dashboard/sales?from=2025-01-01&to=2026-01-01", None),
+             weight=0.25, tags=("dashboard",)),
+    # --- Exclusões (por último, para não afetar os cenários acima) ---
+    Endpoint("DELETE /api/bookings/{id}", "DELETE",
+             lambda c: (f"/api/bookings/{c.id()}", None), expected=(204, 404), weight=0.25, tags=("bookings", "write")),
+    Endpoint("DELETE /api/sales/{id}", "DELETE",
+             lambda c: (f"/api/sales/{c.id()}", None), expected=(204, 404), weight=0.25, tags=("sales", "write")),
+]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    '''Percentil por interpolação linear (mesmo critério do numpy).'''
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    low = int(k)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (k - low)
+
+
+def summarize(latencies: list, elapsed: float, errors: int, db_queries: list) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3) if ordered else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "db_queries_mean": round(statistics.fmean(db_queries), 2) if db_queries else None,
+    }
+
+
+async def bench_endpoint(client, endpoint: Endpoint, ctx: Context,
+                         iterations: int, concurrency: int, warmup: int) -> dict:
+    async def call():
+        path, body = endpoint.request(ctx)
+        start = time.perf_counter()
+        response = await client.request(endpoint.method, path, json=body)
+        return time.perf_counter() - start, response
+
+    for _ in range(warmup):
+        await call()
+
+    latencies, db_queries = [], []
+    errors = 0
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            elapsed, response = await call()
+            latencies.append(elapsed)
+            if response.status_code not in endpoint.expected:
+                errors += 1
+            queries = response.headers.get("x-db-queries")
+            if queries is not None:
+                db_queries.append(int(queries))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors, db_queries)
+
+
+async def run_single(args) -> dict:
+    '''Roda todos os cenários contra um banco (processo filho).'''
+    import httpx
+    from app.core.database import dispose_async_engine
+    from app.main import app
+
+    ctx = Context(rows=args.rows, rng=random.Random(args.seed))
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 timeout=None) as client:
+        for endpoint in ENDPOINTS:
+            if args.only and not set(args.only) & set(endpoint.tags):
+                continue
+            if args.read_only and "write" in endpoint.tags:
+                continue
+            iterations = max(3, int(args.iterations * endpoint.weight))
+            warmup = min(args.warmup, iterations)
+            result = await bench_endpoint(client, endpoint, ctx, iterations,
+                                          args.concurrency, warmup)
+            results[endpoint.name] = result
+            print(f"  {endpoint.name:<42} p50={result['p50_ms']:>9.2f}ms "
+                  f"p95={result['p95_ms']:>9.2f}ms p99={result['p99_ms']:>9.2f}ms "
+                  f"{result['throughput_rps']:>8.1f} req/s erros={result['errors']}",
+                  flush=True)
+    await dispose_async_engine()
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=HERE, stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(args, rows: int) -> dict:
+    '''Prepara o banco de `rows` linhas e roda o benchmark num subprocesso.'''
+    dataset = os.path.join(DATA_DIR, f"petshop_{rows}.db")
+    if args.rebuild or not os.path.exists(dataset):
+        print(f"Gerando {dataset}...", flush=True)
+        build_database(dataset, rows, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = os.path.join(tmp, "petshop.db")
+        shutil.copyfile(dataset, db_copy)
+        output = os.path.join(tmp, "result.json")
+
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_copy}", DB_STACK=args.stack)
+        command = [sys.executable, "-m", "benchmarks.run", "--child", "--rows", str(rows),
+                   "--iterations", str(args.iterations), "--warmup", str(args.warmup),
+                   "--concurrency", str(args.concurrency), "--seed", str(args.seed),
+                   "--output", output]
+        if args.only:
+            command += ["--only", *args.only]
+        if args.read_only:
+            command.append("--read-only")
+        subprocess.run(command, env=env, check=True, cwd=os.path.dirname(HERE))
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos endpoints da API.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Tamanhos (linhas por tabela) a medir")
+    parser.add_argument("--iterations", type=int, default=200, help="Requisições por endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="Requisições de aquecimento")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requisições simultâneas")
+    parser.add_argument("--stack", choices=["sync", "async"], default=os.getenv("DB_STACK", "sync"))
+    parser.add_argument("--only", nargs="+", help="Apenas cenários com estas tags (ex.: sales)")
+    parser.add_argument("--read-only", action="store_true", help="Ignora os cenários de escrita")
+    parser.add_argument("--rebuild", action="store_true", help="Recria os bancos de dados")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.rows = args.rows[0]
+        results = asyncio.run(run_single(args))
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        return
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "stack": args.stack,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "runs": {},
+    }
+    for rows in args.rows:
+        print(f"== {rows} linhas por tabela ({args.stack}) ==", flush=True)
+        report["runs"][str(rows)] = run_size(args, rows)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{args.stack}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {output}")
+
+
+if __name__ == "__main__":
+    main()
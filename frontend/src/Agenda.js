@@ -1,9 +1,10 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
+import useServerEvents from './useServerEvents';
 
 function Agenda() {
   const [agendamentos, setAgendamentos] = useState(null);
 
-  useEffect(() => {
+  const carregar = useCallback(() => {
     fetch('http://localhost:8000/api/schedule/today/')
       .then(response => {
         if (!response.ok) {
@@ -19,6 +20,9 @@ function Agenda() {
       });
   }, []);
 
+  useEffect(carregar, [carregar]);
+  useServerEvents(['booking'], carregar);
+
   if (agendamentos === null) {
     return <div>Carregando agendamentos...</div>;
   }
@@ -1,7 +1,8 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import Agenda from './Agenda';
 import LowStockAlert from './LowStockAlert';
 import Chart from 'chart.js/auto'; // Importa a biblioteca do Chart.js
+import useServerEvents from './useServerEvents';
 
 function Dashboard() {
   const [kpis, setKpis] = useState(null);
@@ -10,8 +11,8 @@ function Dashboard() {
   // Armazena a instância do gráfico para poder destruí-la depois
   const chartInstance = useRef(null);
 
-  // useEffect para buscar os dados da API (o que você já tinha)
-  useEffect(() => {
+  // Busca os KPIs; recarrega a cada venda ou agendamento recebido do stream
+  const carregar = useCallback(() => {
     fetch('http://localhost:8000/api/dashboard/kpis/')
       .then(response => {
         if (!response.ok) {
@@ -27,6 +28,9 @@ function Dashboard() {
       });
   }, []);
 
+  useEffect(carregar, [carregar]);
+  useServerEvents(['booking', 'sale'], carregar);
+
   // Novo useEffect para criar e atualizar o gráfico
   // Este hook só executa quando 'kpis' muda de valor
   useEffect(() => {
@@ -1,9 +1,10 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
+import useServerEvents from './useServerEvents';
 
 function LowStockAlert() {
   const [alertaProduto, setAlertaProduto] = useState(null);
 
-  useEffect(() => {
+  const carregar = useCallback(() => {
     fetch('http://localhost:8000/api/alert/low-stock/')
       .then(response => {
         if (!response.ok) {
@@ -19,6 +20,28 @@ function LowStockAlert() {
       });
   }, []);
 
+  // `stock.low` e `stock.restored` já trazem o item: a lista é atualizada
+  // sem nova consulta. Só depois de uma reconexão ela é recarregada.
+  const aplicarEvento = useCallback((tipo, item) => {
+    if (!tipo) {
+      carregar();
+      return;
+    }
+    setAlertaProduto(atual => {
+      if (atual === null) {
+        return atual;
+      }
+      const outros = atual.filter(produto => produto.id !== item.id);
+      if (tipo !== 'stock.low') {
+        return outros;
+      }
+      return [...outros, item].sort((a, b) => a.product_name.localeCompare(b.product_name));
+    });
+  }, [carregar]);
+
+  useEffect(carregar, [carregar]);
+  useServerEvents(['stock'], aplicarEvento);
+
   if (alertaProduto === null) {
     return <div>Carregando alertas de produtos em falta...</div>;
   }
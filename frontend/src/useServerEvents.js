@@ -0,0 +1,38 @@
+import { useEffect, useRef } from 'react';
+
+const STREAM_URL = 'http://localhost:8000/api/stream';
+
+const EVENT_TYPES = {
+  booking: ['booking.created', 'booking.updated', 'booking.cancelled'],
+  sale: ['sale.created'],
+  stock: ['stock.low', 'stock.restored'],
+};
+
+// Assina /api/stream e chama `onEvent` a cada evento dos grupos pedidos.
+// Depois de uma reconexão (queda da rede ou `overflow`), `onEvent` também é
+// chamado sem argumentos, para a tela recarregar o estado pela API.
+function useServerEvents(groups, onEvent) {
+  const callback = useRef(onEvent);
+  callback.current = onEvent;
+  const key = groups.join(',');
+
+  useEffect(() => {
+    const source = new EventSource(`${STREAM_URL}?types=${key}`);
+    let connected = false;
+
+    const handle = event => callback.current(event.type, JSON.parse(event.data));
+    const types = key.split(',').flatMap(group => EVENT_TYPES[group] || []);
+    types.forEach(type => source.addEventListener(type, handle));
+
+    source.onopen = () => {
+      if (connected) {
+        callback.current();
+      }
+      connected = true;
+    };
+
+    return () => source.close();
+  }, [key]);
+}
+
+export default useServerEvents;
@@ -0,0 +1,383 @@
+"""Popula o banco com dados sintéticos realistas em alta velocidade.
+
+Gera clientes, pets, funcionários, estoque, agendamentos, vendas e vacinas
+com `insert()` do SQLAlchemy Core em lotes (executemany), uma transação por
+lote, e com a criação dos índices adiada para depois da carga — em vez de
+`db.add` + `commit` por linha, como acontece passando pelos endpoints.
+
+    # 1 milhão de clientes e as demais tabelas proporcionais
+    python seed.py --customers 1000000
+
+    # Banco novo, com quantidades explícitas
+    python seed.py --database-url sqlite:///./capacidade.db --fresh \\
+        --customers 200000 --pets 300000 --sales 2000000 --bookings 500000
+
+Sem --fresh os dados são acrescentados ao banco existente (os IDs começam
+depois do maior ID de cada tabela). O rollup diário de vendas (`sales_daily`)
+é reconstruído no fim da carga.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, func, insert, select, text
+
+from app.core import config
+from app.core.database import Base, apply_sqlite_pragmas
+from app.core import search
+from app.services import sales_daily
+from app.utils.scheduling import booking_end, service_duration
+from app.utils.validation import cpf_check_digits
+from app import models
+
+
+BATCH_SIZE = 20_000
+
+FIRST_NAMES = ["André", "Beatriz", "Carlos", "Daniela", "Eduardo", "João", "Conceição", "Luíza",
+               "Marcos", "Juliana", "Paulo", "Fernanda", "Ricardo", "Patrícia", "Sérgio", "Ana",
+               "José", "Maria", "Antônio", "Francisca", "Lúcia", "Raimundo", "Márcia", "Sebastião"]
+LAST_NAMES = ["Silva", "Souza", "Costa", "Oliveira", "Pereira", "Araújo", "Gonçalves", "Nunes",
+              "Rodrigues", "Almeida", "Conceição", "Ribeiro", "Carvalho", "Gomes", "Lima", "Simões"]
+STREETS = ["Rua das Flores", "Avenida Brasil", "Rua São João", "Travessa da Paz",
+           "Rua Sete de Setembro", "Avenida Atlântica", "Rua da Conceição"]
+NEIGHBORHOODS = ["Centro", "Tijuca", "Copacabana", "Botafogo", "Méier", "Barra", "Madureira"]
+BREEDS = {
+    "Cachorro": ["Labrador", "Poodle", "Bulldog Francês", "Shih Tzu", "Golden Retriever",
+                 "SRD (Sem Raça Definida)", "Yorkshire", "Pinscher"],
+    "Gato": ["Siamês", "Persa", "Maine Coon", "SRD (Sem Raça Definida)"],
+}
+PET_NAMES = ["Rex", "Luna", "Thor", "Mel", "Fred", "Bidu", "Nina", "Pipoca", "Bolt", "Mia", "Amora"]
+JOB_TITLES = ["Tosador", "Banhista", "Veterinário", "Atendente"]
+SERVICES = ["Banho e Tosa Completo", "Banho Simples", "Consulta de Rotina", "Vacinação V10",
+            "Corte de Unhas"]
+PRODUCT_KINDS = ["Ração Seca", "Ração Úmida", "Petisco", "Brinquedo", "Coleira", "Shampoo",
+                 "Antipulgas", "Areia Sanitária", "Caminha", "Comedouro"]
+VACCINES = ["V10", "V8", "Antirrábica", "Gripe Canina", "Giárdia", "V4 Felina", "V5 Felina"]
+
+
+def cpf_from_base(base: int) -> str:
+    '''Monta um CPF válido a partir dos 9 primeiros dígitos.'''
+    digits = f"{base:09d}"
+    return digits + cpf_check_digits(digits)
+
+
+class Seeder:
+    '''Gera e insere as linhas de cada tabela em lotes.'''
+
+    def __init__(self, engine, rng: random.Random, batch_size: int = BATCH_SIZE,
+                 days: int = 730, verbose: bool = True):
+        self.engine = engine
+        self.rng = rng
+        self.batch_size = batch_size
+        self.days = days
+        self.verbose = verbose
+        self.now = datetime.now().replace(microsecond=0)
+        self.fts = False
+
+    # --- Infra ---
+
+    def max_id(self, table) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar()
+
+    def insert(self, table, rows, total: int) -> None:
+        '''Insere `rows` (gerador) em lotes, uma transação por lote.'''
+        start = time.perf_counter()
+        statement = insert(table)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                with self.engine.begin() as conn:
+                    conn.execute(statement, batch)
+                batch = []
+        if batch:
+            with self.engine.begin() as conn:
+                conn.execute(statement, batch)
+        elapsed = time.perf_counter() - start
+        if self.verbose and total:
+            print(f"  {table.name:<10} {total:>10} linhas em {elapsed:6.1f}s "
+                  f"({total / max(elapsed, 1e-9) * 60 / 1e6:.2f} mi linhas/min)", flush=True)
+
+    def drop_indexes(self) -> list:
+        '''Remove os índices secundários para acelerar a carga; retorna os removidos.
+
+        Os triggers do índice FTS de clientes também são suspensos; o índice é
+        reconstruído de uma vez em `create_indexes`.
+        '''
+        dropped = []
+        with self.engine.begin() as conn:
+            self.fts = search.has_fts(conn)
+            if self.fts:
+                search.drop_triggers(conn)
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.drop(conn, checkfirst=True)
+                    dropped.append(index)
+        return dropped
+
+    def create_indexes(self, indexes: list) -> None:
+        start = time.perf_counter()
+        with self.engine.begin() as conn:
+            for index in indexes:
+                index.create(conn, checkfirst=True)
+            if self.fts:
+                search.create_triggers(conn)
+                search.rebuild(conn)
+            if conn.dialect.name == "sqlite":
+                conn.execute(text("ANALYZE"))
+        if self.verbose:
+            print(f"  {len(indexes)} índices recriados em {time.perf_counter() - start:.1f}s", flush=True)
+
+    # --- Geradores ---
+
+    def past(self, days: int) -> datetime:
+        return self.now - timedelta(days=self.rng.randint(0, days), seconds=self.rng.randint(0, 86399))
+
+    def person_name(self) -> str:
+        rng = self.rng
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    def customers(self, count: int, first_id: int):
+        rng = self.rng
+        for i in range(first_id, first_id + count):
+            yield {
+                "id": i,
+                "name": self.person_name(),
+                "phone": f"21{9_0000_0000 + i:09d}" if i < 1_0000_0000 else f"2{i:010d}",
+                "address": f"{rng.choice(STREETS)}, {rng.randint(1, 2000)} - {rng.choice(NEIGHBORHOODS)}",
+                "cpf": cpf_from_base(i),
+                "created_at": self.past(self.days),
+                "is_active": rng.random() > 0.03,
+            }
+
+    def employees(self, count: int, first_id: int):
+        rng = self.rng
+        for i in range(first_id, first_id + count):
+            yield {
+                "id": i,
+                "name": self.person_name(),
+                "job_title": rng.choice(JOB_TITLES),
+                "phone": f"21{8_0000_0000 + i:09d}",
+                "cpf": cpf_from_base(900_000_000 + i),
+                "created_at": self.past(self.days),
+                "is_active": rng.random() > 0.05,
+            }
+
+    def pets(self, count: int, first_id: int, customer_ids: tuple):
+        rng = self.rng
+        low, high = customer_ids
+        for i in range(first_id, first_id + count):
+            species = "Cachorro" if rng.random() < 0.7 else "Gato"
+            yield {
+                "id": i,
+                "name": rng.choice(PET_NAMES),
+                "breed": rng.choice(BREEDS[species]),
+                "species": species,
+                "date_of_birth": self.past(5000),
+                "customer_id": rng.randint(low, high),
+                "created_at": self.past(self.days),
+                "is_active": rng.random() > 0.03,
+            }
+
+    def inventory(self, count: int, first_id: int):
+        rng = self.rng
+        for i in range(first_id, first_id + count):
+            yield {
+                "id": i,
+                "product_name": f"{rng.choice(PRODUCT_KINDS)} {i:07d}",
+                "quantity": rng.randint(0, 500),
+                "price": round(rng.uniform(5.0, 300.0), 2),
+                "low_stock_threshold": rng.randint(5, 20),
+                "created_at": self.past(self.days),
+                "is_active": rng.random() > 0.02,
+            }
+
+    def bookings(self, count: int, first_id: int, pet_ids: tuple, employee_ids: tuple,
+                 start_day: datetime):
+        '''Agendamentos em horário comercial (08:00 às 18:00), sem sobreposição.
+
+        Os agendamentos são distribuídos entre os funcionários em rodízio; cada
+        funcionário tem a própria agenda, preenchida em sequência a partir de
+        `start_day` com a duração do serviço, passando para o dia seguinte
+        quando o atendimento terminaria depois das 18:00.
+        '''
+        rng = self.rng
+        low_pet, high_pet = pet_ids
+        low_emp, high_emp = employee_ids
+        n_employees = high_emp - low_emp + 1
+        opening = start_day.replace(hour=8, minute=0, second=0, microsecond=0)
+        next_free = [opening] * n_employees
+        for n, i in enumerate(range(first_id, first_id + count)):
+            employee = n % n_employees
+            service_name = rng.choice(SERVICES)
+            duration = service_duration(service_name)
+            start = next_free[employee]
+            end = booking_end(start, duration)
+            if end > start.replace(hour=18, minute=0):
+                start = start.replace(hour=8, minute=0) + timedelta(days=1)
+                end = booking_end(start, duration)
+            next_free[employee] = end
+            yield {
+                "id": i,
+                "service_name": service_name,
+                "scheduled_time": start,
+                "duration_minutes": duration,
+                "ends_at": end,
+                "delivery": rng.random() < 0.3,
+                "pet_id": rng.randint(low_pet, high_pet),
+                "employee_id": low_emp + employee,
+                "created_at": self.past(self.days),
+                "is_active": rng.random() > 0.1,
+            }
+
+    def sales(self, count: int, first_id: int, product_prices: list, customer_ids: tuple):
+        rng = self.rng
+        low, high = customer_ids
+        first_product = product_prices[0][0]
+        for i in range(first_id, first_id + count):
+            product_id, price = product_prices[rng.randrange(len(product_prices))]
+            quantity = rng.randint(1, 5)
+            yield {
+                "id": i,
+                "quantity": quantity,
+                "total_value": round(quantity * price, 2),
+                "product_id": product_id if product_id else first_product,
+                "customer_id": rng.randint(low, high),
+                "created_at": self.past(self.days),
+                "is_active": rng.random() > 0.02,
+            }
+
+    def vaccines(self, count: int, first_id: int, pet_ids: tuple):
+        rng = self.rng
+        low, high = pet_ids
+        for i in range(first_id, first_id + count):
+            yield {
+                "id": i,
+                "vaccine_name": rng.choice(VACCINES),
+                "date_of_application": self.past(1500),
+                "pet_id": rng.randint(low, high),
+                "created_at": self.past(self.days),
+            }
+
+    # --- Orquestração ---
+
+    def first_booking_day(self) -> datetime:
+        '''Primeiro dia livre: metade da janela no passado, ou o dia seguinte ao último agendamento.'''
+        start = self.now - timedelta(days=self.days // 2)
+        with self.engine.connect() as conn:
+            last = conn.execute(select(func.max(models.Booking.scheduled_time))).scalar()
+        if last is not None and last >= start:
+            start = last + timedelta(days=1)
+        return start.replace(hour=8, minute=0, second=0, microsecond=0)
+
+    def seed(self, customers: int, pets: int, employees: int, products: int,
+             bookings: int, sales: int, vaccines: int, defer_indexes: bool = True) -> None:
+        m = models
+        first = {table: self.max_id(table.__table__) + 1 for table in (
+            m.Customer, m.Employee, m.Pet, m.Inventory, m.Booking, m.Sale, m.Vaccine)}
+
+        def id_range(model, created):
+            '''Intervalo de IDs disponíveis para FKs (existentes + recém-criados).'''
+            last = first[model] - 1 + created
+            if last < 1:
+                raise SystemExit(f"Não há linhas em {model.__tablename__} para referenciar.")
+            return 1, last
+
+        dropped = self.drop_indexes() if defer_indexes else []
+        try:
+            self.insert(m.Customer.__table__, self.customers(customers, first[m.Customer]), customers)
+            self.insert(m.Employee.__table__, self.employees(employees, first[m.Employee]), employees)
+            self.insert(m.Inventory.__table__, self.inventory(products, first[m.Inventory]), products)
+            if pets or vaccines or bookings:
+                customer_ids = id_range(m.Customer, customers)
+                self.insert(m.Pet.__table__, self.pets(pets, first[m.Pet], customer_ids), pets)
+            if bookings:
+                self.insert(m.Booking.__table__, self.bookings(
+                    bookings, first[m.Booking], id_range(m.Pet, pets), id_range(m.Employee, employees),
+                    self.first_booking_day()),
+                    bookings)
+            if sales:
+                with self.engine.connect() as conn:
+                    product_prices = conn.execute(select(m.Inventory.id, m.Inventory.price)).all()
+                if not product_prices:
+                    raise SystemExit("Não há produtos no estoque para gerar vendas.")
+                self.insert(m.Sale.__table__, self.sales(
+                    sales, first[m.Sale], product_prices, id_range(m.Customer, customers)), sales)
+            if vaccines:
+                self.insert(m.Vaccine.__table__, self.vaccines(
+                    vaccines, first[m.Vaccine], id_range(m.Pet, pets)), vaccines)
+        finally:
+            if dropped:
+                self.create_indexes(dropped)
+
+        if sales:
+            # As vendas entram sem passar pela API: o rollup é recalculado no fim.
+            with self.engine.begin() as conn:
+                sales_daily.rebuild(conn)
+
+
+def create_seed_engine(url: str):
+    '''Engine para carga: perfil SQLite da aplicação, mas sem fsync por commit.'''
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _bulk_load_pragmas(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection)
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.close()
+    return engine
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Popula o banco com dados sintéticos.")
+    parser.add_argument("--database-url", default=config.DATABASE_URL)
+    parser.add_argument("--fresh", action="store_true", help="Apaga e recria todas as tabelas")
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--pets", type=int, help="Padrão: 1,5 por cliente")
+    parser.add_argument("--employees", type=int, help="Padrão: 1 a cada 1000 clientes (mín. 10)")
+    parser.add_argument("--products", type=int, help="Padrão: 1 a cada 100 clientes (mín. 50)")
+    parser.add_argument("--bookings", type=int, help="Padrão: 2 por cliente")
+    parser.add_argument("--sales", type=int, help="Padrão: 5 por cliente")
+    parser.add_argument("--vaccines", type=int, help="Padrão: 2 por pet")
+    parser.add_argument("--days", type=int, default=730, help="Janela de datas geradas")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--no-defer-indexes", action="store_true",
+                        help="Mantém os índices durante a carga")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    customers = args.customers
+    pets = args.pets if args.pets is not None else customers * 3 // 2
+    counts = {
+        "customers": customers,
+        "pets": pets,
+        "employees": args.employees if args.employees is not None else max(10, customers // 1000),
+        "products": args.products if args.products is not None else max(50, customers // 100),
+        "bookings": args.bookings if args.bookings is not None else customers * 2,
+        "sales": args.sales if args.sales is not None else customers * 5,
+        "vaccines": args.vaccines if args.vaccines is not None else pets * 2,
+    }
+
+    engine = create_seed_engine(args.database_url)
+    if args.fresh:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    print(f"Populando {args.database_url}: {counts}")
+    start = time.perf_counter()
+    Seeder(engine, random.Random(args.seed), args.batch_size, args.days).seed(
+        **counts, defer_indexes=not args.no_defer_indexes)
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"{total} linhas em {elapsed:.1f}s ({total / elapsed * 60 / 1e6:.2f} mi linhas/min)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
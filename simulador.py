@@ -1,126 +1,371 @@
-import httpx
+"""Gerador de carga do Pet Control Hub.
+
+Cria os recursos base (estoque, clientes, funcionários e pets) e depois
+dispara uma mistura configurável de operações contra a API, reportando ao
+final latência (p50/p95/p99), erros e throughput por operação.
+
+Exemplos:
+
+    # 50 req/s em malha aberta por 60s contra um uvicorn local
+    python simulador.py --rps 50 --duration 60
+
+    # Malha fechada com 20 clientes, em processo (sem servidor), mix customizado
+    python simulador.py --asgi --mode closed --concurrency 20 --mix sale=5,booking=3,schedule=10
+
+Modos:
+    open   -- as requisições chegam a uma taxa fixa (--rps), independente de
+              quanto a API demora a responder; até --concurrency em voo.
+    closed -- --concurrency clientes fazem uma requisição após a outra; com
+              --rps, cada cliente espera o necessário para respeitar a taxa.
+"""
+import argparse
 import asyncio
 import random
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 
+import httpx
+
+from app.utils.validation import cpf_check_digits
+from benchmarks.run import percentile
+
+
 API_URL = "http://127.0.0.1:8000"
 
 # Dados de exemplo para simulação
 PRODUCTS = ["RacaoSeca01", "BrinquedoBolinha05", "ColeiraCouro", "ShampooAntipulgas"]
-EMPLOYEE_NAMES = ["Juliana", "Marcos"]
+EMPLOYEE_NAMES = ["Juliana", "Marcos", "Renata", "Tiago"]
 SERVICES = ["Banho e Tosa Completo", "Consulta de Rotina", "Vacinação V10", "Corte de Unhas"]
 PET_BREEDS = ["Labrador", "Poodle", "Bulldog Francês", "Shih Tzu", "SRD (Sem Raça Definida)"]
-CUSTOMER_NAMES = ["Andre", "Beatriz", "Carlos", "Daniela", "Eduardo"]
+PET_SPECIES = ["Cachorro", "Gato"]
+CUSTOMER_NAMES = ["André", "Beatriz", "Carlos", "Daniela", "Eduardo", "João", "Conceição"]
+LAST_NAMES = ["Silva", "Souza", "Costa", "Araújo"]
 PET_NAMES = ["Rex", "Luna", "Thor", "Mel", "Fred"]
 
-# Listas para rastrear os IDs criados e garantir a integridade dos dados
-created_customers = []
-created_pets = []
-created_employees = []
-created_inventory = []
-
-async def post_to_api(client, url, payload):
-    try:
-        response = await client.post(url, json=payload, timeout=10.0)
-        response.raise_for_status()
-        return response.json()
-    except httpx.RequestError as exc:
-        print(f"!!! Erro ao enviar evento para {url}: {exc}")
-        return None
-    except httpx.HTTPStatusError as exc:
-        print(f"!!! Erro na resposta da API: {exc.response.text}")
-        return None
-
-async def create_base_resources(client: httpx.AsyncClient):
-    
-    # 1. Cria itens de inventário
-    for product_name in PRODUCTS:
-        payload = {
-            "product_name": product_name,
-            "quantity": random.randint(10, 50),
-            "price": round(random.uniform(25.0, 150.0), 2),
-            "low_stock_threshold": random.randint(5, 10)
-        }
-        res = await post_to_api(client, f"{API_URL}/api/inventory/", payload)
-        if res:
-            created_inventory.append(res["id"])
-    
-    # 2. Cria clientes 
-    for name in CUSTOMER_NAMES:
-        payload = {
-            "name": f"{name} {random.choice(['Silva', 'Souza', 'Costa'])}",
-            "phone": f"219{random.randint(1000, 9999)}-{random.randint(1000, 9999)}",
-            "address": f"Rua {random.randint(1, 100)}, Bairro {random.choice(['A', 'B', 'C'])}"
-        }
-        res = await post_to_api(client, f"{API_URL}/api/events/new-customer", payload)
-        if res:
-            created_customers.append(res["id"])
-
-    # 3. Cria funcionários
-    for name in EMPLOYEE_NAMES:
-        payload = {
-            "name": name,
-            "job_title": "Tosador",
-            "phone": f"219{random.randint(1000, 9999)}-{random.randint(1000, 9999)}"
+DEFAULT_MIX = "sale=3,booking=2,customer=1,pet=1,schedule=4,dashboard=2,list_customers=2,search=2,inventory=1"
+
+
+def generate_cpf(rng: random.Random) -> str:
+    '''Gera um CPF aleatório com dígitos verificadores válidos.'''
+    digits = f"{rng.randrange(1, 999_999_999):09d}"
+    if digits == digits[0] * 9:
+        digits = f"{int(digits) + 1:09d}"
+    return digits + cpf_check_digits(digits)
+
+
+def generate_phone(rng: random.Random) -> str:
+    return f"219{rng.randint(1000, 9999)}{rng.randint(1000, 9999)}"
+
+
+class Simulation:
+    '''Estado compartilhado da simulação: IDs criados e estatísticas por operação.'''
+
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.customers: list[int] = []
+        self.pets: list[int] = []
+        self.employees: list[int] = []
+        self.products: list[str] = []
+        self.recording = False
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, operation: str, method: str, url: str,
+                      expected=(200, 201), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, timeout=30.0, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as exc:
+            response, status = None, type(exc).__name__
+        elapsed = time.perf_counter() - start
+
+        if self.recording:
+            self.latencies[operation].append(elapsed)
+            self.statuses[operation][status] += 1
+            if status not in expected:
+                self.errors[operation] += 1
+        return response if status in expected else None
+
+    # --- Recursos base ---
+
+    def customer_payload(self):
+        return {
+            "name": f"{self.rng.choice(CUSTOMER_NAMES)} {self.rng.choice(LAST_NAMES)}",
+            "phone": generate_phone(self.rng),
+            "address": f"Rua {self.rng.randint(1, 100)}, Bairro {self.rng.choice('ABC')}",
+            "cpf": generate_cpf(self.rng),
         }
-        res = await post_to_api(client, f"{API_URL}/api/events/new-employee", payload)
-        if res:
-            created_employees.append(res["id"])
-
-    # 4. Cria pets (agora associados a clientes válidos)
-    for pet_name in PET_NAMES:
-        if created_customers:
-            payload = {
-                "name": pet_name,
-                "breed": random.choice(PET_BREEDS),
-                "date_of_birth": (datetime.now() - timedelta(days=random.randint(100, 1500))).isoformat(),
-                "customer_id": random.choice(created_customers)
-            }
-            res = await post_to_api(client, f"{API_URL}/api/pets/", payload)
-            if res:
-                created_pets.append(res["id"])
-
-async def send_random_event(client: httpx.AsyncClient):
-    event_type = random.choice(["new-sale", "new-booking"])
-    
-    if event_type == "new-sale":
-        if not created_inventory or not created_customers:
-            return
 
-        payload = {
-            # Altere para usar 'product_name' e 'customer_id' como int
-            "product_name": random.choice(PRODUCTS),
-            "quantity": random.randint(1, 3),
-            "total_value": round(random.uniform(30.0, 350.0), 2),
-            "customer_id": random.choice(created_customers)
+    def pet_payload(self):
+        return {
+            "name": self.rng.choice(PET_NAMES),
+            "breed": self.rng.choice(PET_BREEDS),
+            "species": self.rng.choice(PET_SPECIES),
+            "date_of_birth": (datetime.now() - timedelta(days=self.rng.randint(100, 1500))).isoformat(),
+            "customer_id": self.rng.choice(self.customers),
         }
-        await post_to_api(client, f"{API_URL}/api/events/new-sale", payload)
 
+    async def create_base_resources(self, customers: int = 20, pets: int = 30):
+        for product_name in PRODUCTS:
+            name = f"{product_name}-{self.rng.randint(0, 10**6)}"
+            response = await self.request("setup", "POST", "/api/inventory/", json={
+                "product_name": name,
+                "quantity": 1_000_000,
+                "price": round(self.rng.uniform(25.0, 150.0), 2),
+                "low_stock_threshold": self.rng.randint(5, 10),
+            })
+            if response is not None:
+                self.products.append(name)
+
+        for name in EMPLOYEE_NAMES:
+            response = await self.request("setup", "POST", "/api/employees/", json={
+                "name": name, "job_title": "Tosador",
+                "phone": generate_phone(self.rng), "cpf": generate_cpf(self.rng),
+            })
+            if response is not None:
+                self.employees.append(response.json()["id"])
+
+        for _ in range(customers):
+            response = await self.request("setup", "POST", "/api/customers/",
+                                          json=self.customer_payload(), expected=(201,))
+            if response is not None:
+                self.customers.append(response.json()["id"])
+
+        for _ in range(pets if self.customers else 0):
+            response = await self.request("setup", "POST", "/api/pets/", json=self.pet_payload())
+            if response is not None:
+                self.pets.append(response.json()["id"])
+
+        if not (self.products and self.employees and self.customers and self.pets):
+            raise RuntimeError("Não foi possível criar os recursos base; a API está no ar?")
+
+    # --- Operações da mistura ---
+
+    async def op_sale(self):
+        await self.request("sale", "POST", "/api/sales/", json={
+            "product_name": self.rng.choice(self.products),
+            "quantity": self.rng.randint(1, 3),
+            "total_value": round(self.rng.uniform(30.0, 350.0), 2),
+            "customer_id": self.rng.choice(self.customers),
+        })
+
+    async def op_checkout(self):
+        # Carrinho com vários produtos: um único POST em vez de um por item.
+        products = self.rng.sample(self.products, k=min(len(self.products), self.rng.randint(2, 5)))
+        await self.request("checkout", "POST", "/api/sales/checkout", expected=(201, 409), json={
+            "customer_id": self.rng.choice(self.customers),
+            "items": [{
+                "product_name": name,
+                "quantity": self.rng.randint(1, 3),
+                "total_value": round(self.rng.uniform(30.0, 350.0), 2),
+            } for name in products],
+        })
+
+    async def op_booking(self):
+        when = (datetime.now().replace(second=0, microsecond=0)
+                + timedelta(days=self.rng.randint(1, 60), minutes=30 * self.rng.randint(0, 20)))
+        await self.request("booking", "POST", "/api/bookings/", expected=(200, 201, 409), json={
+            "service_name": self.rng.choice(SERVICES),
+            "pet_id": self.rng.choice(self.pets),
+            "scheduled_time": when.isoformat(),
+            "employee_id": self.rng.choice(self.employees),
+            "delivery": self.rng.choice([True, False]),
+        })
 
-    elif event_type == "new-booking":
-        if not created_pets or not created_employees:
+    async def op_book_free(self):
+        # Como a recepção deveria agendar: consulta um horário livre e agenda nele,
+        # em vez de tentar horários até parar de receber 409.
+        service = self.rng.choice(SERVICES)
+        employee_id = self.rng.choice(self.employees)
+        start = datetime.now().replace(second=0, microsecond=0) + timedelta(days=self.rng.randint(1, 60))
+        response = await self.request("availability", "GET", "/api/schedule/availability", params={
+            "employee_id": employee_id, "service": service,
+            "from": start.isoformat(), "to": (start + timedelta(days=1)).isoformat(),
+        })
+        if response is None:
             return
+        slots = response.json()["employees"][0]["slots"]
+        if not slots:
+            return
+        await self.request("book_free", "POST", "/api/bookings/", expected=(200, 201, 409), json={
+            "service_name": service,
+            "pet_id": self.rng.choice(self.pets),
+            "scheduled_time": slots[0]["start"],
+            "employee_id": employee_id,
+            "delivery": self.rng.choice([True, False]),
+        })
+
+    async def op_customer(self):
+        response = await self.request("customer", "POST", "/api/customers/",
+                                      json=self.customer_payload(), expected=(201, 409))
+        if response is not None and response.status_code == 201:
+            self.customers.append(response.json()["id"])
+
+    async def op_pet(self):
+        response = await self.request("pet", "POST", "/api/pets/", json=self.pet_payload())
+        if response is not None:
+            self.pets.append(response.json()["id"])
+
+    async def op_schedule(self):
+        await self.request("schedule", "GET", "/api/schedule/")
+
+    async def op_dashboard(self):
+        await self.request("dashboard", "GET", "/api/dashboard/")
+
+    async def op_list_customers(self):
+        await self.request("list_customers", "GET", "/api/customers/?limit=50")
+
+    async def op_search(self):
+        term = self.rng.choice(CUSTOMER_NAMES)[:3]
+        await self.request("search", "GET", f"/api/customers/search/?name={term}",
+                           expected=(200, 404))
+
+    async def op_inventory(self):
+        await self.request("inventory", "GET", "/api/inventory/?limit=50")
+
+
+def parse_mix(spec: str) -> tuple[list[str], list[float]]:
+    '''Converte "sale=3,booking=2" em (operações, pesos).'''
+    operations, weights = [], []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if not hasattr(Simulation, f"op_{name}"):
+            raise argparse.ArgumentTypeError(f"Operação desconhecida no mix: {name}")
+        operations.append(name)
+        weights.append(float(weight or 1))
+    return operations, weights
+
+
+async def run_open_loop(sim, pick, args, deadline):
+    '''Chegadas a taxa fixa; requisições acima de --concurrency em voo são descartadas.'''
+    in_flight = asyncio.Semaphore(args.concurrency)
+    tasks = set()
+    dropped = 0
+    interval = 1.0 / args.rps
+    next_at = time.perf_counter()
+
+    async def fire(operation):
+        try:
+            await getattr(sim, f"op_{operation}")()
+        finally:
+            in_flight.release()
+
+    while time.perf_counter() < deadline:
+        if in_flight.locked():
+            if sim.recording:
+                dropped += 1
+        else:
+            await in_flight.acquire()
+            task = asyncio.create_task(fire(pick()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        next_at += sim.rng.expovariate(1.0 / interval) if args.poisson else interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    await asyncio.gather(*tasks)
+    return dropped
+
+
+async def run_closed_loop(sim, pick, args, deadline):
+    '''--concurrency clientes em sequência; com --rps, cada um é cadenciado.'''
+    pacing = args.concurrency / args.rps if args.rps else 0.0
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await getattr(sim, f"op_{pick()}")()
+            if pacing:
+                await asyncio.sleep(max(0.0, pacing - (time.perf_counter() - start)))
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return 0
+
+
+def print_report(sim, measured_seconds, dropped):
+    print()
+    print(f"{'operação':<16}{'reqs':>8}{'erros':>8}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'req/s':>9}  status")
+    total = 0
+    for operation in sorted(sim.latencies):
+        latencies = sorted(sim.latencies[operation])
+        total += len(latencies)
+        statuses = " ".join(f"{k}:{v}" for k, v in sorted(sim.statuses[operation].items(), key=str))
+        print(f"{operation:<16}{len(latencies):>8}{sim.errors[operation]:>8}"
+              f"{percentile(latencies, 50) * 1000:>10.1f}{percentile(latencies, 95) * 1000:>10.1f}"
+              f"{percentile(latencies, 99) * 1000:>10.1f}{len(latencies) / measured_seconds:>9.1f}  {statuses}")
+    print(f"\nTotal: {total} requisições em {measured_seconds:.1f}s "
+          f"({total / measured_seconds:.1f} req/s)", end="")
+    print(f", {dropped} descartadas por falta de concorrência" if dropped else "")
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    operations, weights = parse_mix(args.mix)
+
+    if args.asgi:
+        from app.core.database import Base, dispose_async_engine, engine
+        from app.main import app
+
+        Base.metadata.create_all(engine)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://simulador")
+    else:
+        client = httpx.AsyncClient(base_url=args.url,
+                                   limits=httpx.Limits(max_connections=args.concurrency))
+
+    async with client:
+        sim = Simulation(client, rng)
+        print("Criando recursos base...")
+        await sim.create_base_resources()
+
+        def pick():
+            return rng.choices(operations, weights)[0]
+
+        runner = run_open_loop if args.mode == "open" else run_closed_loop
+        start = time.perf_counter()
+        deadline = start + args.warmup + args.duration
+
+        async def end_warmup():
+            await asyncio.sleep(args.warmup)
+            sim.recording = True
+
+        print(f"Carga {args.mode}: {args.rps or 'sem limite de'} req/s, concorrência "
+              f"{args.concurrency}, aquecimento {args.warmup}s, medição {args.duration}s")
+        warmup_task = asyncio.create_task(end_warmup())
+        dropped = await runner(sim, pick, args, deadline)
+        await warmup_task
+        measured = max(1e-9, time.perf_counter() - start - args.warmup)
+
+    if args.asgi:
+        await dispose_async_engine()
+    print_report(sim, measured, dropped)
 
-        future_time = datetime.now() + timedelta(days=random.randint(1, 10), hours=random.randint(1, 8))
-        payload = {
-            "service_name": random.choice(SERVICES),
-            "pet_id": random.choice(created_pets),
-            "scheduled_time": future_time.isoformat(),
-            "employee_id": random.choice(created_employees),
-            "delivery": random.choice([True, False])
-        }
-        await post_to_api(client, f"{API_URL}/api/events/new-booking", payload)
 
-async def main():
-    print("Iniciando simulador de eventos...")
-    async with httpx.AsyncClient() as client:
-        await create_base_resources(client)
-        print("Recursos base criados. Iniciando o fluxo de eventos.")
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gerador de carga do Pet Control Hub.")
+    parser.add_argument("--url", default=API_URL, help="URL base da API")
+    parser.add_argument("--asgi", action="store_true",
+                        help="Roda a API em processo (httpx.ASGITransport), sem servidor")
+    parser.add_argument("--mode", choices=["open", "closed"], default="open")
+    parser.add_argument("--rps", type=float, default=20.0,
+                        help="Taxa alvo; 0 = sem limite (só no modo closed)")
+    parser.add_argument("--poisson", action="store_true",
+                        help="Chegadas com intervalo exponencial (modo open)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos medidos")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Segundos de aquecimento")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"Pesos por operação (padrão: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.mode == "open" and args.rps <= 0:
+        parser.error("--rps deve ser positivo no modo open")
+    return args
 
-        while True:
-            await send_random_event(client)
-            sleep_time = random.randint(2, 5)
-            await asyncio.sleep(sleep_time)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(parse_args()))
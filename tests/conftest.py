@@ -0,0 +1,83 @@
+"""Configuração dos testes: a aplicação usa um banco SQLite temporário.
+
+`DATABASE_URL` precisa estar definida antes do primeiro import de `app`. A
+pilha segue `DB_STACK` (padrão `sync`), então a mesma suíte roda nas duas:
+
+    python -m pytest -q
+    DB_STACK=async python -m pytest -q
+"""
+import itertools
+import os
+import tempfile
+
+import pytest
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.validation import cpf_check_digits  # noqa: E402
+
+# Os testes compartilham o banco: nomes e CPFs dos registros criados pelas
+# fixtures abaixo vêm desta sequência para não colidirem.
+_sequence = itertools.count(100000001)
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _cpf(n: int) -> str:
+    base = f"{n:09d}"
+    return base + cpf_check_digits(base)
+
+
+@pytest.fixture
+def make_customer(client):
+    def make(name: str = "Cliente Teste") -> dict:
+        n = next(_sequence)
+        response = client.post("/api/customers/", json={
+            "name": f"{name} {n}", "phone": f"11{n:09d}"[:11], "address": "Rua Teste",
+            "cpf": _cpf(n)})
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make
+
+
+@pytest.fixture
+def make_employee(client):
+    def make() -> dict:
+        n = next(_sequence)
+        response = client.post("/api/employees/", json={
+            "name": f"Funcionário {n}", "job_title": "Tosador",
+            "phone": f"11{n:09d}"[:11], "cpf": _cpf(n)})
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make
+
+
+@pytest.fixture
+def make_pet(client, make_customer):
+    def make() -> dict:
+        response = client.post("/api/pets/", json={
+            "name": f"Pet {next(_sequence)}", "breed": "SRD", "species": "Cão",
+            "date_of_birth": "2020-01-01T00:00:00", "customer_id": make_customer()["id"]})
+        assert response.status_code == 200, response.text
+        return response.json()
+    return make
+
+
+@pytest.fixture
+def make_item(client):
+    def make(quantity: int = 100, low_stock_threshold: int = 5, price: float = 10.0) -> dict:
+        response = client.post("/api/inventory/", json={
+            "product_name": f"Produto {next(_sequence)}", "quantity": quantity,
+            "price": price, "low_stock_threshold": low_stock_threshold})
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make
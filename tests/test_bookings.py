@@ -0,0 +1,92 @@
+import pytest
+
+
+@pytest.fixture
+def agenda(make_employee, make_pet):
+    '''Um funcionário sem agendamentos e um pet.'''
+    return make_employee()["id"], make_pet()["id"]
+
+
+def _booking(employee_id, pet_id, when, duration=60, **extra):
+    return {"service_name": "Banho", "pet_id": pet_id, "employee_id": employee_id,
+            "scheduled_time": when, "delivery": False, "duration_minutes": duration, **extra}
+
+
+def test_criar_agendamento_sobreposto_retorna_409(client, agenda):
+    employee_id, pet_id = agenda
+    first = client.post("/api/bookings/", json=_booking(employee_id, pet_id, "2030-03-04T10:00:00"))
+    assert first.status_code == 200
+
+    overlap = client.post("/api/bookings/", json=_booking(employee_id, pet_id, "2030-03-04T10:30:00"))
+    assert overlap.status_code == 409
+
+    # Encostado no fim do anterior não é conflito.
+    after = client.post("/api/bookings/", json=_booking(employee_id, pet_id, "2030-03-04T11:00:00"))
+    assert after.status_code == 200
+
+
+def test_agendamento_de_outro_funcionario_nao_conflita(client, agenda, make_employee):
+    employee_id, pet_id = agenda
+    when = "2030-03-05T10:00:00"
+    assert client.post("/api/bookings/", json=_booking(employee_id, pet_id, when)).status_code == 200
+    other = client.post("/api/bookings/", json=_booking(make_employee()["id"], pet_id, when))
+    assert other.status_code == 200
+
+
+def test_atualizar_para_horario_ocupado_retorna_409(client, agenda):
+    employee_id, pet_id = agenda
+    # O POST simples não devolve o id; o lote devolve.
+    created = client.post("/api/bookings/bulk", json={"bookings": [
+        _booking(employee_id, pet_id, "2030-03-06T10:00:00"),
+        _booking(employee_id, pet_id, "2030-03-06T14:00:00"),
+    ]}).json()["bookings"]
+    second_id = created[1]["id"]
+
+    moved = client.patch(f"/api/bookings/{second_id}", json={"scheduled_time": "2030-03-06T10:15:00"})
+    assert moved.status_code == 409
+
+    # Mudar só a duração do próprio agendamento não conflita com ele mesmo.
+    longer = client.patch(f"/api/bookings/{second_id}", json={"duration_minutes": 90})
+    assert longer.status_code == 200
+
+
+def test_lote_recorrente_tudo_ou_nada_com_conflito_nao_grava(client, agenda):
+    employee_id, pet_id = agenda
+    client.post("/api/bookings/", json=_booking(employee_id, pet_id, "2030-04-15T09:00:00"))
+
+    response = client.post("/api/bookings/bulk", json={"bookings": [_booking(
+        employee_id, pet_id, "2030-04-01T09:00:00",
+        recurrence={"frequency": "weekly", "interval": 1, "count": 4})]})
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert detail["created"] == 0 and detail["failed"] == 1
+    assert detail["errors"][0]["scheduled_time"].startswith("2030-04-15T09:00")
+
+    # Nada do lote recusado ficou gravado: as outras três semanas seguem livres.
+    for day in ("01", "08", "22"):
+        free = client.post("/api/bookings/", json=_booking(employee_id, pet_id, f"2030-04-{day}T09:00:00"))
+        assert free.status_code == 200
+
+
+def test_lote_recorrente_best_effort_pula_so_o_conflito(client, agenda):
+    employee_id, pet_id = agenda
+    client.post("/api/bookings/", json=_booking(employee_id, pet_id, "2030-05-15T09:00:00"))
+
+    response = client.post("/api/bookings/bulk", json={"mode": "best_effort", "bookings": [_booking(
+        employee_id, pet_id, "2030-05-01T09:00:00",
+        recurrence={"frequency": "weekly", "interval": 1, "count": 4})]})
+    assert response.status_code == 201
+    result = response.json()
+    assert (result["total"], result["created"], result["failed"]) == (4, 3, 1)
+    assert result["errors"][0]["scheduled_time"].startswith("2030-05-15T09:00")
+
+
+def test_lote_detecta_conflito_entre_as_proprias_ocorrencias(client, agenda):
+    employee_id, pet_id = agenda
+    response = client.post("/api/bookings/bulk", json={"mode": "best_effort", "bookings": [
+        _booking(employee_id, pet_id, "2030-06-03T09:00:00"),
+        _booking(employee_id, pet_id, "2030-06-03T09:30:00"),
+    ]})
+    assert response.status_code == 201
+    result = response.json()
+    assert (result["created"], result["failed"]) == (1, 1)
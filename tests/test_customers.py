@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.mark.parametrize("param", ["sales_limit", "bookings_limit"])
+@pytest.mark.parametrize("limit", [0, -1, 101])
+def test_overview_recusa_limit_fora_do_intervalo(client, make_customer, param, limit):
+    customer = make_customer()
+    response = client.get(f"/api/customers/{customer['id']}/overview", params={param: limit})
+    assert response.status_code == 422
+
+
+def test_overview_respeita_sales_limit(client, make_customer, make_item):
+    customer, item = make_customer(), make_item()
+    for _ in range(3):
+        assert client.post("/api/sales/", json={
+            "product_name": item["product_name"], "quantity": 1,
+            "total_value": 10.0, "customer_id": customer["id"]}).status_code == 200
+
+    response = client.get(f"/api/customers/{customer['id']}/overview", params={"sales_limit": 2})
+    assert response.status_code == 200
+    assert len(response.json()["recent_sales"]) == 2
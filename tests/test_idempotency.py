@@ -0,0 +1,85 @@
+import uuid
+
+from app.core import idempotency
+
+
+def _key() -> dict:
+    return {idempotency.HEADER: str(uuid.uuid4())}
+
+
+def _sale(customer, item, quantity=2):
+    return {"product_name": item["product_name"], "quantity": quantity,
+            "total_value": 10.0 * quantity, "customer_id": customer["id"]}
+
+
+def _estoque(client, item):
+    return client.get(f"/api/inventory/{item['id']}").json()["quantity"]
+
+
+def test_venda_repetida_devolve_a_resposta_original(client, make_customer, make_item):
+    customer, item, headers = make_customer(), make_item(quantity=10), _key()
+
+    first = client.post("/api/sales/", json=_sale(customer, item), headers=headers)
+    again = client.post("/api/sales/", json=_sale(customer, item), headers=headers)
+
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert again.headers.get(idempotency.REPLAYED_HEADER) == "true"
+    assert idempotency.REPLAYED_HEADER not in first.headers
+    assert _estoque(client, item) == 8
+
+
+def test_chave_reutilizada_com_outro_corpo_retorna_422(client, make_customer, make_item):
+    customer, item, headers = make_customer(), make_item(quantity=10), _key()
+
+    assert client.post("/api/sales/", json=_sale(customer, item, 2), headers=headers).status_code == 200
+    mismatch = client.post("/api/sales/", json=_sale(customer, item, 3), headers=headers)
+
+    assert mismatch.status_code == 422
+    assert _estoque(client, item) == 8
+
+
+def test_resposta_de_erro_nao_e_guardada(client, make_customer, make_item):
+    customer, item, headers = make_customer(), make_item(quantity=1), _key()
+
+    assert client.post("/api/sales/", json=_sale(customer, item), headers=headers).status_code == 400
+    client.patch(f"/api/inventory/{item['id']}", json={"quantity": 10})
+    retry = client.post("/api/sales/", json=_sale(customer, item), headers=headers)
+
+    assert retry.status_code == 200
+    assert idempotency.REPLAYED_HEADER not in retry.headers
+    assert _estoque(client, item) == 8
+
+
+def test_sem_chave_cada_requisicao_e_executada(client, make_customer, make_item):
+    customer, item = make_customer(), make_item(quantity=10)
+    for _ in range(2):
+        assert client.post("/api/sales/", json=_sale(customer, item)).status_code == 200
+    assert _estoque(client, item) == 6
+
+
+def test_agendamento_repetido_nao_conflita_consigo_mesmo(client, make_employee, make_pet):
+    headers = _key()
+    booking = {"service_name": "Banho", "pet_id": make_pet()["id"],
+               "employee_id": make_employee()["id"], "scheduled_time": "2030-07-01T10:00:00",
+               "delivery": False, "duration_minutes": 60}
+
+    first = client.post("/api/bookings/", json=booking, headers=headers)
+    again = client.post("/api/bookings/", json=booking, headers=headers)
+
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert again.headers.get(idempotency.REPLAYED_HEADER) == "true"
+
+
+def test_cadastro_repetido_devolve_201_com_o_mesmo_cliente(client):
+    headers = _key()
+    customer = {"name": "Cliente Idempotente", "phone": "11912345678",
+                "address": "Rua", "cpf": "39053344705"}
+
+    first = client.post("/api/customers/", json=customer, headers=headers)
+    again = client.post("/api/customers/", json=customer, headers=headers)
+
+    assert first.status_code == again.status_code == 201
+    assert again.json()["id"] == first.json()["id"]
+    assert again.headers.get(idempotency.REPLAYED_HEADER) == "true"
@@ -0,0 +1,28 @@
+from app.core import events
+
+
+def _record_events(monkeypatch) -> list:
+    published = []
+    monkeypatch.setattr(events, "publish", lambda event_type, data: published.append((event_type, data)))
+    return published
+
+
+def test_remover_item_em_estoque_baixo_publica_restored(client, make_item, monkeypatch):
+    item = make_item(quantity=2, low_stock_threshold=5)
+    published = _record_events(monkeypatch)
+
+    assert client.delete(f"/api/inventory/{item['id']}").status_code == 204
+    assert published == [("stock.restored", {
+        "id": item["id"], "product_name": item["product_name"],
+        "quantity": 2, "low_stock_threshold": 5})]
+
+    alert = client.get("/api/alert/low-stock/").json()
+    assert item["id"] not in [row["id"] for row in alert]
+
+
+def test_remover_item_com_estoque_nao_publica_evento(client, make_item, monkeypatch):
+    item = make_item(quantity=50, low_stock_threshold=5)
+    published = _record_events(monkeypatch)
+
+    assert client.delete(f"/api/inventory/{item['id']}").status_code == 204
+    assert published == []
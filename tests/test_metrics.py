@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core import config, metrics
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "METRICS_FLUSH_INTERVAL", 5)
+    return tmp_path
+
+
+def _registry():
+    registry = metrics.Registry()
+    counter = metrics.Counter(registry, "jobs_total", "Jobs.")
+    gauge = metrics.Gauge(registry, "jobs_running", "Jobs em andamento.")
+    return registry, counter, gauge
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def _write_snapshot(directory, name, pid, jobs, running, age=0.0):
+    path = directory / f"metrics_{name}.json"
+    path.write_text(json.dumps({"pid": pid, "host": socket.gethostname(), "metrics": {
+        "jobs_total": {"type": "counter", "help": "Jobs.", "buckets": [], "samples": {"{}": jobs}},
+        "jobs_running": {"type": "gauge", "help": "Jobs em andamento.", "buckets": [],
+                         "samples": {"{}": running}},
+    }}))
+    if age:
+        old = time.time() - age
+        os.utime(path, (old, old))
+    return path
+
+
+def test_snapshot_name_is_unique_per_process(metrics_dir):
+    registry, counter, _ = _registry()
+    registry.flush()
+    (path,) = metrics_dir.glob("metrics_*.json")
+    pid, suffix = path.stem[len("metrics_"):].split("_")
+    assert int(pid) == os.getpid() and suffix
+
+
+def test_dead_worker_counters_are_kept_and_folded(metrics_dir):
+    registry, counter, gauge = _registry()
+    counter.inc(2)
+    pid = _dead_pid()
+    stale = _write_snapshot(metrics_dir, f"{pid}_old", pid, 5.0, 3.0, age=60)
+
+    text = registry.render()
+    assert "jobs_total 7.0" in text
+    assert "jobs_running 3.0" not in text
+    assert not stale.exists()
+    assert (metrics_dir / metrics.DEAD_WORKERS_FILE).exists()
+
+    # O total não diminui nas coletas seguintes.
+    assert "jobs_total 7.0" in registry.render()
+
+
+def test_reused_pid_does_not_overwrite_dead_snapshot(metrics_dir):
+    registry, counter, _ = _registry()
+    pid = _dead_pid()
+    _write_snapshot(metrics_dir, f"{pid}_a", pid, 5.0, 0.0, age=60)
+    _write_snapshot(metrics_dir, f"{pid}_b", pid, 1.0, 0.0)
+    assert "jobs_total 6.0" in registry.render()
+
+
+def test_retire_moves_counters_to_dead_total(metrics_dir):
+    registry, counter, _ = _registry()
+    counter.inc(4)
+    registry.flush()
+    registry.retire()
+    assert not list(metrics_dir.glob("metrics_*.json"))
+
+    other, _, _ = _registry()
+    assert "jobs_total 4.0" in other.render()
+
+
+def test_warns_with_several_workers_and_no_metrics_dir(monkeypatch, caplog):
+    monkeypatch.setattr(config, "METRICS_DIR", "")
+    monkeypatch.setattr(config, "WEB_CONCURRENCY", 4)
+    registry, _, _ = _registry()
+    with caplog.at_level(logging.WARNING, logger="app.metrics"):
+        registry.start_flusher()
+    assert "METRICS_DIR" in caplog.text
+
+
+def test_pool_metrics_are_labelled_by_stack():
+    engine = create_engine("sqlite://")
+    metrics.watch_pool(engine, "teste")
+    before = metrics.db_pool_checkouts_total.samples().get('{"stack": "teste"}', 0.0)
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        assert metrics.db_pool_checked_out.samples()['{"stack": "teste"}'] == 1.0
+    assert metrics.db_pool_checked_out.samples()['{"stack": "teste"}'] == 0.0
+    assert metrics.db_pool_checkouts_total.samples()['{"stack": "teste"}'] == before + 1
+    engine.dispose()
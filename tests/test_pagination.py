@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import select
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app import models
+from app.core.pagination import MAX_LIMIT, keyset, next_page
+
+
+LISTINGS = [
+    "/api/customers/",
+    "/api/bookings/",
+    "/api/pets/",
+    "/api/employees/",
+    "/api/inventory/",
+    "/api/sales/",
+]
+# Só cursor, sem `skip`.
+CURSOR_LISTINGS = ["/api/alert/low-stock/"]
+
+
+@pytest.mark.parametrize("path", LISTINGS + CURSOR_LISTINGS)
+@pytest.mark.parametrize("limit", [0, -1, MAX_LIMIT + 1])
+def test_limit_fora_do_intervalo_e_recusado(client, path, limit):
+    response = client.get(path, params={"limit": limit})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_skip_negativo_e_recusado(client, path):
+    assert client.get(path, params={"skip": -1}).status_code == 422
+
+
+@pytest.mark.parametrize("path", LISTINGS + CURSOR_LISTINGS)
+def test_limite_valido(client, path):
+    response = client.get(path, params={"limit": 1})
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_next_page_sem_itens_quando_limit_nao_positivo(limit):
+    request = Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                       "headers": [], "scheme": "http", "server": ("t", 80)})
+    response = Response()
+    rows = [models.Customer(id=1, name="A")]
+    assert next_page(request, response, rows, limit, "name") == []
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_keyset_limit_negativo_busca_no_maximo_uma_linha():
+    query = keyset(select(models.Customer), models.Customer.name, models.Customer.id, -5)
+    assert query._limit == 1
@@ -0,0 +1,89 @@
+import pytest
+
+
+@pytest.mark.parametrize("quantity", [0, -5])
+def test_venda_recusa_quantidade_nao_positiva(client, make_customer, make_item, quantity):
+    customer, item = make_customer(), make_item(quantity=460)
+    response = client.post("/api/sales/", json={
+        "product_name": item["product_name"], "quantity": quantity,
+        "total_value": 10.0, "customer_id": customer["id"]})
+    assert response.status_code == 422
+    assert client.get(f"/api/inventory/{item['id']}").json()["quantity"] == 460
+
+
+def test_venda_debita_estoque(client, make_customer, make_item):
+    customer, item = make_customer(), make_item(quantity=460)
+    response = client.post("/api/sales/", json={
+        "product_name": item["product_name"], "quantity": 5,
+        "total_value": 50.0, "customer_id": customer["id"]})
+    assert response.status_code == 200
+    assert client.get(f"/api/inventory/{item['id']}").json()["quantity"] == 455
+
+
+def _estoque(client, item):
+    return client.get(f"/api/inventory/{item['id']}").json()["quantity"]
+
+
+def _checkout(client, customer, lines, mode):
+    return client.post("/api/sales/checkout", json={
+        "customer_id": customer["id"], "mode": mode,
+        "items": [{"product_name": item["product_name"], "quantity": quantity,
+                   "total_value": 10.0 * quantity} for item, quantity in lines]})
+
+
+def test_checkout_tudo_ou_nada_debita_todos_os_itens(client, make_customer, make_item):
+    customer, a, b = make_customer(), make_item(quantity=10), make_item(quantity=10)
+    response = _checkout(client, customer, [(a, 2), (b, 3)], "all_or_nothing")
+    assert response.status_code == 201
+    result = response.json()
+    assert (result["total"], result["created"], result["failed"]) == (2, 2, 0)
+    assert [sale["item"] for sale in result["sales"]] == [0, 1]
+    assert (_estoque(client, a), _estoque(client, b)) == (8, 7)
+
+
+def test_checkout_tudo_ou_nada_sem_estoque_nao_debita_nada(client, make_customer, make_item):
+    customer, a, b = make_customer(), make_item(quantity=10), make_item(quantity=1)
+    response = _checkout(client, customer, [(a, 2), (b, 3)], "all_or_nothing")
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert (detail["created"], detail["failed"]) == (0, 1)
+    assert detail["errors"][0]["item"] == 1
+    assert (_estoque(client, a), _estoque(client, b)) == (10, 1)
+
+
+def test_checkout_tudo_ou_nada_produto_inexistente(client, make_customer, make_item):
+    customer, a = make_customer(), make_item(quantity=10)
+    missing = {"product_name": "Produto que não existe"}
+    response = _checkout(client, customer, [(a, 1), (missing, 1)], "all_or_nothing")
+    assert response.status_code == 409
+    assert _estoque(client, a) == 10
+
+
+def test_checkout_best_effort_vende_so_os_itens_com_estoque(client, make_customer, make_item):
+    customer, a, b = make_customer(), make_item(quantity=10), make_item(quantity=1)
+    response = _checkout(client, customer, [(a, 2), (b, 3)], "best_effort")
+    assert response.status_code == 201
+    result = response.json()
+    assert (result["created"], result["failed"]) == (1, 1)
+    assert result["sales"][0]["item"] == 0 and result["errors"][0]["item"] == 1
+    assert (_estoque(client, a), _estoque(client, b)) == (8, 1)
+
+
+def test_checkout_soma_linhas_do_mesmo_produto(client, make_customer, make_item):
+    customer, a = make_customer(), make_item(quantity=5)
+    response = _checkout(client, customer, [(a, 3), (a, 3)], "best_effort")
+    assert response.status_code == 201
+    assert response.json()["failed"] == 2
+    assert _estoque(client, a) == 5
+
+
+@pytest.mark.parametrize("quantity", [0, -1])
+def test_checkout_recusa_quantidade_nao_positiva(client, make_customer, make_item, quantity):
+    customer, a = make_customer(), make_item(quantity=5)
+    assert _checkout(client, customer, [(a, quantity)], "best_effort").status_code == 422
+    assert _estoque(client, a) == 5
+
+
+def test_checkout_recusa_carrinho_vazio(client, make_customer):
+    response = client.post("/api/sales/checkout", json={"customer_id": make_customer()["id"], "items": []})
+    assert response.status_code == 422
@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.mark.parametrize("limit", [0, -1, 101])
+def test_busca_recusa_limit_fora_do_intervalo(client, limit):
+    response = client.get("/api/customers/search/", params={"name": "maria", "limit": limit})
+    assert response.status_code == 422
+
+
+def test_busca_respeita_limit(client):
+    for n, cpf in enumerate(["52998224725", "11144477735"]):
+        created = client.post("/api/customers/", json={
+            "name": f"Maria Busca {n}", "phone": f"1198765432{n}", "address": "Rua", "cpf": cpf})
+        assert created.status_code == 201
+
+    response = client.get("/api/customers/search/", params={"name": "maria busca", "limit": 1})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+def _busca(client, name):
+    response = client.get("/api/customers/search/", params={"name": name})
+    return [r["id"] for r in response.json()] if response.status_code == 200 else []
+
+
+@pytest.mark.parametrize("termo", ["anastacia braganca", "ANASTÁCIA", "anast brag", "Bragança"])
+def test_busca_ignora_acentos_e_casa_prefixos(client, make_customer, termo):
+    customer = make_customer("Anastácia Bragança")
+    assert customer["id"] in _busca(client, termo)
+
+
+def test_busca_exige_todas_as_palavras(client, make_customer):
+    customer = make_customer("Florisbela Quintanilha")
+    assert customer["id"] not in _busca(client, "florisbela xavantes")
+
+
+def test_busca_acompanha_renomeacao_e_remocao(client, make_customer):
+    customer = make_customer("Genoveva Albuquerque")
+    assert client.patch(f"/api/customers/{customer['id']}",
+                        json={"name": "Genoveva Lacerda"}).status_code == 200
+    assert customer["id"] not in _busca(client, "albuquerque")
+    assert customer["id"] in _busca(client, "lacerda")
+
+    assert client.delete(f"/api/customers/{customer['id']}").status_code == 204
+    assert customer["id"] not in _busca(client, "lacerda")
+
+
+def test_busca_sem_palavras_retorna_404(client):
+    response = client.get("/api/customers/search/", params={"name": '"*()'})
+    assert response.status_code == 404